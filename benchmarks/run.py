@@ -0,0 +1,241 @@
+# -*- coding: utf-8
+"""Benchmarks of puzzle generation, solving, Data, board drawing and the
+numpy batch checks, skipped when numpy is not installed.
+
+    python benchmarks/run.py [-k NAME] [-o FILE] [--compare BASELINE]
+
+Runs headless on the dummy SDL video driver. Every benchmark is timed
+--repeat times over enough calls to last MIN_TIME seconds and reports
+the median and best seconds per call. Results are written as JSON with
+sorted keys so runs diff cleanly. Save a baseline before a change with
+-o benchmarks/baseline.json and run with --compare after it: the
+benchmarks slower than the baseline by more than --threshold are listed
+and the exit status is 1.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import timeit
+from os.path import abspath, dirname, join
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+BENCH_PATH = dirname(abspath(__file__))
+SRC_PATH = join(dirname(BENCH_PATH), 'src')
+CORPUS_PATH = join(BENCH_PATH, 'corpus.txt')
+sys.path.insert(0, SRC_PATH)
+
+import pygame  # noqa: E402
+
+from sudoku.board import Board  # noqa: E402
+from sudoku.constants import HEIGHT, WIDTH  # noqa: E402
+from sudoku.data import Data  # noqa: E402
+from sudoku.dlx import DlxSolver  # noqa: E402
+from sudoku.logic import Logic  # noqa: E402
+from sudoku.solver import Solver  # noqa: E402
+
+try:
+    from sudoku import vectorized  # noqa: E402
+except ImportError:  # numpy is optional
+    vectorized = None
+
+FORMAT = 1  # version of the JSON layout
+MIN_TIME = 0.2  # seconds each timed run lasts at least
+REPEAT = 5
+THRESHOLD = 0.1  # slowdown over the baseline counted as a regression
+DIFFICULTIES = (10, 50, 90)
+SIDES = (16, 25)  # of the empty large boards solved
+BATCH_SIZE = 10000  # boards per vectorized call
+SEED = 1
+
+Benchmark = Tuple[str, Callable[[], object]]
+
+
+def load_corpus(path: str = CORPUS_PATH) -> Dict[str, Data]:
+    """Puzzles by name from lines of name and puzzle, # comments"""
+    corpus = {}
+    with open(path, encoding='ascii') as file:
+        for line in file:
+            if line.strip() and not line.startswith('#'):
+                name, puzzle = line.split()
+                corpus[name] = Data.from_line(puzzle)
+    return corpus
+
+
+def generate_benchmarks() -> Iterator[Benchmark]:
+    for difficulty in DIFFICULTIES:
+        # seeded per call so every run generates the same puzzles
+        yield f'generate/{difficulty}', lambda difficulty=difficulty: \
+            Logic(random.Random(SEED)).create_game(difficulty)
+
+
+def solve_benchmarks(corpus: Dict[str, Data]) -> Iterator[Benchmark]:
+    solver = Solver()
+    dlx = DlxSolver()
+    for name, puzzle in corpus.items():
+        grid = list(puzzle.flatten())
+        yield f'solve/{name}', lambda grid=grid: solver.solve(grid)
+        # what generation checks after every blanked cell
+        yield f'unique/{name}', lambda grid=grid: \
+            solver.count_solutions(grid, limit=2)
+        yield f'dlx/{name}', lambda grid=grid: \
+            dlx.count_solutions(grid, limit=2)
+    for side in SIDES:
+        grid = [0] * (side * side)
+        yield f'solve/empty{side}', lambda grid=grid: solver.solve(grid)
+        yield f'dlx/empty{side}', lambda grid=grid: dlx.solve(grid)
+
+
+def data_benchmarks(corpus: Dict[str, Data]) -> Iterator[Benchmark]:
+    puzzle = corpus['medium']
+    rows, flat, line = puzzle.rows(), bytes(puzzle), puzzle.to_line()
+    yield 'data/from_rows', lambda: Data(data=rows)
+    yield 'data/from_flat', lambda: Data(data=flat)
+    yield 'data/from_line', lambda: Data.from_line(line)
+    yield 'data/copy', puzzle.copy
+    yield 'data/flatten', lambda: list(puzzle.copy().flatten())
+    yield 'data/to_line', puzzle.to_line
+
+
+def draw_benchmarks(corpus: Dict[str, Data]) -> Iterator[Benchmark]:
+    pygame.init()
+    pygame.display.set_mode((WIDTH, HEIGHT))
+    rect = pygame.Rect(6, 40, WIDTH - 8, WIDTH - 8)
+    board = Board(rect, corpus['medium'])
+    board.draw()
+    empty = [cell for cell in board.cells if not cell.value]
+
+    def full():
+        board.invalidate()
+        board.draw()
+
+    def number():
+        empty[0].value = 5 if empty[0].value == 6 else 6
+        board.draw()
+
+    def marks():
+        empty[1].marks ^= 1
+        board.draw()
+
+    yield 'draw/board', full
+    yield 'draw/cell', number
+    yield 'draw/cell_marks', marks
+
+
+def vectorized_benchmarks(corpus: Dict[str, Data]) \
+        -> Iterator[Benchmark]:
+    if vectorized is None:
+        return
+    lines = [puzzle.to_line() for puzzle in corpus.values()]
+    lines = (lines * (BATCH_SIZE // len(lines) + 1))[:BATCH_SIZE]
+    boards = vectorized.from_lines(lines)
+    yield 'vectorized/from_lines', lambda: vectorized.from_lines(lines)
+    yield 'vectorized/check', lambda: vectorized.check(boards)
+    yield 'vectorized/candidates', lambda: vectorized.candidates(boards)
+
+
+def benchmarks() -> Iterator[Benchmark]:
+    corpus = load_corpus()
+    yield from generate_benchmarks()
+    yield from solve_benchmarks(corpus)
+    yield from data_benchmarks(corpus)
+    yield from draw_benchmarks(corpus)
+    yield from vectorized_benchmarks(corpus)
+
+
+def measure(func: Callable[[], object], repeat: int = REPEAT) \
+        -> Dict[str, float]:
+    """Median and best seconds per call of func"""
+    timer = timeit.Timer(func)
+    number = 1
+    while timer.timeit(number) < MIN_TIME:
+        number *= 2
+    times = [time / number for time in timer.repeat(repeat, number)]
+    return {
+        'median': statistics.median(times),
+        'min': min(times),
+        'number': number,
+        'repeat': repeat,
+    }
+
+
+def run(selected: List[str], repeat: int = REPEAT) -> dict:
+    results = {}
+    for name, func in benchmarks():
+        if selected and not any(key in name for key in selected):
+            continue
+        results[name] = measure(func, repeat)
+        print(f'{name:<24} {results[name]["median"] * 1000:10.4f} ms',
+              file=sys.stderr)
+    return {
+        'format': FORMAT,
+        'machine': {
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'platform': platform.platform(),
+        },
+        'results': results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float = THRESHOLD) \
+        -> List[Tuple[str, float]]:
+    """Benchmarks of both slower than baseline by more than threshold,
+    as (name, current / baseline median)
+    """
+    slower = []
+    for name, result in sorted(current['results'].items()):
+        base = baseline['results'].get(name)
+        if base is None or not base['median']:
+            continue
+        ratio = result['median'] / base['median']
+        print(f'{name:<24} {ratio:6.2f}x', file=sys.stderr)
+        if ratio > 1 + threshold:
+            slower.append((name, ratio))
+    return slower
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description='Time the hot paths of the game headless.')
+    parser.add_argument(
+        '-k', dest='selected', action='append', default=[],
+        metavar='NAME', help='only benchmarks whose name contains NAME')
+    parser.add_argument(
+        '-o', '--output', help='write the JSON results to a file')
+    parser.add_argument(
+        '--compare', metavar='BASELINE',
+        help='flag regressions against results saved with -o')
+    parser.add_argument(
+        '--threshold', type=float, default=THRESHOLD,
+        help='slowdown counted as a regression (default %(default)s)')
+    parser.add_argument('--repeat', type=int, default=REPEAT)
+    args = parser.parse_args(argv)
+
+    current = run(args.selected, args.repeat)
+    text = json.dumps(current, indent=2, sort_keys=True) + '\n'
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(text)
+    else:
+        sys.stdout.write(text)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            slower = compare(current, json.load(file), args.threshold)
+        for name, ratio in slower:
+            print(f'regression: {name} {ratio:.2f}x the baseline',
+                  file=sys.stderr)
+        return 1 if slower else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
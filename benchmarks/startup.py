@@ -0,0 +1,79 @@
+# -*- coding: utf-8
+"""Time to first frame of the game, each run in a fresh interpreter.
+
+    python benchmarks/startup.py [runs]
+
+first_frame: start screen on the display, as main.py puts it up
+loaded: game modules imported and Game() built behind it
+playable: the first game drawn with its hud and ui
+
+Exits 1 when the median first_frame misses FIRST_FRAME_TARGET_MS.
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from os.path import abspath, dirname, join
+
+SRC_PATH = join(dirname(dirname(abspath(__file__))), 'src')
+FIRST_FRAME_TARGET_MS = 150
+RUNS = 5
+
+# the startup of main.py, timed
+CHILD = """
+import time
+start = time.perf_counter()
+import pygame
+from sudoku.assets import show_start_screen
+from sudoku.constants import HEIGHT, WIDTH
+pygame.init()
+pygame.display.set_caption('Sudoku')
+show_start_screen(pygame.display.set_mode((WIDTH, HEIGHT)))
+first_frame = time.perf_counter()
+import i18n, pygame_gui
+from sudoku.game import Game
+game = Game()
+loaded = time.perf_counter()
+game.reset()
+game.draw_board_and_hud()
+pygame.display.update()
+playable = time.perf_counter()
+game.store.close()
+game.bank.close()
+for name, at in (('first_frame', first_frame), ('loaded', loaded),
+                 ('playable', playable)):
+    print(name, (at - start) * 1000)
+"""
+
+
+def run_once() -> dict:
+    with tempfile.TemporaryDirectory() as home:
+        env = dict(
+            os.environ, HOME=home, SDL_VIDEODRIVER='dummy',
+            SDL_AUDIODRIVER='dummy', PYGAME_HIDE_SUPPORT_PROMPT='1')
+        out = subprocess.run(
+            [sys.executable, '-c', CHILD], cwd=SRC_PATH, env=env,
+            check=True, capture_output=True, text=True).stdout
+    return {
+        name: float(ms) for name, ms in (
+            line.split() for line in out.splitlines())
+    }
+
+
+def main(runs: int = RUNS) -> int:
+    results = [run_once() for _ in range(runs)]
+    medians = {
+        name: statistics.median(result[name] for result in results)
+        for name in results[0]
+    }
+    for name, ms in medians.items():
+        print(f'{name:<12} {ms:8.1f} ms')
+    if medians['first_frame'] > FIRST_FRAME_TARGET_MS:
+        print(f'first frame over the {FIRST_FRAME_TARGET_MS} ms target')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(*map(int, sys.argv[1:])))
@@ -3,12 +3,10 @@ import asyncio
 import os
 import sys
 
-import i18n  # noqa # fix pygbag failing to source module
 import pygame
-import pygame_gui  # noqa # fix pygbag failing to source module
 
+from sudoku.assets import show_start_screen
 from sudoku.constants import HEIGHT, WIDTH
-from sudoku.game import Game
 
 os.environ['PYGAME_FORCE_SCALE'] \
     = os.environ.get('PYGAME_FORCE_SCALE', 'photo')
@@ -18,7 +16,8 @@ os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] \
     = os.environ.get('PYGAME_HIDE_SUPPORT_PROMPT', '1')
 
 pygame.init()
-pygame.display.set_mode((WIDTH, HEIGHT))
+pygame.display.set_caption('Sudoku')
+show_start_screen(pygame.display.set_mode((WIDTH, HEIGHT)))
 
 if sys.platform in ('emscripten', 'wasi'):
     """browser's game window customisation"""
@@ -28,6 +27,13 @@ if sys.platform in ('emscripten', 'wasi'):
     platform.document.body.style.background = '#e6f2ff'
 
 async def main():
+    # let the browser paint the start screen, then load the rest behind it
+    await asyncio.sleep(0)
+    import i18n  # noqa # fix pygbag failing to source module
+    import pygame_gui  # noqa # fix pygbag failing to source module
+
+    from sudoku.game import Game
+
     game = Game()
     await (game.run())
 
@@ -0,0 +1,43 @@
+# -*- coding: utf-8
+from os.path import abspath, dirname, join, normpath
+from typing import Dict, Tuple
+
+import pygame
+
+BASE_PATH = abspath(dirname(__file__))
+IMAGE_PATH = normpath(join(BASE_PATH, '../img'))
+
+# buttons.png holds these BUTTON_SIZE images left to right
+BUTTON_NAMES = (
+    '1', '2', '3', '4', '5', '6', '7', '8', '9',
+    'delete', 'hint', 'pause', 'reset', 'undo', 'redo')
+BUTTON_SIZE = 40
+
+# images by (name, alpha), loaded on first use
+_images: Dict[Tuple[str, bool], pygame.Surface] = {}
+
+
+def get_image(name: str, alpha: bool = True) -> pygame.Surface:
+    """Return img/name.png, loaded once and converted for the display.
+    Opaque images drawn often are faster blitted with alpha False.
+    """
+    surf = _images.get((name, alpha))
+    if surf is None:
+        surf = pygame.image.load(join(IMAGE_PATH, f'{name}.png'))
+        if pygame.display.get_surface() is not None:
+            surf = surf.convert_alpha() if alpha else surf.convert()
+        _images[name, alpha] = surf
+    return surf
+
+
+def get_button(name: str) -> pygame.Surface:
+    """Return the image of button name, an area of the buttons atlas"""
+    index = BUTTON_NAMES.index(name)
+    return get_image('buttons').subsurface(
+        (index * BUTTON_SIZE, 0, BUTTON_SIZE, BUTTON_SIZE))
+
+
+def show_start_screen(screen: pygame.Surface) -> None:
+    """Put the start screen up before the rest of the game loads"""
+    screen.blit(get_image('start', alpha=False), (0, 0))
+    pygame.display.flip()
@@ -0,0 +1,253 @@
+# -*- coding: utf-8
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from os.path import expanduser, join
+from typing import Dict, NamedTuple, Optional, Sequence, Union
+
+from .data import Data
+from .grader import TIERS, Grade, Grader
+from .logic import GRADE_ATTEMPTS, TIER_DIFFICULTY, Logic
+
+BANK_PATH = join(expanduser('~'), '.sudoku', 'bank')
+LOW_WATER = 20  # refill a tier once fewer puzzles than this are left
+HIGH_WATER = 100  # and top it up to this many
+REFILL_PAUSE = 0.05  # seconds between two puzzles in the refill thread
+REFILL_ATTEMPTS = 10  # grading attempts per puzzle in the refill thread
+REFILL_BACKOFF = 300.0  # most seconds a tier that keeps missing waits
+MAX_MISSES = 3  # refill() gives a tier up after this many misses in a row
+
+# magic, version, record size, record count, draw cursor
+_HEADER = struct.Struct('<4sHHII')
+_MAGIC = b'SDKB'
+_VERSION = 1
+# puzzle and solution packed two cells per byte, score, tier index
+_RECORD = struct.Struct('<41s41sHB')
+
+
+class BankRecord(NamedTuple):
+    solution: Data
+    puzzle: Data
+    score: int
+    tier: str
+
+
+def tier_for(difficulty: Union[int, str]) -> str:
+    """Map a difficulty percent 0-100, evenly over TIERS, or a tier name
+    to a tier
+    """
+    if isinstance(difficulty, str):
+        if difficulty not in TIERS:
+            raise ValueError(f'unknown tier {difficulty!r}')
+        return difficulty
+    return TIERS[min(int(difficulty) * len(TIERS) // 100, len(TIERS) - 1)]
+
+
+class PuzzleBank:
+    """Pre-generated puzzles stored on disk, one file per tier.
+
+    Every tier file starts with a 16-byte header followed by 85-byte
+    records of packed puzzle, solution, grade score and tier. Files
+    are memory-mapped and draw() hands out the record under the
+    cursor kept in the header, so drawing is O(1) and a puzzle is
+    never handed out twice. refill() and the background thread from
+    start_refill() top up tiers that run low.
+    """
+
+    def __init__(self, path: str = BANK_PATH,
+                 low_water: int = LOW_WATER,
+                 high_water: int = HIGH_WATER) -> None:
+        self.path = path
+        self.low_water = low_water
+        self.high_water = high_water
+        self._maps: Dict[str, mmap.mmap] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def draw(self, difficulty: Union[int, str]) -> Optional[BankRecord]:
+        """Take the next puzzle of the tier, None if the tier is empty"""
+        tier = tier_for(difficulty)
+        with self._lock:
+            mapped = self._map(tier)
+            if mapped is None:
+                return None
+            _, _, _, count, cursor = _HEADER.unpack_from(mapped)
+            if cursor >= count:
+                return None
+            puzzle, solution, score, tier_index = _RECORD.unpack_from(
+                mapped, _HEADER.size + cursor * _RECORD.size)
+            _HEADER.pack_into(
+                mapped, 0, _MAGIC, _VERSION, _RECORD.size, count, cursor + 1)
+        return BankRecord(
+            Data.unpack(solution), Data.unpack(puzzle), score,
+            TIERS[tier_index])
+
+    def remaining(self, difficulty: Union[int, str]) -> int:
+        tier = tier_for(difficulty)
+        with self._lock:
+            mapped = self._map(tier)
+            if mapped is None:
+                return 0
+            _, _, _, count, cursor = _HEADER.unpack_from(mapped)
+        return count - cursor
+
+    def add(self, solution: Sequence, puzzle: Sequence,
+            grade: Optional[Grade] = None) -> str:
+        """Store a puzzle under the tier it grades at, returns the tier"""
+        solution, puzzle = Data(data=solution), Data(data=puzzle)
+        if grade is None:
+            grade = Grader().grade(puzzle.flatten())
+        record = _RECORD.pack(
+            puzzle.pack(), solution.pack(),
+            min(grade.score, 0xffff), TIERS.index(grade.tier))
+        with self._lock:
+            self._append(grade.tier, record)
+        return grade.tier
+
+    def refill(self, logic: Optional[Logic] = None,
+               tiers: Sequence[str] = TIERS) -> int:
+        """Top up tiers below low water, returns puzzles added. A tier
+        is given up after MAX_MISSES puzzles in a row miss it.
+        """
+        added = 0
+        for tier in tiers:
+            if self.remaining(tier) >= self.low_water:
+                continue
+            misses = 0
+            while self.remaining(tier) < self.high_water \
+                    and misses < MAX_MISSES:
+                if self._generate(tier, logic):
+                    added += 1
+                    misses = 0
+                else:
+                    misses += 1
+        return added
+
+    def refill_step(self, logic: Optional[Logic] = None) -> bool:
+        """Make one attempt at a puzzle for the tier with the fewest left
+        below high water, for the browser where there is no refill
+        thread and the game refills between frames instead. False when
+        every tier is full or the attempt missed.
+        """
+        tier = min(TIERS, key=self.remaining)
+        if self.remaining(tier) >= self.high_water:
+            return False
+        return self._generate(tier, logic, 1)
+
+    def start_refill(self) -> None:
+        """Refill tiers in a background thread, a no-op in the browser,
+        see refill_step()
+        """
+        if sys.platform in ('emscripten', 'wasi') or self._thread:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._refill_loop, name='puzzle-bank-refill', daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        with self._lock:
+            for mapped in self._maps.values():
+                mapped.close()
+            self._maps.clear()
+
+    def _refill_loop(self) -> None:
+        """Top up every tier a puzzle at a time. A tier that misses waits
+        twice as long as after its last miss, up to REFILL_BACKOFF.
+        """
+        logic = Logic()
+        refilling = []
+        backoff = dict.fromkeys(TIERS, REFILL_PAUSE)
+        ready = dict.fromkeys(TIERS, 0.0)
+        while not self._stop.is_set():
+            refilling = [
+                tier for tier in TIERS
+                if self.remaining(tier) < self.low_water
+                or (tier in refilling
+                    and self.remaining(tier) < self.high_water)
+            ]
+            now = time.monotonic()
+            due = [tier for tier in refilling if ready[tier] <= now]
+            if not due:
+                self._stop.wait(
+                    min(ready[tier] for tier in refilling) - now
+                    if refilling else 1.0)
+                continue
+            tier = min(due, key=ready.get)  # the one waiting longest
+            if self._generate(tier, logic, REFILL_ATTEMPTS):
+                backoff[tier] = REFILL_PAUSE
+            else:
+                backoff[tier] = min(backoff[tier] * 2, REFILL_BACKOFF)
+                ready[tier] = now + backoff[tier]
+            self._stop.wait(REFILL_PAUSE)
+
+    def _generate(self, tier: str, logic: Optional[Logic],
+                  attempts: int = GRADE_ATTEMPTS) -> bool:
+        """Add a puzzle to tier, False when none of attempts graded at it"""
+        logic = logic or Logic()
+        game = logic.create_graded_game(
+            TIER_DIFFICULTY[tier], tier, attempts)
+        if game is None:
+            return False
+        self.add(*game)
+        return True
+
+    def _filename(self, tier: str) -> str:
+        return join(self.path, f'{tier}.bin')
+
+    def _map(self, tier: str) -> Optional[mmap.mmap]:
+        if tier not in self._maps:
+            try:
+                with open(self._filename(tier), 'r+b') as file:
+                    self._maps[tier] = mmap.mmap(file.fileno(), 0)
+            except (FileNotFoundError, ValueError):
+                return None
+            mapped = self._maps[tier]
+            # a file cut short by a crash while appending may lack the
+            # header or records it counts
+            header = _HEADER.unpack_from(mapped) \
+                if len(mapped) >= _HEADER.size else None
+            if header is None \
+                    or header[:3] != (_MAGIC, _VERSION, _RECORD.size) \
+                    or len(mapped) < _HEADER.size + header[3] * _RECORD.size:
+                self._maps.pop(tier).close()
+                raise ValueError(f'{self._filename(tier)} is not a bank file')
+        return self._maps[tier]
+
+    def _append(self, tier: str, record: bytes) -> None:
+        try:
+            mapped = self._map(tier)
+        except ValueError:
+            mapped = None  # start a damaged file over
+        if mapped is None:
+            os.makedirs(self.path, exist_ok=True)
+            with open(self._filename(tier), 'wb') as file:
+                file.write(_HEADER.pack(_MAGIC, _VERSION, _RECORD.size, 1, 0))
+                file.write(record)
+            return
+
+        _, _, _, count, cursor = _HEADER.unpack_from(mapped)
+        start = _HEADER.size + cursor * _RECORD.size
+        end = _HEADER.size + count * _RECORD.size
+        records = mapped[start:end] if cursor else b''
+        self._maps.pop(tier).close()
+        with open(self._filename(tier), 'r+b') as file:
+            if cursor:
+                # drop drawn records so the file only holds unused ones
+                file.seek(_HEADER.size)
+                file.write(records)
+            else:
+                file.seek(end)
+            file.write(record)
+            file.truncate()
+            file.seek(0)
+            file.write(_HEADER.pack(
+                _MAGIC, _VERSION, _RECORD.size, count - cursor + 1, 0))
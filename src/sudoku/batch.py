@@ -0,0 +1,107 @@
+# -*- coding: utf-8
+import os
+import random
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from .logic import Logic
+from .solver import SolverStats
+
+GeneratedGame = Tuple[List[List[int]], List[List[int]]]
+
+DEFAULT_CHUNK_SIZE = 50
+
+
+def _report(message: str) -> None:
+    print(message, file=sys.stderr)
+
+
+def _generate_chunk(seed: int, size: int, difficulty: int, unique: bool,
+                    tier: Optional[str], with_stats: bool = False) \
+        -> Tuple[List[GeneratedGame], Optional[SolverStats]]:
+    stats = SolverStats() if with_stats else None
+    logic = Logic(random.Random(seed), stats)
+    games = [logic.create_game(difficulty, unique, tier) for _ in range(size)]
+    # with a tier games that never graded at it are None, drop them
+    return [game for game in games if game is not None], stats
+
+
+def generate_batch(
+    count: int,
+    difficulty: int = 50,
+    workers: Optional[int] = None,
+    seed: Optional[int] = None,
+    unique: bool = True,
+    tier: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    report: Optional[Callable[[str], None]] = _report,
+    stats: Optional[SolverStats] = None
+) -> Iterator[GeneratedGame]:
+    """Generate count (solution, puzzle) pairs across worker processes.
+
+    The batch is cut into chunks of chunk_size games and every chunk
+    gets its own seed drawn from seed, so a seeded batch produces the
+    same games whatever the number of workers; only the order in which
+    chunks arrive may differ. At most two chunks per worker are in
+    flight, results are yielded as soon as their chunk completes.
+
+    With tier given every game is regenerated until it grades at that
+    tier, see Logic.create_game, and games that do not get there are
+    left out, so fewer than count may be yielded. workers defaults to
+    the CPU count, workers=1 generates in the calling process. The
+    throughput is passed to report once the batch is exhausted. The
+    solver effort of every chunk is added to stats, if given, as the
+    chunk arrives.
+    """
+    master = random.Random(seed)
+    chunks = [
+        (master.getrandbits(64), min(chunk_size, count - start))
+        for start in range(0, count, chunk_size)
+    ]
+    workers = workers or os.cpu_count() or 1
+    start_time = time.perf_counter()
+    generated = 0
+
+    if workers == 1:
+        for chunk_seed, size in chunks:
+            games, chunk_stats = _generate_chunk(
+                chunk_seed, size, difficulty, unique, tier, stats is not None)
+            if chunk_stats is not None:
+                stats.merge(chunk_stats)
+            for game in games:
+                generated += 1
+                yield game
+    else:
+        pending = set()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            try:
+                chunks.reverse()
+                while chunks or pending:
+                    while chunks and len(pending) < 2 * workers:
+                        chunk_seed, size = chunks.pop()
+                        pending.add(executor.submit(
+                            _generate_chunk, chunk_seed, size,
+                            difficulty, unique, tier, stats is not None))
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        games, chunk_stats = future.result()
+                        if chunk_stats is not None:
+                            stats.merge(chunk_stats)
+                        for game in games:
+                            generated += 1
+                            yield game
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    if report is not None:
+        run_time = time.perf_counter() - start_time
+        missed = f', {count - generated} missed {tier}' \
+            if generated < count else ''
+        report(
+            f'{time.asctime()} BATCH: Generated {generated} puzzles in '
+            f'{run_time:.2f} sec ({generated / run_time:.1f} puzzles/sec)'
+            f'{missed}'
+        )
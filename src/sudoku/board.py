@@ -1,59 +1,179 @@
 # -*- coding: utf-8
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 import pygame
 
+from . import glyphs
 from .cell import Cell
-from .constants import DEFAULT_BORDER_WIDTH, WHITE
+from .conflicts import Conflicts
+from .constants import (DEFAULT_BORDER_WIDTH, FONT_SCALE, MINT, PALEBLUE, SKY,
+                        WHITE)
+from .decorators import timer
+from .grader import Step, next_step
+from .units import UNITS
+
+GRID_COLORKEY = (255, 0, 255)
+# grid line layers by board surface size and border width
+_grids = {}
 
 
 class Board:
     cells = []
+    correct = 0  # cells holding their solution digit, givens included
+    conflicts = None
+    hinted = ()  # cells highlighted by the last hint
+    _redraw_all = True
+    _font_sizes = ()  # of the digits and pencil marks of the last board
 
     def __init__(self, rect: pygame.Rect, puzzle: List[List[int]]) -> None:
         self.game_screen = pygame.display.get_surface()
-        self.square_size = rect.width // 9
+        self.square_size = rect.width // UNITS.side
+        # cells share fonts and glyphs, drop the ones of a resized board
+        font_sizes = (int(self.square_size * FONT_SCALE),
+                      int(self.square_size / 3 * FONT_SCALE))
+        if Board._font_sizes and font_sizes != Board._font_sizes:
+            glyphs.evict(set(Board._font_sizes) - set(font_sizes))
+        Board._font_sizes = font_sizes
         self.surf = pygame.Surface(
-            (self.square_size * 9 + 2, self.square_size * 9 + 2)).convert()
+            (self.square_size * UNITS.side + 2,
+             self.square_size * UNITS.side + 2)).convert()
         self.rect = rect
         self.puzzle = puzzle
-        self.cells = [
-            Cell(
-                self._make_rect(index),
+        self.cells = []
+        for index, value in enumerate(puzzle.flatten()):
+            rect = self._make_rect(index)
+            self.cells.append(Cell(
+                rect,
                 cid=index,
                 value=value,
                 is_definite=bool(value),
+                is_show_border=False,
                 border=self._make_border(index, DEFAULT_BORDER_WIDTH),
-                parent_surf=self.surf
-            )
-            for index, value in enumerate(puzzle.flatten())
-        ]
+                parent_surf=self.surf,
+                surf=self.surf.subsurface(rect)
+            ))
+        self.grid = self._get_grid()
+        self.correct = sum(1 for cell in self.cells if cell.value)
+        self.conflicts = Conflicts(puzzle.flatten(), UNITS)
+        for index in self.conflicts:
+            self.cells[index].conflict = True
 
     def __repr__(self):
         return f'{self.cells}'  # pragma no cover
 
-    def handle_number_entered(self, index, value, is_correct) -> None:
-        """Set new value to selected_id cell"""
+    def handle_number_entered(self, index, value, is_correct,
+                              eliminate: bool = True) -> None:
+        """Set new value to selected_id cell, removing it from the pencil
+        marks of its peers unless eliminate is False
+        """
         if index is not None:
+            if self.cells[index].guessed:
+                self.correct -= 1
+            if is_correct:
+                self.correct += 1
             self.cells[index].value = value
             self.cells[index].guessed = is_correct
+            self.cells[index].marks = 0
+            if value and eliminate:
+                # the digit is no longer a candidate of the cell's peers
+                for peer in UNITS.peers[index]:
+                    self.cells[peer].marks &= ~(1 << (value - 1))
+            if self.conflicts is not None:
+                for changed in self.conflicts.update(index, value):
+                    self.cells[changed].conflict = changed in self.conflicts
 
     def handle_deleted(self, index: int) -> None:
         if index is not None:
+            if self.cells[index].guessed:
+                self.correct -= 1
             self.cells[index].value = 0
             self.cells[index].guessed = False
+            if self.conflicts is not None:
+                for changed in self.conflicts.update(index, 0):
+                    self.cells[changed].conflict = changed in self.conflicts
+
+    def is_solved(self) -> bool:
+        """True once every cell holds its solution digit"""
+        return self.correct == len(self.cells)
 
     def handle_clicked(self, pos: Tuple[int]) -> None:
         [cell.handle_clicked(pos) for cell in self.cells]
 
+    def toggle_mark(self, index: int, value: int) -> None:
+        """Add or remove value from the pencil marks of an empty cell"""
+        if index is not None and value and not self.cells[index].value:
+            self.cells[index].marks ^= 1 << (value - 1)
+
+    def fill_marks(self) -> None:
+        """Pencil in every candidate of every empty cell"""
+        for index, cell in enumerate(self.cells):
+            if not cell.value:
+                cell.marks = self.conflicts.candidates(index)
+
+    @timer
+    def hint(self) -> Optional[Step]:
+        """Find the easiest next move from the givens and correct entries
+        and highlight it: the cell to fill, the cells the deduction
+        rests on and the units it was made in. Returns the step, None
+        when no logical move is left.
+        """
+        self.clear_hint()
+        values = [
+            cell.value if cell.guessed else given
+            for cell, given in zip(self.cells, self.puzzle.flatten())
+        ]
+        step = next_step(values)
+        if step is None:
+            return None
+        for unit in step.units:
+            for index in UNITS.units[unit]:
+                if not self.puzzle[index]:
+                    self.cells[index].highlight = PALEBLUE
+        for index in step.cells:
+            self.cells[index].highlight = SKY
+        for index, _ in step.placements:
+            self.cells[index].highlight = MINT
+        self.hinted = [
+            index for index, cell in enumerate(self.cells) if cell.highlight]
+        return step
+
+    def clear_hint(self) -> None:
+        for index in self.hinted:
+            self.cells[index].highlight = None
+        self.hinted = ()
+
     def set_hints(self, value: bool) -> None:
         for cell in self.cells:  # pragma no cover
             cell.hint = value
 
-    def draw(self) -> None:
-        self.surf.fill(WHITE)
-        [cell.draw() for cell in self.cells]
-        self.game_screen.blit(self.surf, self.rect)
+    def set_conflicts(self, value: bool) -> None:
+        """Highlight cells repeating a digit in a row, column or box"""
+        for cell in self.cells:
+            cell.conflicts = value
+
+    def draw(self) -> List[pygame.Rect]:
+        """Redraw cells that changed since the last call.
+        Returns the screen rects that were updated.
+        """
+        if self._redraw_all:
+            self._redraw_all = False
+            self.surf.fill(WHITE)
+            [cell.draw() for cell in self.cells]
+            self.surf.blit(self.grid, (0, 0))
+            return [self.game_screen.blit(self.surf, self.rect)]
+
+        rects = []
+        for cell in self.cells:
+            if cell.dirty:
+                cell.draw()
+                self.surf.blit(self.grid, cell.rect, cell.rect)
+                rects.append(self.game_screen.blit(
+                    self.surf, cell.rect.move(self.rect.topleft), cell.rect))
+        return rects
+
+    def invalidate(self) -> None:
+        """Redraw the whole board on the next draw()"""
+        self._redraw_all = True
 
     def get_value(self, index: int) -> int or None:
         if 0 <= index < len(self.cells):
@@ -63,9 +183,26 @@ class Board:
     def get_values(self) -> List[int]:
         return [cell.value for cell in self.cells]
 
+    def _get_grid(self) -> pygame.Surface:
+        """Grid lines of all cells drawn once per board size on a
+        colorkeyed surface, blitted over cells after they are drawn
+        """
+        key = (self.surf.get_size(), DEFAULT_BORDER_WIDTH)
+        grid = _grids.get(key)
+        if grid is None:
+            _grids.clear()
+            grid = pygame.Surface(self.surf.get_size()).convert()
+            grid.fill(GRID_COLORKEY)
+            for cell in self.cells:
+                cell._draw_border(grid, cell.rect.topleft)
+            grid.set_colorkey(GRID_COLORKEY, pygame.RLEACCEL)
+            _grids[key] = grid
+        return grid
+
     def _make_rect(self, offset: int) -> pygame.Rect:
         rect = pygame.Rect(
-            (offset // 9 * self.square_size, offset % 9 * self.square_size),
+            (UNITS.rows[offset] * self.square_size,
+             UNITS.cols[offset] * self.square_size),
             (self.square_size, self.square_size)
         )
         return rect
@@ -74,22 +211,20 @@ class Board:
         """Adjusts border thickness of a cell depending on cell's index
         Returns list of [left, top, right, bottom] thickness in pixels
         """
-        t = border
-        t2 = 2 * border
-        t4 = 4 * border
-        ia = index + 1
-        i9a = index + 9
-
-        # every 3 cells t2 border or t1
-        tp = t2 if index % 3 == 0 else t
-        bm = t2 if ia % 3 == 0 else t
-        lt = t2 if (index // 9) % 3 == 0 else t
-        rt = t2 if (i9a // 9) % 3 == 0 else t
-
-        # outside border t4
-        tp = t4 if index % 9 == 0 else tp
-        bm = t4 if ia % 9 == 0 else bm
-        lt = t4 if (index // 9) == 0 else lt
-        rt = t4 if (i9a // 9) % 9 == 0 else rt
-
-        return [lt, tp, rt, bm]
+        # cells are laid out column by column, puzzle rows run across
+        col, row = UNITS.rows[index], UNITS.cols[index]
+        return [
+            self._line_width(col, border),
+            self._line_width(row, border),
+            self._line_width(col + 1, border),
+            self._line_width(row + 1, border),
+        ]
+
+    @staticmethod
+    def _line_width(line: int, border: int) -> int:
+        """Width of grid line number line, 0 and side being the outline"""
+        if line % UNITS.side == 0:
+            return 4 * border
+        if line % UNITS.base == 0:
+            return 2 * border
+        return border
@@ -1,15 +1,14 @@
 # -*- coding: utf-8
-from os.path import abspath, dirname, join, normpath
 from types import SimpleNamespace
 from typing import List, Optional, Tuple, TypedDict, Union
 
 import pygame
 
-from .constants import (BLACK, BUBBLEGUM, CREAM, CUSTOM_EVENT_TYPE, FONT_SCALE,
-                        WHITE)
+from . import glyphs
+from .constants import (BLACK, BUBBLEGUM, CORAL, CREAM, CUSTOM_EVENT_TYPE,
+                        FONT_SCALE, GREY, WHITE)
 from .util import attributes
 
-BASE_PATH = abspath(dirname(__file__))
 
 class CellArgs(TypedDict):
     border_top: Optional[int]
@@ -19,9 +18,11 @@ class CellArgs(TypedDict):
     border: Optional[List[int]]
     is_definite: Optional[bool]
     is_show_value: Optional[bool]
+    is_show_border: Optional[bool]
     font: Optional[pygame.Font]
     font_size: Optional[Union[int, float]]
     parent_surf: Optional[pygame.Surface]
+    surf: Optional[pygame.Surface]
     background_color: Optional[Tuple[int]]
     selected_color: Optional[Tuple[int]]
     definite_color: Optional[Tuple[int]]
@@ -31,7 +32,6 @@ class CellArgs(TypedDict):
 
 class Cell():
     cid = -1
-    value = 0
     color = '#ffffff'
     border_color = '#000000'
     selected_color = '#0000ff'
@@ -46,10 +46,18 @@ class Cell():
     font = None
     font_size = None
 
+    _value = 0
+    _dirty = True
     _definite = False
     _hint_on = False
     _guessed = False
+    _conflicts_on = False
+    _conflict = False
+    _marks = 0
+    _highlight = None
     _show_value = True
+    _show_border = True
+    _owns_surf = True
     _selected = False
 
     def __init__(self, rect: pygame.Rect, **kwargs: CellArgs) -> None:
@@ -74,6 +82,16 @@ class Cell():
             is_show_value: bool = True
                 Enables value to be drawn in the cell. See: value
 
+            is_show_border: bool = True
+                Enables the border to be drawn. A board drawing the
+                grid lines itself turns it off, border widths are still
+                used to place the selection.
+
+            surf: pygame.Surface = None
+                Surface to draw on directly, e.g. a subsurface of
+                parent_surf. By default the cell draws on a surface of
+                its own and blits it onto parent_surf.
+
             parent_surf: pygame.Surface = pygame.display.get_surface()
                 A parent surface the cell will be painted on. Defaults
                 to pygame diplay surface.
@@ -103,14 +121,19 @@ class Cell():
             (max(rect.width, rect.height), max(rect.width, rect.height))
         )
         self._dimension = rect.width
-        self.surf = pygame.Surface((self._dimension, self._dimension))\
-            .convert_alpha()
+        if 'surf' in kwargs:
+            self.surf = kwargs['surf']
+            self._owns_surf = False
+        else:
+            self.surf = pygame.Surface((self._dimension, self._dimension))\
+                .convert_alpha()
 
         kwargs_list = [
             'cid',
             'value',
             'is_definite',
             'is_show_value',
+            'is_show_border',
             'parent_surf',
             'border_top',
             'border_right',
@@ -141,11 +164,7 @@ class Cell():
         if self.font_size is None:
             self.font_size = int(self._dimension * FONT_SCALE)
         if self.font is None:
-            if not pygame.font.get_init():
-                pygame.font.init()  # pragma no cover
-            self.font = pygame.font.Font(
-                normpath(join(BASE_PATH, '../fonts/FreeSans.otf')),
-                self.font_size)
+            self.font = glyphs.get_font(self.font_size)
         if 'border' in kwargs:
             self.border_left = kwargs['border'][0]
             self.border_top = kwargs['border'][1]
@@ -164,12 +183,17 @@ class Cell():
     def draw(self):
         self._draw_background()
         self._draw_number()
-        self._draw_border()
+        self._draw_marks()
+        if self._show_border:
+            self._draw_border()
         self._draw_selected()
-        self.parent_surf.blit(self.surf, self.rect)
+        if self._owns_surf:
+            self.parent_surf.blit(self.surf, self.rect)
+        self._dirty = False
 
     def toggle_hint(self):
         self._hint_on = not self._hint_on
+        self._dirty = True
 
     def handle_clicked(self, pos: Tuple[int]) -> None:
         if self.rect.collidepoint(pos) and not self._definite:
@@ -181,12 +205,27 @@ class Cell():
                 selected=self._selected)
             pygame.event.post(event)
 
+    @property
+    def dirty(self) -> bool:
+        """True when the cell changed since it was last drawn"""
+        return self._dirty
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+    @value.setter
+    def value(self, value: int) -> None:
+        self._dirty = self._dirty or value != self._value
+        self._value = value
+
     @property
     def hint(self) -> bool:
         return self._hint_on
 
     @hint.setter
     def hint(self, value: bool) -> None:
+        self._dirty = self._dirty or value != self._hint_on
         self._hint_on = value
 
     @property
@@ -195,14 +234,56 @@ class Cell():
 
     @guessed.setter
     def guessed(self, value: bool) -> None:
+        self._dirty = self._dirty or value != self._guessed
         self._guessed = value
 
+    @property
+    def conflicts(self) -> bool:
+        """Whether a conflict is highlighted"""
+        return self._conflicts_on
+
+    @conflicts.setter
+    def conflicts(self, value: bool) -> None:
+        self._dirty = self._dirty or value != self._conflicts_on
+        self._conflicts_on = value
+
+    @property
+    def conflict(self) -> bool:
+        """True when the value repeats in the cell's row, column or box"""
+        return self._conflict
+
+    @conflict.setter
+    def conflict(self, value: bool) -> None:
+        self._dirty = self._dirty or value != self._conflict
+        self._conflict = value
+
+    @property
+    def highlight(self) -> Optional[Tuple[int, int, int]]:
+        """Background color marking the cell in a hint, None if not"""
+        return self._highlight
+
+    @highlight.setter
+    def highlight(self, value: Optional[Tuple[int, int, int]]) -> None:
+        self._dirty = self._dirty or value != self._highlight
+        self._highlight = value
+
+    @property
+    def marks(self) -> int:
+        """Pencil marks, bit d - 1 set for digit d, shown while empty"""
+        return self._marks
+
+    @marks.setter
+    def marks(self, value: int) -> None:
+        self._dirty = self._dirty or value != self._marks
+        self._marks = value
+
     @property
     def display(self) -> bool:
         return self._show_value
 
     @display.setter
     def display(self, value: bool) -> None:
+        self._dirty = self._dirty or value != self._show_value
         self._show_value = value
 
     @property
@@ -211,6 +292,7 @@ class Cell():
 
     @selected.setter
     def selected(self, value: bool) -> None:
+        self._dirty = self._dirty or value != self._selected
         self._selected = value
 
     def _set_border_offset(self):
@@ -246,7 +328,11 @@ class Cell():
 
     def _set_bg_color(self):
         color = WHITE
-        if self._definite:
+        if self._conflicts_on and self._conflict:
+            color = CORAL
+        elif self._highlight:
+            color = self._highlight
+        elif self._definite:
             color = self.definite_color
         elif self._hint_on:
             if not self._guessed and self.value > 0:
@@ -256,6 +342,7 @@ class Cell():
     def _toggle_selected(self):
         if not self._definite:
             self._selected = not self._selected
+            self._dirty = True
 
     def _draw_background(self):
         self._set_bg_color()
@@ -263,43 +350,65 @@ class Cell():
 
     def _draw_number(self):
         if (self._show_value and self.value):
-            surf = self.font.render(str(self.value), True, BLACK, self.color)
+            surf = glyphs.get_glyph(self.font, self.value, BLACK, self.color)
             rect = surf.get_rect(center=(
                 self._dimension//2, (self._dimension//2)*1.1)
             )
             self.surf.blit(surf, rect)
 
-    def _draw_border(self):
+    def _draw_marks(self):
+        if self.value or not self._marks:
+            return
+        size = self._dimension
+        atlas = glyphs.get_marks(
+            glyphs.get_font(int(size / 3 * FONT_SCALE)), size, GREY,
+            self.color)
+        marks = self._marks
+        while marks:
+            bit = marks & -marks
+            marks ^= bit
+            area = glyphs.mark_rect(bit.bit_length(), size)
+            self.surf.blit(atlas, area, area)
+
+    def _draw_border(self, surf: Optional[pygame.Surface] = None,
+                     offset: Tuple[int, int] = (0, 0)):
+        """Draw the border on surf, the cell's own surface by default,
+        with the cell's top-left corner at offset
+        """
+        surf = self.surf if surf is None else surf
+        x, y = offset
         # left
         pygame.draw.line(
-            self.surf,
+            surf,
             self.border_color,
-            (self.border_offset.left, 0),
-            (self.border_offset.left, self._dimension),
+            (x + self.border_offset.left, y),
+            (x + self.border_offset.left, y + self._dimension),
             self.border_left
         )
         # top
         pygame.draw.line(
-            self.surf,
+            surf,
             self.border_color,
-            (0, self.border_offset.top),
-            (self._dimension, self.border_offset.top),
+            (x, y + self.border_offset.top),
+            (x + self._dimension, y + self.border_offset.top),
             self.border_top
         )
         # right
         pygame.draw.line(
-            self.surf,
+            surf,
             self.border_color,
-            (self._dimension - self.border_offset.right, 0),
-            (self._dimension - self.border_offset.right, self._dimension),
+            (x + self._dimension - self.border_offset.right, y),
+            (x + self._dimension - self.border_offset.right,
+             y + self._dimension),
             self.border_right
         )
         # bottom
         pygame.draw.line(
-            self.surf,
+            surf,
             self.border_color,
-            (0, self._dimension - self.border_offset.bottom),
-            (self._dimension, self._dimension - self.border_offset.bottom),
+            (x, y + self._dimension - self.border_offset.bottom),
+            (x + self._dimension,
+             y + self._dimension - self.border_offset.bottom),
             self.border_bottom
         )
 
@@ -0,0 +1,278 @@
+# -*- coding: utf-8
+"""Headless puzzle tools, no display or pygame required.
+
+Puzzles are read from files or stdin and written to stdout one per
+line in the 81-character format, '0' or '.' marking an empty cell.
+
+    python -m sudoku.cli generate -n 1000 -d 70 > puzzles.txt
+    python -m sudoku.cli solve < puzzles.txt
+    python -m sudoku.cli validate puzzles.txt
+    python -m sudoku.cli grade puzzles.txt
+    python -m sudoku.cli check --only invalid puzzles.txt
+
+--stats reports the solver's search effort, per puzzle for solve to
+find pathological ones and for the whole batch for generate. solve and
+validate take --variant to add the regions of diagonal sudoku or
+windoku, solved with Dancing Links. check
+needs numpy and takes in many boards at a time, it finds rule breaks
+and dead ends without searching for solutions.
+"""
+import argparse
+import fileinput
+import itertools
+import sys
+from typing import Iterator, List, Optional
+
+from .data import Data
+from .dlx import DlxSolver, diagonals, windows
+from .grader import TIERS, Grader
+from .solver import Solver, SolverStats
+
+# results of check: no empty cell, an empty cell without a candidate,
+# neither and a digit repeated in a unit
+CHECK_RESULTS = ('solved', 'valid', 'stuck', 'invalid')
+
+
+# extra regions holding every digit once by --variant
+VARIANTS = {'diagonal': diagonals, 'windoku': windows}
+
+
+def _print_err(message: str) -> None:
+    print(message, file=sys.stderr)
+
+
+def _make_solver(args: argparse.Namespace,
+                 stats: Optional[SolverStats] = None) -> Solver:
+    if args.variant is None:
+        return Solver(stats)
+    return DlxSolver(stats, VARIANTS[args.variant]())
+
+
+def _read_puzzles(files: List[str]) -> Iterator[Data]:
+    with fileinput.FileInput(files or ('-',)) as lines:
+        for line in lines:
+            if line.strip():
+                yield Data.from_line(line)
+
+
+def _generate(args: argparse.Namespace) -> int:
+    # multiprocessing is slow to import, only generate needs it
+    from .batch import generate_batch
+    from .logic import TIER_DIFFICULTY
+
+    stats = SolverStats() if args.stats else None
+    difficulty = args.difficulty
+    if difficulty is None:
+        difficulty = 50 if args.tier is None else TIER_DIFFICULTY[args.tier]
+    games = generate_batch(
+        args.count, difficulty, workers=args.workers, seed=args.seed,
+        tier=args.tier, report=None if args.quiet else _print_err,
+        stats=stats)
+    generated = 0
+    for solution, puzzle in games:
+        line = Data(data=puzzle).to_line()
+        if args.solution:
+            line += ',' + Data(data=solution).to_line()
+        sys.stdout.write(line + '\n')
+        generated += 1
+    if stats is not None:
+        _print_err(f'STATS: {stats.summary()}')
+    if generated < args.count:
+        _print_err(f'{args.count - generated} of {args.count} puzzles did '
+                   f'not grade {args.tier}')
+        return 1
+    return 0
+
+
+def _solve(args: argparse.Namespace) -> int:
+    status = 0
+    for puzzle in _read_puzzles(args.files):
+        stats = SolverStats() if args.stats else None
+        solution = _make_solver(args, stats).solve(puzzle.flatten())
+        if solution is None:
+            line = 'none'
+            status = 1
+        else:
+            line = ''.join(map(str, solution))
+        if stats is not None:
+            line += (
+                f',{stats.nodes},{stats.backtracks},{stats.propagations},'
+                f'{stats.max_depth},{stats.seconds * 1000:.3f}')
+        sys.stdout.write(line + '\n')
+    return status
+
+
+def _validate(args: argparse.Namespace) -> int:
+    solver = _make_solver(args)
+    status = 0
+    for puzzle in _read_puzzles(args.files):
+        count = solver.count_solutions(puzzle.flatten(), limit=2)
+        result = ('invalid', 'unique', 'multiple')[count]
+        sys.stdout.write(f'{puzzle.to_line()},{result}\n')
+        status = status or int(count != 1)
+    return status
+
+
+def _grade(args: argparse.Namespace) -> int:
+    grader = Grader()
+    status = 0
+    for puzzle in _read_puzzles(args.files):
+        try:
+            grade = grader.grade(puzzle.flatten())
+        except ValueError:  # a digit given twice or no solution
+            sys.stdout.write(f'{puzzle.to_line()},invalid\n')
+            status = 1
+            continue
+        sys.stdout.write(f'{puzzle.to_line()},{grade.score},{grade.tier}\n')
+    return status
+
+
+def _check(args: argparse.Namespace) -> int:
+    try:
+        from . import vectorized
+    except ImportError:
+        raise ValueError('check needs numpy: pip install numpy') from None
+
+    status = 0
+    with fileinput.FileInput(args.files or ('-',)) as lines:
+        puzzles = (line.strip() for line in lines if line.strip())
+        while True:
+            batch = list(itertools.islice(puzzles, vectorized.CHUNK_SIZE))
+            if not batch:
+                return status
+            checks = vectorized.check(vectorized.from_lines(batch))
+            for line, valid, solved, stuck in zip(
+                    batch, checks.valid.tolist(), checks.solved.tolist(),
+                    checks.stuck.tolist()):
+                result = ('invalid' if not valid else 'solved' if solved
+                          else 'stuck' if stuck else 'valid')
+                status = status or int(not valid)
+                if args.only is None or result == args.only:
+                    sys.stdout.write(
+                        f"{line.replace('0', '.')},{result}\n")
+
+
+def _bank(args: argparse.Namespace) -> int:
+    from .bank import PuzzleBank
+    from .batch import generate_batch
+    from .logic import TIER_DIFFICULTY
+
+    bank = PuzzleBank(args.path)
+    try:
+        for tier in args.tier or TIERS:
+            games = generate_batch(
+                args.count, TIER_DIFFICULTY[tier], workers=args.workers,
+                seed=args.seed, tier=tier,
+                report=None if args.quiet else _print_err)
+            for solution, puzzle in games:
+                bank.add(solution, puzzle)
+        for tier in TIERS:
+            sys.stdout.write(f'{tier},{bank.remaining(tier)}\n')
+    finally:
+        bank.close()
+    return 0
+
+
+def _add_variant(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        '--variant', choices=sorted(VARIANTS), default=None,
+        help='also require every digit once in the regions of a variant')
+
+
+def make_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='python -m sudoku.cli',
+        description='Generate, solve, validate and grade sudoku puzzles.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    generate = commands.add_parser(
+        'generate', help='generate puzzles with a unique solution')
+    generate.add_argument('-n', '--count', type=int, default=1)
+    generate.add_argument(
+        '-d', '--difficulty', type=int, default=None,
+        help='difficulty percent 0-100 (default: 50, or the one suiting '
+        '--tier)')
+    generate.add_argument(
+        '-w', '--workers', type=int, default=1,
+        help='worker processes, 0 for one per CPU (default: 1)')
+    generate.add_argument('-s', '--seed', type=int, default=None)
+    generate.add_argument(
+        '-t', '--tier', choices=TIERS, default=None,
+        help='only keep puzzles graded at this tier, the ones that miss '
+        'it after a number of attempts are left out')
+    generate.add_argument(
+        '--solution', action='store_true',
+        help='append ",<solution>" to every puzzle')
+    generate.add_argument(
+        '-q', '--quiet', action='store_true',
+        help='do not report throughput on stderr')
+    generate.add_argument(
+        '--stats', action='store_true',
+        help='report the solver effort of the batch on stderr')
+    generate.set_defaults(func=_generate)
+
+    solve = commands.add_parser(
+        'solve', help='print the solution of every puzzle or "none"')
+    solve.add_argument('files', nargs='*', help='input files (default: -)')
+    solve.add_argument(
+        '--stats', action='store_true',
+        help='append ",nodes,backtracks,propagations,max_depth,ms"')
+    _add_variant(solve)
+    solve.set_defaults(func=_solve)
+
+    validate = commands.add_parser(
+        'validate',
+        help='print every puzzle followed by unique, multiple or invalid')
+    validate.add_argument('files', nargs='*', help='input files (default: -)')
+    _add_variant(validate)
+    validate.set_defaults(func=_validate)
+
+    grade = commands.add_parser(
+        'grade', help='print every puzzle followed by its score and tier, '
+        'or by invalid')
+    grade.add_argument('files', nargs='*', help='input files (default: -)')
+    grade.set_defaults(func=_grade)
+
+    check = commands.add_parser(
+        'check', help='print every puzzle followed by solved, valid, stuck '
+        'or invalid, checked in batches with numpy')
+    check.add_argument('files', nargs='*', help='input files (default: -)')
+    check.add_argument(
+        '--only', choices=CHECK_RESULTS, default=None,
+        help='only print the puzzles with this result')
+    check.set_defaults(func=_check)
+
+    bank = commands.add_parser(
+        'bank', help='add puzzles to the puzzle bank used by the game')
+    bank.add_argument(
+        '-p', '--path', default=None,
+        help='bank directory (default: ~/.sudoku/bank)')
+    bank.add_argument(
+        '-n', '--count', type=int, default=100,
+        help='puzzles to generate per tier (default: 100)')
+    bank.add_argument(
+        '-t', '--tier', choices=TIERS, action='append',
+        help='tier to fill, may be repeated (default: all)')
+    bank.add_argument('-w', '--workers', type=int, default=0,
+                      help='worker processes, 0 for one per CPU (default: 0)')
+    bank.add_argument('-s', '--seed', type=int, default=None)
+    bank.add_argument('-q', '--quiet', action='store_true')
+    bank.set_defaults(func=_bank)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = make_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except ValueError as error:
+        _print_err(f'error: {error}')
+        return 2
+    except BrokenPipeError:  # pragma no cover
+        sys.stderr.close()
+        return 1
+
+
+if __name__ == '__main__':  # pragma no cover
+    sys.exit(main())
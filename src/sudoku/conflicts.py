@@ -0,0 +1,86 @@
+# -*- coding: utf-8
+from typing import Iterator, Optional, Sequence, Set
+
+from .units import Units, get_units
+
+
+class Conflicts:
+    """Cells repeating a digit within their row, column or box.
+
+    Every unit keeps the set of its cells holding each digit, the size
+    of a set being the digit's count in the unit, and a mask of the
+    digits it holds for candidates(). Placing or clearing a digit only
+    touches the three units of the cell and the cells that share the
+    old or new digit with it, so an update costs the same however large
+    the board is.
+    """
+    __slots__ = ('units', '_values', '_where', '_used', '_cells')
+
+    def __init__(self, values: Sequence[int],
+                 units: Optional[Units] = None) -> None:
+        self.units = units or get_units(int(len(values) ** 0.5))
+        side = self.units.side
+        self._values = [0] * (side * side)
+        # cells by unit * (side + 1) + digit
+        self._where = [set() for _ in range(3 * side * (side + 1))]
+        self._used = [0] * (3 * side)
+        self._cells = set()
+        for pos, value in enumerate(values):
+            if value:
+                self.update(pos, value)
+
+    def __contains__(self, pos: int) -> bool:
+        return pos in self._cells
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(sorted(self._cells))
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def count(self, unit: int, digit: int) -> int:
+        """How many cells of unit hold digit"""
+        return len(self._where[unit * (self.units.side + 1) + digit])
+
+    def candidates(self, pos: int) -> int:
+        """Mask of the digits not in the row, column or box of pos, bit
+        d - 1 for digit d
+        """
+        u0, u1, u2 = self.units.cell_units[pos]
+        used = self._used
+        return self.units.full & ~(used[u0] | used[u1] | used[u2])
+
+    def update(self, pos: int, value: int) -> Set[int]:
+        """Put value in cell pos, 0 to clear it. Returns the cells that
+        started or stopped conflicting.
+        """
+        stride = self.units.side + 1
+        old = self._values[pos]
+        touched = {pos}
+        for unit in self.units.cell_units[pos]:
+            if old:
+                where = self._where[unit * stride + old]
+                where.discard(pos)
+                touched |= where
+                if not where:
+                    self._used[unit] &= ~(1 << (old - 1))
+            if value:
+                where = self._where[unit * stride + value]
+                where.add(pos)
+                touched |= where
+                self._used[unit] |= 1 << (value - 1)
+        self._values[pos] = value
+
+        changed = set()
+        for cell in touched:
+            digit = self._values[cell]
+            clash = bool(digit) and any(
+                len(self._where[unit * stride + digit]) > 1
+                for unit in self.units.cell_units[cell])
+            if clash != (cell in self._cells):
+                changed.add(cell)
+                if clash:
+                    self._cells.add(cell)
+                else:
+                    self._cells.discard(cell)
+        return changed
@@ -1,5 +1,8 @@
 # -*- coding: utf-8
 FPS = 30
+IDLE_TIMEOUT = 1000  # ms to block waiting for input while nothing changes
+BROWSER_IDLE_SLEEP = 100  # ms between input polls when idle in a browser
+AUTOSAVE_SECONDS = 10  # save the clock at least this often while playing
 WIDTH, HEIGHT = 500, 600
 FONT_SCALE = 0.75
 DEFAULT_BORDER_WIDTH = 1
@@ -7,10 +10,14 @@ DEFAULT_BORDER_WIDTH = 1
 # rgb
 WHITE = (255, 255, 255)
 BUBBLEGUM = (255, 204, 204)
+CORAL = (255, 160, 130)
+MINT = (170, 240, 190)
+SKY = (180, 215, 255)
+PALEBLUE = (225, 238, 255)
 CREAM = (255, 255, 204)
 OFFWHITE = (242, 242, 252)
 BLACK = (0, 0, 0)
+GREY = (96, 96, 96)
 BLUE = (0, 0, 255)
 
 CUSTOM_EVENT_TYPE = 32869  # pygame.USEREVENT + 3
-CHECK_GAME_OVER_EVENT_TYPE = 32870
@@ -1,50 +1,129 @@
 # -*- coding: utf-8
-from copy import deepcopy
-from dataclasses import dataclass
-from typing import List
+from math import isqrt
+from typing import Iterator, List, Sequence, Union
+
+LINE_CHARS = b'.0123456789'
+# byte <-> character tables for the 81-character line format
+_FROM_LINE = bytes.maketrans(LINE_CHARS, bytes(1) + bytes(range(10)))
+_TO_LINE = bytes.maketrans(bytes(range(10)), LINE_CHARS[:1] + LINE_CHARS[2:])
 
 
-@dataclass
 class Data():
-    _data = [[0]*9 for _ in range(9)]
+    """Square grid of digits stored as one byte per cell.
 
-    def __init__(self, **kwargs):
-        if 'data' in kwargs:
-            # TODO type, size and range check
-            self._data = deepcopy(kwargs.get('data'))
+    Values live in a flat bytearray in row-major order, 81 bytes for
+    a 9x9 grid, and are accessed with data[row, col] or data[index].
+    flatten() returns a cached read-only memoryview of the bytes, no
+    copy is made.
+    """
+    __slots__ = ('_data', '_side', '_view')
 
-    def __getter__(self) -> List[int]:
-        return self._data
+    def __init__(self, **kwargs):
+        data = kwargs.get('data', None)
+        if data is None:
+            self._data = bytearray(81)
+        elif len(data) and isinstance(data[0], (list, tuple)):
+            self._data = bytearray(value for row in data for value in row)
+        else:
+            self._data = bytearray(data)
+        self._side = isqrt(len(self._data))
+        if self._side * self._side != len(self._data):
+            raise ValueError(f'grid of {len(self._data)} cells is not square')
+        self._view = None
 
-    def __getitem__(self, indecies) -> int:
+    def __getitem__(self, indecies: Union[int, tuple]) -> int:
         if isinstance(indecies, tuple):
-            col, row = indecies
-            if 3 < col < 0 or 3 < row < 0:
+            row, col = indecies
+            if not (0 <= row < self._side and 0 <= col < self._side):
                 raise IndexError
-            return self._data[col][row]
+            return self._data[row * self._side + col]
+        return self._data[indecies]
 
-    def __setitem__(self, indecies, new_value: int):
+    def __setitem__(self, indecies: Union[int, tuple], new_value: int):
         if isinstance(indecies, tuple):
-            col, row = indecies
-            if 3 < col < 0 or 3 < row < 0:
+            row, col = indecies
+            if not (0 <= row < self._side and 0 <= col < self._side):
                 raise IndexError
-            self._data[col][row] = new_value
+            self._data[row * self._side + col] = new_value
         else:
-            raise IndexError
+            self._data[indecies] = new_value
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._data)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Data):
+            return self._data == other._data
+        return NotImplemented
+
+    __hash__ = None
 
     def __repr__(self) -> str:
-        return str(deepcopy(self._data))
+        return f'{type(self).__name__}({self.to_line()!r})'
 
     def __str__(self):
-        max_num_length = len(str(max(self.flatten())))
+        max_num_length = len(str(max(self._data)))
         return '\n'.join(', '.join(
             f'{self[row, col]:{max_num_length}}'
-            for col in range(9))
-            for row in range(9)
+            for col in range(self._side))
+            for row in range(self._side)
         )
 
-    def copy(self) -> List[int]:
-        return deepcopy(self._data)
+    @property
+    def side(self) -> int:
+        return self._side
+
+    @classmethod
+    def from_line(cls, line: Union[str, bytes]) -> 'Data':
+        """Parse a puzzle in 81-character line format, empty cells are
+        given as '0' or '.'
+        """
+        raw = line.strip()
+        if isinstance(raw, str):
+            raw = raw.encode('ascii', 'replace')
+        if len(raw) != 81 or raw.translate(None, LINE_CHARS):
+            raise ValueError(f'invalid puzzle line {line.strip()!r}')
+        return cls(data=raw.translate(_FROM_LINE))
+
+    def to_line(self) -> str:
+        """Format as 81-character line with '.' for empty cells"""
+        return self._data.translate(_TO_LINE).decode('ascii')
+
+    @classmethod
+    def unpack(cls, packed: bytes) -> 'Data':
+        """Grid of the cells pack() stored two to a byte"""
+        values = bytearray(2 * len(packed))
+        values[0::2] = bytes(byte >> 4 for byte in packed)
+        values[1::2] = bytes(byte & 15 for byte in packed)
+        side = isqrt(len(values))
+        return cls(data=values[:side * side])
+
+    def pack(self) -> bytes:
+        """Cells two to a byte, the first in the high nibble, 41 bytes
+        for a 9x9 grid. ValueError for digits over 15.
+        """
+        values = self._data + bytes(len(self._data) % 2)
+        if values and max(values) > 15:
+            raise ValueError('digits over 15 do not pack')
+        return bytes(
+            values[i] << 4 | values[i + 1] for i in range(0, len(values), 2))
+
+    def copy(self) -> 'Data':
+        return type(self)(data=self._data)
+
+    __copy__ = copy
+
+    def flatten(self) -> Sequence[int]:
+        if self._view is None:
+            self._view = memoryview(self._data).toreadonly()
+        return self._view
 
-    def flatten(self) -> List[int]:
-        return [value for row in self._data for value in row]
+    def rows(self) -> List[List[int]]:
+        side = self._side
+        return [
+            list(self._data[r:r + side])
+            for r in range(0, side * side, side)
+        ]
@@ -1,52 +1,67 @@
 # -*- coding: utf-8
 import asyncio
-import os
+import sys
+import time
 from os.path import abspath, dirname, join
-from typing import List
+from typing import Callable, List, Optional
 
 import pygame
 import pygame_gui
 
+from . import assets, glyphs, instrument
+from .bank import PuzzleBank, tier_for
 from .board import Board
-from .constants import (CHECK_GAME_OVER_EVENT_TYPE, CUSTOM_EVENT_TYPE, FPS,
-                        HEIGHT, WIDTH)
+from .constants import (AUTOSAVE_SECONDS, BLACK, BROWSER_IDLE_SLEEP,
+                        CUSTOM_EVENT_TYPE, FPS, HEIGHT, IDLE_TIMEOUT, OFFWHITE,
+                        WIDTH)
 from .data import Data
+from .decorators import timer
+from .history import MARKS, VALUE, History, Move
 from .hud import Hud
-from .logic import Logic
+from .logic import TIER_DIFFICULTY, Logic
+from .save import SaveState, SaveStore
+from .units import UNITS
 
 BASE_PATH = abspath(dirname(__file__))
-IMAGE_PATH = BASE_PATH + '/../img'
-IMG_NAMES = ['start', 'gameover', 'reset', 'pause']
-IMAGES = {
-    name: pygame.image.load(join(IMAGE_PATH, f'{name}.png'))
-    for name in IMG_NAMES
-}
+THEME_PATH = join(BASE_PATH, 'theme.json')
 
 difficulty = 50
+# pygame.event.wait would block the browser's event loop
+BROWSER = sys.platform in ('emscripten', 'wasi')
+EXPOSE_EVENT_TYPES = (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED)
+# phases of a playing frame timed by instrument.Frame, total included
+FRAME_PHASES = ('events', 'board', 'hud', 'overlay', 'update', 'total')
+OVERLAY_FONT_SIZE = 14
+OVERLAY_TEMPLATE = 'overlay p50 00.0 p90 00.0 p99 00.0 max 000.0 ms'
 
 class Game:
     """Game manager"""
 
     def __init__(self) -> None:
-        global IMAGES
         global difficulty
-        self.start_img = IMAGES.get('start').convert()
-        self.gameover_img = IMAGES.get('gameover').convert_alpha()
 
         pygame.init()
         pygame.font.init()
         pygame.display.set_caption('Sudoku')
         # pygame.event.set_blocked(pygame.MOUSEMOTION)
 
-        self.game_screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        # keep the window main.py opened with the start screen on it
+        self.game_screen = pygame.display.get_surface() \
+            or pygame.display.set_mode((WIDTH, HEIGHT))
+        self.start_img = assets.get_image('start', alpha=False)
         self.game_pause_screen = pygame.surface.Surface((WIDTH, HEIGHT))
         self.gameover_screen = pygame.surface.Surface((WIDTH, HEIGHT))
         self.game_screen_rect = self.game_screen.get_rect()
 
-        self.ui_manager = pygame_gui.UIManager(
-            self.game_screen_rect.size,
-            os.path.join(os.path.abspath('.'), 'sudoku/theme.json')
-        )
+        # the ui and its theme load with the first game
+        self.ui_manager = None
+
+        self.bank = PuzzleBank()
+        self.bank.start_refill()
+        self.store = SaveStore()
+        # game to resume when play starts
+        self.saved = self.store.load()
+        self.saved_at = 0
 
         self.clock = pygame.time.Clock()
         self.difficulty = difficulty
@@ -55,16 +70,41 @@ class Game:
         self.logic = None
         self.elapsed_seconds = 0
         self.state = 'start'
+        self.drawn_state = None
+        self.frame = instrument.Frame()
+        self.overlay_on = False
 
-    def reset(self) -> None:
+    @timer
+    def reset(self, saved: Optional[SaveState] = None) -> None:
+        """Start a new game, or resume saved"""
         self.selected_id = None
         self.hint_on = False
+        self.conflicts_on = False
+        self.pencil_on = False
+        self.history = History()
 
         # logic
         self.logic = Logic()
-        solution, puzzle = self.logic.create_game(self.difficulty)
-        self.puzzle = Data(data=puzzle)
-        self.solution = Data(data=solution)
+        try:
+            record = None if saved else self.bank.draw(self.difficulty)
+        except (OSError, ValueError):
+            record = None
+        if saved is not None:
+            self.puzzle = saved.puzzle
+            self.solution = saved.solution
+            self.difficulty = saved.difficulty
+        elif record is not None:
+            self.puzzle = record.puzzle
+            self.solution = record.solution
+        else:
+            # the tier the bank would have given, so the slider means
+            # the same whether the bank is stocked or not
+            tier = tier_for(self.difficulty)
+            solution, puzzle = self.logic.create_game(
+                TIER_DIFFICULTY[tier], tier=tier) \
+                or self.logic.create_game(TIER_DIFFICULTY[tier])
+            self.puzzle = Data(data=puzzle)
+            self.solution = Data(data=solution)
 
         # board
         self.board_rect = pygame.Rect(
@@ -79,6 +119,8 @@ class Game:
             self.game_screen.get_width() - 8, 600 - 50 - self.board_rect.h)
         # only one instance of hud to be kept between resets
         if self.hud is None:
+            self.ui_manager = pygame_gui.UIManager(
+                self.game_screen_rect.size, THEME_PATH)
             self.hud = Hud(
                 self.game_screen,
                 bottom_rect=self.bottom_rect,
@@ -87,6 +129,34 @@ class Game:
                 start_surf=self.start_img)
 
         self.elapsed_seconds = 0
+        if saved is not None:
+            self.restore(saved)
+        self.save_game()
+
+    def restore(self, saved: SaveState) -> None:
+        """Put the entries, notes, clock and history of saved back"""
+        for index, value in enumerate(saved.entries):
+            if value and not self.puzzle[index]:
+                self.board.handle_number_entered(
+                    index, value, value == self.solution[index],
+                    eliminate=False)
+            self.board.cells[index].marks = saved.marks[index]
+        self.elapsed_seconds = saved.elapsed_seconds
+        try:
+            self.history = History.from_bytes(saved.history)
+        except ValueError:
+            self.history = History()
+        self.hud.slider.set_current_value(self.difficulty)
+
+    @timer
+    def save_game(self) -> None:
+        """Save the game in the background"""
+        self.saved_at = self.elapsed_seconds
+        self.store.save(SaveState(
+            self.puzzle, self.solution, Data(data=self.board.get_values()),
+            [cell.marks for cell in self.board.cells],
+            int(self.elapsed_seconds), self.difficulty,
+            self.history.to_bytes()))
 
     def draw(self) -> None:
         if self.state == 'start':
@@ -94,44 +164,149 @@ class Game:
         self.draw_board_and_hud()
 
     def get_solution_at_index(self, idx) -> int:
-        col = idx % 9
-        row = (idx // 9) % 9
-        return self.solution[row, col]
+        return self.solution[UNITS.rows[idx], UNITS.cols[idx]]
+
+    def enter_number(self, value: int, mark: bool = False) -> None:
+        """Put value in the selected cell, the game is over once every
+        cell holds its solution digit. In pencil mode or with mark the
+        value is toggled in the cell's pencil marks instead.
+        """
+        index = self.selected_id
+        if index is None or index < 0:
+            return
+        if mark or self.pencil_on:
+            self.play(index, lambda: self.board.toggle_mark(index, value))
+            return
+        self.board.clear_hint()
+        expeceted_value = self.get_solution_at_index(index)
+        self.play(index, lambda: self.board.handle_number_entered(
+            index, value, value == expeceted_value))
+        self.check_game_over()
+
+    def delete_number(self) -> None:
+        index = self.selected_id
+        if index is None or index < 0:
+            return
+        self.board.clear_hint()
+        self.play(index, lambda: self.board.handle_deleted(index))
+
+    def play(self, index: Optional[int], change: Callable[[], None]) \
+            -> None:
+        """Run change and log what it did to the cell at index and its
+        peers, or to every cell when index is None, as one move in the
+        history
+        """
+        cells = self.board.cells
+        affected = range(len(cells)) if index is None \
+            else (index,) + UNITS.peers[index]
+        before = [(cells[pos].value, cells[pos].marks) for pos in affected]
+        change()
+        linked = False
+        for pos, (value, marks) in zip(affected, before):
+            if cells[pos].value != value:
+                self.history.record(
+                    Move(VALUE, pos, value, cells[pos].value), linked)
+                linked = True
+            if cells[pos].marks != marks:
+                self.history.record(
+                    Move(MARKS, pos, marks, cells[pos].marks), linked)
+                linked = True
+        if linked:
+            self.save_game()
+
+    def undo(self) -> None:
+        self.replay(self.history.undo(), undo=True)
+
+    def redo(self) -> None:
+        self.replay(self.history.redo())
+        self.check_game_over()
+
+    def replay(self, moves: List[Move], undo: bool = False) -> None:
+        """Set cells to the new values of moves, to the old ones if undo"""
+        self.board.clear_hint()
+        for kind, index, old, new in moves:
+            value = old if undo else new
+            if kind == MARKS:
+                self.board.cells[index].marks = value
+            elif value:
+                self.board.handle_number_entered(
+                    index, value, value == self.get_solution_at_index(index),
+                    eliminate=False)
+            else:
+                self.board.handle_deleted(index)
+        if moves:
+            self.save_game()
+
+    def check_game_over(self) -> None:
+        if self.board.is_solved():
+            # show the last digit in the grayscale screenshot
+            self.draw_board_and_hud()
+            pygame.transform.grayscale(
+                self.game_screen, self.gameover_screen)
+            self.gameover_screen.blit(assets.get_image('gameover'), (0, 0))
+            self.state = 'gameover'
+            self.store.save(None)
+
+    def show_next_move(self) -> None:
+        """Highlight the easiest logical move, named in the caption"""
+        step = self.board.hint()
+        technique = step.technique.replace('_', ' ') if step else 'no move'
+        pygame.display.set_caption(f'Sudoku - {technique}')
+
+    def toggle_pause(self) -> None:
+        if self.state == 'playing':
+            # take grayscale screenshot
+            pygame.transform.grayscale(
+                self.game_screen, self.game_pause_screen)
+            self.state = 'pause'
+            self.save_game()
+        elif self.state == 'pause':
+            self.game_screen.blit(self.start_img, self.game_screen_rect)
+            self.state = 'playing'
 
     def handle_keydown(self, event: pygame.event.Event) -> None:
         if event.type == pygame.KEYDOWN:
+            # events posted by the hud carry no modifiers
+            mod = getattr(event, 'mod', 0)
             if event.key == pygame.K_SPACE:
-                if self.state == 'playing':
-                    # take grayscale screenshot
-                    pygame.transform.grayscale(
-                        self.game_screen, self.game_pause_screen)
-                    self.state = 'pause'
-                    pygame.time.set_timer(CHECK_GAME_OVER_EVENT_TYPE, 0)
-                elif self.state == 'pause':
-                    self.game_screen.blit(
-                        self.start_img, self.game_screen_rect)
-                    self.state = 'playing'
-                    pygame.time.set_timer(CHECK_GAME_OVER_EVENT_TYPE, 1000)
+                self.toggle_pause()
+            elif mod & pygame.KMOD_CTRL:
+                self.handle_ctrl_keydown(event)
+            elif event.key >= pygame.K_0 and event.key <= pygame.K_9:
+                self.enter_number(event.key - 48, mod & pygame.KMOD_SHIFT)
+            elif event.key == pygame.K_DELETE \
+                    or event.key == pygame.K_BACKSPACE \
+                    or event.key == pygame.K_x:
+                self.delete_number()
             else:
-                if event.key >= pygame.K_0 and event.key <= pygame.K_9:
-                    value = event.key - 48
-                    expeceted_value = self.get_solution_at_index(
-                        self.selected_id)
-                    self.board.handle_number_entered(
-                        self.selected_id, value, value == expeceted_value)
-                elif event.key == pygame.K_h:
-                    self.hint_on = not self.hint_on
-                    self.board.set_hints(self.hint_on)
-                    self.hud.draw(self.elapsed_seconds, self.hint_on)
-                elif event.key == pygame.K_DELETE \
-                        or event.key == pygame.K_BACKSPACE \
-                        or event.key == pygame.K_x:
-                    self.board.handle_deleted(self.selected_id)
-                elif event.key == pygame.K_r:
-                    self.reset()
-                elif event.key == pygame.K_f:
-                    pygame.time.set_timer(CHECK_GAME_OVER_EVENT_TYPE, 0)
-                    self.state = 'start'
+                self.handle_command_keydown(event)
+
+    def handle_command_keydown(self, event: pygame.event.Event) -> None:
+        if event.key == pygame.K_h:
+            self.hint_on = not self.hint_on
+            self.board.set_hints(self.hint_on)
+        elif event.key == pygame.K_n:
+            self.show_next_move()
+        elif event.key == pygame.K_p:
+            self.pencil_on = not self.pencil_on
+        elif event.key == pygame.K_a:
+            self.play(None, self.board.fill_marks)
+        elif event.key == pygame.K_c:
+            self.conflicts_on = not self.conflicts_on
+            self.board.set_conflicts(self.conflicts_on)
+        elif event.key == pygame.K_r:
+            self.reset()
+        elif event.key == pygame.K_f:
+            self.state = 'start'
+        elif event.key == pygame.K_F3 and instrument.ENABLED:
+            self.toggle_overlay()
+
+    def handle_ctrl_keydown(self, event: pygame.event.Event) -> None:
+        if event.key == pygame.K_z and event.mod & pygame.KMOD_SHIFT \
+                or event.key == pygame.K_y:
+            self.redo()
+        elif event.key == pygame.K_z:
+            self.undo()
 
     def handle_hud_custom_event(self, event: pygame.event.Event) -> None:
         if event.cid.isnumeric():
@@ -160,6 +335,18 @@ class Game:
                 pygame.KEYDOWN,
                 key=pygame.K_r)
             pygame.event.post(event)
+        elif event.cid == 'undo':
+            event = pygame.event.Event(
+                pygame.KEYDOWN,
+                key=pygame.K_z,
+                mod=pygame.KMOD_CTRL)
+            pygame.event.post(event)
+        elif event.cid == 'redo':
+            event = pygame.event.Event(
+                pygame.KEYDOWN,
+                key=pygame.K_y,
+                mod=pygame.KMOD_CTRL)
+            pygame.event.post(event)
 
     def handle_custom_events(self, event: pygame.event.Event) -> None:
         if event.type == CUSTOM_EVENT_TYPE and hasattr(event, 'key'):
@@ -178,28 +365,10 @@ class Game:
                     self.board.cells[self.selected_id].selected = False
                 self.selected_id = cid
             if event.key == 'number_entered':
-                if self.selected_id > -1:
-                    value = event.value
-                    expeceted_value = self.get_solution_at_index(
-                        self.selected_id)
-                    self.board.handle_number_entered(
-                        self.selected_id, value, value == expeceted_value)
+                self.enter_number(event.value)
             if event.key == 'hud_button_clicked':
                 self.handle_hud_custom_event(event)
 
-        if event.type == CHECK_GAME_OVER_EVENT_TYPE:
-            if self.logic.is_game_over(
-                self.board.get_values(),
-                self.solution.flatten()
-            ):
-                # take grayscale screenshot
-                pygame.transform.grayscale(
-                    self.game_screen, self.gameover_screen)
-                self.gameover_screen.blit(
-                    self.gameover_img, (0, 0)
-                )
-                self.state = 'gameover'
-
     def handle_quit_events(self, event: pygame.event.Event) -> None:
         if event.type == pygame.QUIT:
             self.running = False
@@ -232,18 +401,21 @@ class Game:
         if event.type == pygame_gui.UI_HORIZONTAL_SLIDER_MOVED:
             self.difficulty = int(event.value)
 
+    def in_progress(self) -> bool:
+        """True while there is a game on the board left to finish"""
+        return self.board is not None and not self.board.is_solved()
+
     def handle_start_state_events(self, event: pygame.event.Event) -> None:
         if event.type == pygame.MOUSEBUTTONDOWN:
-            self.reset()
-            pygame.time.set_timer(CHECK_GAME_OVER_EVENT_TYPE, 1000)
+            # the game is only built, and saved, once play starts
+            if self.saved is not None or not self.in_progress():
+                self.reset(self.saved)
+            self.saved = None
             self.state = 'playing'
-            self.elapsed_seconds = 0
 
     def process_gameover(self, event: pygame.event.Event) -> None:
         if event.type == pygame.MOUSEBUTTONDOWN:
-            self.reset()
             self.state = 'start'
-            pygame.time.set_timer(CHECK_GAME_OVER_EVENT_TYPE, 1000)
 
     def process_reset(self) -> None:
         self.reset()
@@ -273,37 +445,139 @@ class Game:
             self.handle_start_state_events(event)
             self.handle_quit_events(event)
 
-    def draw_board_and_hud(self) -> None:
-        self.board.draw()
-        self.hud.draw(self.elapsed_seconds, self.hint_on)
-        self.ui_manager.draw_ui(self.game_screen)
-
-    async def run(self) -> None:
-        """Game loop"""
-        self.running = True
-        while self.running:
-            time_delta = self.clock.tick(FPS)/1000.0
-            events = pygame.event.get()
-            if self.state == 'playing':
-                self.elapsed_seconds += time_delta
-                self.ui_manager.update(time_delta)
-                self.draw_board_and_hud()
-                self.process_playing_state_events(events)
-            elif self.state == 'start':
+    def draw_board_and_hud(self) -> List[pygame.Rect]:
+        """Draw what changed, returns the screen rects to update"""
+        rects = self.board.draw()
+        self.frame.lap('board')
+        rects += self.hud.draw(self.elapsed_seconds, self.hint_on)
+        self.frame.lap('hud')
+        return rects
+
+    def toggle_overlay(self) -> None:
+        self.overlay_on = not self.overlay_on
+        if not self.overlay_on:
+            self.board.invalidate()
+            self.hud.invalidate()
+
+    def draw_overlay(self) -> pygame.Rect:
+        """Frame time percentiles over the bottom of the board, returns
+        the screen rect updated
+        """
+        font = glyphs.get_font(OVERLAY_FONT_SIZE)
+        # sized for every phase so no stale text is left around it
+        surf = pygame.Surface((
+            font.size(OVERLAY_TEMPLATE)[0] + 8,
+            font.get_linesize() * len(FRAME_PHASES) + 8)).convert()
+        surf.fill(OFFWHITE)
+        for row, line in enumerate(instrument.Frame.report()):
+            surf.blit(
+                font.render(line, True, BLACK, OFFWHITE),
+                (4, 4 + row * font.get_linesize()))
+        rect = self.game_screen.blit(surf, surf.get_rect(
+            bottomleft=self.board_rect.move(4, -4).bottomleft))
+        self.frame.lap('overlay')
+        return rect
+
+    async def wait_events(self) -> List[pygame.event.Event]:
+        """Events since the last frame. While there are none and nothing
+        changed wait for input or until the clock shows the next second.
+        """
+        events = pygame.event.get()
+        if events or self.state != self.drawn_state:
+            return events
+        timeout = IDLE_TIMEOUT
+        if self.state == 'playing':
+            timeout = min(
+                timeout, int((1 - self.elapsed_seconds % 1) * 1000) + 1)
+        if BROWSER:
+            # no refill thread here, top the bank up while idle instead
+            start = time.perf_counter()
+            try:
+                self.bank.refill_step()
+            except (OSError, ValueError):
+                pass
+            spent = (time.perf_counter() - start) * 1000
+            await asyncio.sleep(
+                max(min(timeout, BROWSER_IDLE_SLEEP) - spent, 0) / 1000)
+            return pygame.event.get()
+        event = pygame.event.wait(timeout)
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event] + pygame.event.get()
+
+    def process_frame(self, events: List[pygame.event.Event],
+                      time_delta: float, state_changed: bool) \
+            -> List[pygame.Rect]:
+        """Handle events of the current state and draw what changed,
+        returns the screen rects to update
+        """
+        rects = []
+        if self.state == 'playing':
+            rects = self.process_playing_frame(
+                events, time_delta, state_changed)
+        elif self.state == 'start':
+            if state_changed:
                 self.game_screen.blit(self.start_img, self.game_screen_rect)
-                self.process_start_state_events(events)
-            elif self.state == 'gameover':
+            self.process_start_state_events(events)
+        elif self.state == 'gameover':
+            if state_changed:
                 self.game_screen.blit(
                     self.gameover_screen, self.game_screen_rect)
-                for event in events:
-                    self.process_gameover(event)
-                    self.handle_quit_events(event)
-            elif self.state == 'pause':
+            for event in events:
+                self.process_gameover(event)
+                self.handle_quit_events(event)
+        elif self.state == 'pause':
+            if state_changed:
                 self.game_screen.blit(
                     self.game_pause_screen, self.game_screen_rect)
-                self.process_pause_state_events(events)
+            self.process_pause_state_events(events)
+        return rects
+
+    def process_playing_frame(self, events: List[pygame.event.Event],
+                              time_delta: float, state_changed: bool) \
+            -> List[pygame.Rect]:
+        if state_changed:
+            self.board.invalidate()
+            self.hud.invalidate()
+        else:
+            # time spent in other states is not played
+            self.elapsed_seconds += time_delta
+            if self.elapsed_seconds - self.saved_at >= AUTOSAVE_SECONDS:
+                self.save_game()
+        self.process_playing_state_events(events)
+        self.frame.lap('events')
+        if self.state != 'playing':
+            return []
+        self.ui_manager.update(time_delta)
+        rects = self.draw_board_and_hud()
+        if self.overlay_on:
+            rects.append(self.draw_overlay())
+        return rects
 
-            pygame.display.update()
+    async def run(self) -> None:
+        """Game loop, idle until input, the clock or the state changes"""
+        self.running = True
+        while self.running:
+            events = await self.wait_events()
+            time_delta = self.clock.tick(FPS)/1000.0
+            self.frame.start()
+            if any(event.type in EXPOSE_EVENT_TYPES for event in events):
+                self.drawn_state = None
+            # other states cover the board, repaint all after a change
+            state_changed = self.state != self.drawn_state
+            self.drawn_state = self.state
+            rects = self.process_frame(events, time_delta, state_changed)
+            if state_changed:
+                pygame.display.update()
+            elif rects:
+                pygame.display.update(rects)
+            self.frame.lap('update')
+            self.frame.end()
             await asyncio.sleep(0)
+        if self.in_progress():
+            self.save_game()
+        self.store.close()
+        self.bank.close()
+        self.frame.dump()
         pygame.quit()
         quit()
@@ -0,0 +1,86 @@
+# -*- coding: utf-8
+from os.path import abspath, dirname, join, normpath
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+import pygame
+
+BASE_PATH = abspath(dirname(__file__))
+FONT_PATH = normpath(join(BASE_PATH, '../fonts/FreeSans.otf'))
+
+Color = Union[str, Tuple[int, ...]]
+
+# fonts by (path, size) and pre-rendered text by (font, text, colors)
+_fonts: Dict[Tuple[str, int], pygame.font.Font] = {}
+_glyphs: Dict[tuple, pygame.Surface] = {}
+# pencil mark atlases by (font, size, base, colors)
+_marks: Dict[tuple, pygame.Surface] = {}
+
+
+def get_font(size: int, path: str = FONT_PATH) -> pygame.font.Font:
+    """Return a shared font, opening the file once per size"""
+    font = _fonts.get((path, size))
+    if font is None:
+        if not pygame.font.get_init():
+            pygame.font.init()  # pragma no cover
+        font = _fonts[path, size] = pygame.font.Font(path, size)
+    return font
+
+
+def get_glyph(font: pygame.font.Font, text: Union[int, str], color: Color,
+              background: Optional[Color] = None) -> pygame.Surface:
+    """Return text rendered antialiased with font, cached per colors"""
+    key = (font, text, color, background)
+    surf = _glyphs.get(key)
+    if surf is None:
+        surf = font.render(str(text), True, color, background)
+        if pygame.display.get_surface() is not None:
+            surf = surf.convert() if background else surf.convert_alpha()
+        _glyphs[key] = surf
+    return surf
+
+
+def mark_rect(digit: int, size: int, base: int = 3) -> pygame.Rect:
+    """Area of digit in a pencil mark atlas of size, see get_marks"""
+    step = size // base
+    return pygame.Rect(
+        (digit - 1) % base * step, (digit - 1) // base * step, step, step)
+
+
+def get_marks(font: pygame.font.Font, size: int, color: Color,
+              background: Optional[Color] = None,
+              base: int = 3) -> pygame.Surface:
+    """Return a size x size atlas of the digits 1 to base * base laid
+    out base x base. A pencil mark is the blit of mark_rect(digit) from
+    the atlas to the same spot of a cell.
+    """
+    key = (font, size, base, color, background)
+    surf = _marks.get(key)
+    if surf is None:
+        if background is None:
+            surf = pygame.Surface((size, size), pygame.SRCALPHA)
+        else:
+            surf = pygame.Surface((size, size))
+            surf.fill(background)
+        for digit in range(1, base * base + 1):
+            glyph = get_glyph(font, digit, color, background)
+            surf.blit(glyph, glyph.get_rect(
+                center=mark_rect(digit, size, base).center))
+        if pygame.display.get_surface() is not None:
+            surf = surf.convert() if background else surf.convert_alpha()
+        _marks[key] = surf
+    return surf
+
+
+def evict(sizes: Optional[Iterable[int]] = None) -> None:
+    """Drop the fonts of sizes with their glyphs and pencil mark atlases,
+    everything when sizes is None. A dropped font still works for whoever
+    kept it, but its glyphs are then cached out of reach of evict(), so
+    only pass sizes nobody else holds.
+    """
+    sizes = None if sizes is None else set(sizes)
+    stale_keys = [
+        key for key in _fonts if sizes is None or key[1] in sizes]
+    stale = {_fonts.pop(key) for key in stale_keys}
+    for cache in (_glyphs, _marks):
+        for key in [key for key in cache if key[0] in stale]:
+            del cache[key]
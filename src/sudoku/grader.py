@@ -0,0 +1,371 @@
+# -*- coding: utf-8
+from bisect import bisect_right
+from itertools import combinations
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from .units import get_units
+
+TIERS = ('easy', 'medium', 'hard', 'expert', 'evil')
+
+# technique name: (weight per use, lowest tier index a puzzle needing
+# it grades at), in order of cost
+TECHNIQUES = {
+    'naked_single': (1, 0),
+    'hidden_single': (2, 0),
+    'naked_pair': (10, 1),
+    'hidden_pair': (15, 1),
+    'pointing': (20, 1),
+    'box_line_reduction': (25, 2),
+    'naked_triple': (30, 2),
+    'x_wing': (50, 3),
+    'guess': (100, 4),
+}
+# lowest score of medium, hard and expert puzzles. Few puzzles need more
+# than singles, so the tiers between easy and evil mostly come from the
+# score, a point or two per blank cell and more for harder techniques
+TIER_SCORES = (48, 72, 100)
+
+
+class Step(NamedTuple):
+    """A single logical deduction.
+
+    placements: (cell, digit) pairs to fill in.
+    eliminations: (cell, mask) pairs of candidates to remove.
+    cells: the cells the deduction is based on, e.g. the naked pair.
+    units: the rows, columns and boxes it was found in; rows are
+        0..8, columns 9..17 and boxes 18..26.
+    """
+    technique: str
+    placements: Tuple[Tuple[int, int], ...]
+    eliminations: Tuple[Tuple[int, int], ...]
+    cells: Tuple[int, ...]
+    units: Tuple[int, ...]
+
+
+class Grade(NamedTuple):
+    score: int
+    tier: str
+    techniques: Dict[str, int]
+    solved: bool
+
+
+def _bits(mask: int):
+    while mask:
+        bit = mask & -mask
+        yield bit
+        mask ^= bit
+
+
+class _State:
+    __slots__ = ('tables', 'values', 'cands')
+
+    def __init__(self, grid: Sequence) -> None:
+        if len(grid) and isinstance(grid[0], (list, tuple)):
+            grid = [value for row in grid for value in row]
+        self.values = list(grid)
+        self.tables = get_units(int(len(self.values) ** 0.5))
+        tables = self.tables
+        used = [0] * (3 * tables.side)
+        for pos, value in enumerate(self.values):
+            if value:
+                for unit in tables.cell_units[pos]:
+                    if used[unit] & 1 << (value - 1):
+                        raise ValueError(f'digit {value} repeats in unit')
+                    used[unit] |= 1 << (value - 1)
+        self.cands = [
+            0 if value else tables.full & ~(used[u0] | used[u1] | used[u2])
+            for value, (u0, u1, u2) in zip(self.values, tables.cell_units)
+        ]
+
+    def apply(self, step: Step) -> None:
+        cands = self.cands
+        for pos, digit in step.placements:
+            if self.values[pos]:
+                continue
+            bit = 1 << (digit - 1)
+            if not cands[pos] & bit:
+                raise ValueError('puzzle has no solution')
+            self.values[pos] = digit
+            cands[pos] = 0
+            for peer in self.tables.peers[pos]:
+                cands[peer] &= ~bit
+        for pos, mask in step.eliminations:
+            cands[pos] &= ~mask
+
+    def check(self) -> None:
+        for value, mask in zip(self.values, self.cands):
+            if not value and not mask:
+                raise ValueError('puzzle has no solution')
+
+
+def _naked_singles(state: _State) -> List[Step]:
+    cell_units = state.tables.cell_units
+    return [
+        Step('naked_single', ((pos, mask.bit_length()),), (), (pos,),
+             cell_units[pos])
+        for pos, mask in enumerate(state.cands)
+        if mask and not mask & (mask - 1)
+    ]
+
+
+def _hidden_singles(state: _State) -> List[Step]:
+    cands = state.cands
+    steps = []
+    for unit, cells in enumerate(state.tables.units):
+        once = twice = 0
+        for pos in cells:
+            twice |= once & cands[pos]
+            once |= cands[pos]
+        for bit in _bits(once & ~twice):
+            pos = next(pos for pos in cells if cands[pos] & bit)
+            steps.append(Step(
+                'hidden_single', ((pos, bit.bit_length()),), (), (pos,),
+                (unit,)))
+    return steps
+
+
+def _eliminate(cands: List[int], cells: Sequence[int], mask: int,
+               keep: Sequence[int] = ()) -> Tuple[Tuple[int, int], ...]:
+    return tuple(
+        (pos, cands[pos] & mask) for pos in cells
+        if cands[pos] & mask and pos not in keep
+    )
+
+
+def _naked_pairs(state: _State) -> List[Step]:
+    cands = state.cands
+    steps = []
+    for unit, cells in enumerate(state.tables.units):
+        seen = {}
+        for pos in cells:
+            mask = cands[pos]
+            if bin(mask).count('1') != 2:
+                continue
+            if mask in seen:
+                pair = (seen[mask], pos)
+                elims = _eliminate(cands, cells, mask, pair)
+                if elims:
+                    steps.append(Step('naked_pair', (), elims, pair, (unit,)))
+            seen[mask] = pos
+    return steps
+
+
+def _where(cands: List[int], cells: Sequence[int], side: int) \
+        -> List[Tuple[int, ...]]:
+    """Cells of a unit holding each digit as a candidate"""
+    return [
+        tuple(pos for pos in cells if cands[pos] & (1 << digit))
+        for digit in range(side)
+    ]
+
+
+def _hidden_pairs(state: _State) -> List[Step]:
+    cands = state.cands
+    side = state.tables.side
+    steps = []
+    for unit, cells in enumerate(state.tables.units):
+        where = _where(cands, cells, side)
+        twos = [digit for digit in range(side) if len(where[digit]) == 2]
+        for first, second in combinations(twos, 2):
+            if where[first] != where[second]:
+                continue
+            keep = (1 << first) | (1 << second)
+            elims = tuple(
+                (pos, cands[pos] & ~keep) for pos in where[first]
+                if cands[pos] & ~keep
+            )
+            if elims:
+                steps.append(Step(
+                    'hidden_pair', (), elims, where[first], (unit,)))
+    return steps
+
+
+def _intersections(state: _State, technique: str, from_units: range) \
+        -> List[Step]:
+    """Pointing (box to line) and box/line reduction (line to box)"""
+    tables = state.tables
+    cands = state.cands
+    steps = []
+    for unit in from_units:
+        cells = tables.units[unit]
+        for digit, where in enumerate(_where(cands, cells, tables.side)):
+            if len(where) < 2:
+                continue
+            for kind in range(3):
+                target = tables.cell_units[where[0]][kind]
+                if target == unit or any(
+                        tables.cell_units[pos][kind] != target
+                        for pos in where):
+                    continue
+                elims = _eliminate(
+                    cands, tables.units[target], 1 << digit, cells)
+                if elims:
+                    steps.append(Step(
+                        technique, (), elims, where, (unit, target)))
+    return steps
+
+
+def _pointing(state: _State) -> List[Step]:
+    side = state.tables.side
+    return _intersections(state, 'pointing', range(2 * side, 3 * side))
+
+
+def _box_line_reduction(state: _State) -> List[Step]:
+    side = state.tables.side
+    return _intersections(state, 'box_line_reduction', range(2 * side))
+
+
+def _naked_triples(state: _State) -> List[Step]:
+    cands = state.cands
+    steps = []
+    for unit, cells in enumerate(state.tables.units):
+        small = [
+            pos for pos in cells
+            if cands[pos] and bin(cands[pos]).count('1') <= 3
+        ]
+        for triple in combinations(small, 3):
+            mask = cands[triple[0]] | cands[triple[1]] | cands[triple[2]]
+            if bin(mask).count('1') != 3:
+                continue
+            elims = _eliminate(cands, cells, mask, triple)
+            if elims:
+                steps.append(Step('naked_triple', (), elims, triple, (unit,)))
+    return steps
+
+
+def _x_wings(state: _State) -> List[Step]:
+    tables = state.tables
+    cands = state.cands
+    side = tables.side
+    steps = []
+    for digit in range(side):
+        bit = 1 << digit
+        # rows as base with columns as cover and vice versa
+        for base, cover in ((0, 1), (1, 0)):
+            lines = {}
+            for line in range(base * side, (base + 1) * side):
+                where = tuple(
+                    pos for pos in tables.units[line] if cands[pos] & bit)
+                if len(where) != 2:
+                    continue
+                covers = tuple(tables.cell_units[pos][cover] for pos in where)
+                if covers in lines:
+                    corners = lines[covers] + where
+                    elims = tuple(
+                        item for unit in covers
+                        for item in _eliminate(
+                            cands, tables.units[unit], bit, corners)
+                    )
+                    if elims:
+                        steps.append(Step(
+                            'x_wing', (), elims, corners, covers))
+                lines[covers] = where
+    return steps
+
+
+STEPS: Tuple[Tuple[str, Callable[[_State], List[Step]]], ...] = (
+    ('naked_single', _naked_singles),
+    ('hidden_single', _hidden_singles),
+    ('naked_pair', _naked_pairs),
+    ('hidden_pair', _hidden_pairs),
+    ('pointing', _pointing),
+    ('box_line_reduction', _box_line_reduction),
+    ('naked_triple', _naked_triples),
+    ('x_wing', _x_wings),
+)
+
+
+def _unlock(state: _State, steps: List[Step]) -> List[Step]:
+    """Apply eliminations until a single turns up, returns those used"""
+    used = []
+    for step in steps:
+        state.apply(step)
+        used.append(step)
+        if _naked_singles(state) or _hidden_singles(state):
+            break
+    state.check()
+    return used
+
+
+def next_step(grid: Sequence) -> Optional[Step]:
+    """The easiest deduction that places a digit in grid.
+
+    While no single is left the eliminations of the cheapest technique
+    that makes progress are applied until one turns up. The single is
+    then returned under the hardest technique used, with the cells and
+    units of those eliminations added to its own. None when the
+    techniques get stuck or grid has no solution.
+    """
+    try:
+        state = _State(grid)
+        state.check()
+    except ValueError:
+        return None
+    support = []
+    while 0 in state.values:
+        for _, find in STEPS:
+            steps = find(state)
+            if steps:
+                break
+        else:
+            return None
+        if steps[0].placements:
+            break
+        try:
+            support += _unlock(state, steps)
+        except ValueError:
+            return None
+    else:
+        return None
+
+    step = steps[0]
+    hardest = max(
+        support + [step], key=lambda used: TECHNIQUES[used.technique][0])
+    cells = dict.fromkeys(
+        pos for used in support + [step] for pos in used.cells)
+    units = dict.fromkeys(
+        unit for used in support + [step] for unit in used.units)
+    return Step(
+        hardest.technique, step.placements, (), tuple(cells), tuple(units))
+
+
+class Grader:
+    """Grades puzzles by the human solving techniques they need.
+
+    Techniques are tried in order of cost and the cheapest one that
+    makes progress is applied everywhere it fits before starting over
+    from the cheapest again. A puzzle the techniques cannot finish
+    needs guessing and is graded 'evil'.
+
+    The score adds up the weight of every technique use. The tier is
+    the one the score reaches in TIER_SCORES, raised to the lowest tier
+    of the hardest technique needed.
+    """
+
+    def grade(self, grid: Sequence) -> Grade:
+        """Grade a puzzle given as list of rows or flat sequence"""
+        state = _State(grid)
+        state.check()
+        techniques = {}
+        solved = True
+        while 0 in state.values:
+            for _, find in STEPS:
+                steps = find(state)
+                if steps:
+                    break
+            else:
+                techniques['guess'] = 1
+                solved = False
+                break
+            for step in steps:
+                state.apply(step)
+            state.check()
+            name = steps[0].technique
+            techniques[name] = techniques.get(name, 0) + len(steps)
+
+        score = sum(TECHNIQUES[name][0] * uses
+                    for name, uses in techniques.items())
+        tier = max(
+            bisect_right(TIER_SCORES, score),
+            max((TECHNIQUES[name][1] for name in techniques), default=0))
+        return Grade(score, TIERS[tier], techniques, solved)
@@ -0,0 +1,114 @@
+# -*- coding: utf-8
+import sys
+from array import array
+from typing import Iterator, List, NamedTuple
+
+VALUE = 0  # the digit of a cell changed
+MARKS = 1  # the pencil marks of a cell changed
+
+# a move packed into an unsigned 32-bit int: linked, kind, cell, old, new
+_LINKED = 1 << 26
+_KIND_SHIFT = 25
+_INDEX_SHIFT = 18
+_OLD_SHIFT = 9
+_FIELD = (1 << 9) - 1
+
+
+class Move(NamedTuple):
+    kind: int
+    index: int
+    old: int
+    new: int
+
+
+def _pack(move: Move, linked: bool) -> int:
+    kind, index, old, new = move
+    if not 0 <= index < 1 << 7 or not 0 <= old <= _FIELD \
+            or not 0 <= new <= _FIELD:
+        raise ValueError(f'{move} does not fit the move log')
+    return (linked * _LINKED | kind << _KIND_SHIFT | index << _INDEX_SHIFT
+            | old << _OLD_SHIFT | new)
+
+
+def _unpack(packed: int) -> Move:
+    return Move(
+        packed >> _KIND_SHIFT & 1, packed >> _INDEX_SHIFT & 127,
+        packed >> _OLD_SHIFT & _FIELD, packed & _FIELD)
+
+
+class History:
+    """Undo and redo log of the moves of a game.
+
+    Every move is packed into 4 bytes of an array, moves after the
+    cursor are the ones undone and available for redo. A move can be
+    linked to the one before it so both are undone together, e.g. a
+    digit placed and the pencil marks it removed from its peers.
+    """
+    __slots__ = ('_moves', '_cursor')
+
+    def __init__(self) -> None:
+        self._moves = array('I')
+        self._cursor = 0
+
+    def __len__(self) -> int:
+        return self._cursor
+
+    def __iter__(self) -> Iterator[Move]:
+        """Moves played so far, oldest first"""
+        return (_unpack(packed) for packed in self._moves[:self._cursor])
+
+    def record(self, move: Move, linked: bool = False) -> None:
+        """Log a move played, dropping the moves that could be redone"""
+        del self._moves[self._cursor:]
+        self._moves.append(_pack(move, linked and self._cursor > 0))
+        self._cursor += 1
+
+    def undo(self) -> List[Move]:
+        """Take back the last move with those linked to it, latest first"""
+        moves = []
+        while self._cursor:
+            self._cursor -= 1
+            packed = self._moves[self._cursor]
+            moves.append(_unpack(packed))
+            if not packed & _LINKED:
+                break
+        return moves
+
+    def redo(self) -> List[Move]:
+        """Play again the next undone move with those linked to it"""
+        moves = []
+        while self._cursor < len(self._moves):
+            moves.append(_unpack(self._moves[self._cursor]))
+            self._cursor += 1
+            if self._cursor == len(self._moves) \
+                    or not self._moves[self._cursor] & _LINKED:
+                break
+        return moves
+
+    def to_bytes(self) -> bytes:
+        """Serialise the log, little-endian moves then the cursor"""
+        moves = array('I', self._moves)
+        moves.append(self._cursor)
+        if sys.byteorder == 'big':
+            moves.byteswap()  # pragma: no cover
+        return moves.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes, side: int = 9) -> 'History':
+        """Log serialised by to_bytes, ValueError unless its moves fit
+        a side x side board
+        """
+        moves = array('I')
+        moves.frombytes(data)
+        if sys.byteorder == 'big':
+            moves.byteswap()  # pragma: no cover
+        if not moves or moves[-1] > len(moves) - 1:
+            raise ValueError('not a move log')
+        for kind, index, old, new in map(_unpack, moves[:-1]):
+            top = side if kind == VALUE else (1 << side) - 1
+            if index >= side * side or old > top or new > top:
+                raise ValueError('move does not fit the board')
+        history = cls()
+        history._cursor = moves.pop()
+        history._moves = moves
+        return history
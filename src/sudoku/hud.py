@@ -1,28 +1,26 @@
 # -*- coding: utf-8
-from os.path import abspath, dirname, join
-from typing import Any, Tuple
+from typing import Any, List, Tuple
 
 import pygame
 import pygame_gui
 from pygame_gui.core import ObjectID
 
+from . import assets, glyphs
 from .constants import CUSTOM_EVENT_TYPE, WHITE
 
-BASE_PATH = abspath(dirname(__file__))
-IMAGE_PATH = BASE_PATH + '/../img'
 
 class RoundButton(pygame.sprite.Sprite):
     def __init__(
         self,
         parent_surf: pygame.Surface,
         pos: pygame.Vector2,
-        filepath: str,
+        image: pygame.Surface,
         cid: str,
         *groups: pygame.sprite.Group
     ):
         super().__init__(*groups)
         self.cid = cid
-        self.image = pygame.image.load(filepath).convert_alpha()
+        self.image = image.copy()
         self.image_orig = self.image.copy()
         self.image_hover = self.image.copy()
         self.image_hover.fill(
@@ -36,6 +34,8 @@ class RoundButton(pygame.sprite.Sprite):
         self.rect = self.image.get_rect(topleft=pos)
         self.pos = pygame.Vector2(pos)
         self.selected = False
+        # image last blitted to the panel, None to force a redraw
+        self.drawn_image = None
 
     def handle_clicked(self, pos: Tuple[int]):
         x, y = pos
@@ -77,6 +77,11 @@ class Hud:
 
         self.ui_manager = kwargs['ui_manager']
         self.clock_font = pygame.font.SysFont('freesans', 40)
+        self.clock_str = None
+        self.clock_surf = None
+        self.clock_rect = None
+        # slider pixels last reported drawn, None to report them again
+        self.slider_pixels = None
 
         self.controls_btm = []
         self.controls_top = []
@@ -86,7 +91,7 @@ class Hud:
             button = RoundButton(
                 parent_surf=self.bottom_surf,
                 pos=(2 + i*41, 5),
-                filepath=join(IMAGE_PATH, f'{label}.png'),
+                image=assets.get_button(label),
                 cid=label
             )
             self.controls_btm.append(button)
@@ -95,7 +100,7 @@ class Hud:
             RoundButton(
                 parent_surf=self.bottom_surf,
                 pos=(2 + 9*41, 5),
-                filepath=join(IMAGE_PATH, 'delete.png'),
+                image=assets.get_button('delete'),
                 cid='delete'
             )
         )
@@ -104,7 +109,7 @@ class Hud:
             RoundButton(
                 parent_surf=self.bottom_surf,
                 pos=(34 + 10*41, 5),
-                filepath=join(IMAGE_PATH, 'hint.png'),
+                image=assets.get_button('hint'),
                 cid='hint'
             )
         )
@@ -113,7 +118,7 @@ class Hud:
             RoundButton(
                 parent_surf=self.top_surf,
                 pos=(self.top_rect.width - 42, 0),
-                filepath=join(IMAGE_PATH, 'reset.png'),
+                image=assets.get_button('reset'),
                 cid='reset'
             )
         )
@@ -122,15 +127,25 @@ class Hud:
             RoundButton(
                 parent_surf=self.top_surf,
                 pos=(4, 2),
-                filepath=join(IMAGE_PATH, 'pause.png'),
+                image=assets.get_button('pause'),
                 cid='pause'
             )
         )
 
+        # right of the clock, which at its size reaches x 203
+        for i, label in enumerate(['undo', 'redo']):
+            self.controls_top.append(
+                RoundButton(
+                    parent_surf=self.top_surf,
+                    pos=(208 + i*42, 0),
+                    image=assets.get_button(label),
+                    cid=label
+                )
+            )
+
         self.slider = pygame_gui.elements.UIHorizontalSlider(
             relative_rect=pygame.Rect(
-                (self.top_rect.width//2, 10),
-                (self.top_rect.width//2 - 45, 20)),
+                (296, 10), (self.top_rect.width - 341, 20)),
             start_value=50,
             value_range=(0, 100),
             click_increment=0.5,
@@ -165,34 +180,106 @@ class Hud:
         [button.handle_mousemotion((x_top_panel, y_top_panel))
             for button in self.controls_top]
 
-    def draw(self, elapsed_seconds, hint_on):
+    def draw(self, elapsed_seconds, hint_on) -> List[pygame.Rect]:
+        """Redraw what changed in both panels and the pygame_gui
+        elements, returns the screen rects updated
+        """
         if hint_on:
             self.controls_btm[10].select()
         else:
             self.controls_btm[10].unselect()
-        self.bottom_surf.fill(WHITE)
-        [self.bottom_surf.blit(button.image, button.pos)
-            for button in self.controls_btm]
-        self.top_surf.blit(self.surf_top_bg, self.surf_top_bg.get_rect())
-        [self.top_surf.blit(button.image, button.pos)
-            for button in self.controls_top]
-        self.parent_surf.blit(self.bottom_surf, self.bottom_rect)
-        self.parent_surf.blit(self.top_surf, self.top_rect)
-        self.draw_clock(elapsed_seconds)
 
-    def draw_clock(self, elapsed_seconds):
-        clock_str = self.get_clock_str(elapsed_seconds)
-        clock_surf = self.clock_font.render(clock_str, True, WHITE)
+        rects = []
+        if self._buttons_changed(self.controls_btm):
+            self.bottom_surf.fill(WHITE)
+            self._draw_buttons(self.bottom_surf, self.controls_btm)
+            rects.append(
+                self.parent_surf.blit(self.bottom_surf, self.bottom_rect))
+
+        if self._buttons_changed(self.controls_top):
+            self.top_surf.blit(self.surf_top_bg, (0, 0))
+            self._draw_buttons(self.top_surf, self.controls_top)
+            self.clock_rect = None
+            self.draw_clock(elapsed_seconds)
+            rects.append(self.parent_surf.blit(self.top_surf, self.top_rect))
+        elif self.get_clock_str(elapsed_seconds) != self.clock_str:
+            rects.append(self.draw_clock(elapsed_seconds))
+
+        # pygame_gui draws the slider every frame, clear under it first
+        # and report it only when that changed its pixels
+        slider_rect = self.slider.get_abs_rect()
+        self.parent_surf.blit(
+            self.top_surf, slider_rect,
+            slider_rect.move(-self.top_rect.left, -self.top_rect.top))
+        self.ui_manager.draw_ui(self.parent_surf)
+        pixels = pygame.image.tobytes(
+            self.parent_surf.subsurface(slider_rect), 'RGB')
+        if pixels != self.slider_pixels:
+            self.slider_pixels = pixels
+            rects.append(slider_rect)
+        return rects
+
+    def invalidate(self) -> None:
+        """Redraw both panels fully on the next draw"""
+        for button in self.controls_btm + self.controls_top:
+            button.drawn_image = None
+        self.slider_pixels = None
+
+    def draw_clock(self, elapsed_seconds) -> pygame.Rect:
+        """Draw the clock over the top panel background where it was
+        and where it is now, returns the screen rect updated
+        """
+        clock_surf = self.get_clock_surf(self.get_clock_str(elapsed_seconds))
         clock_rect = clock_surf.get_rect(
             left=38, centery=(self.top_rect.h//2)*1.2
         )
+        dirty = clock_rect.union(self.clock_rect or clock_rect)
+        self.clock_rect = clock_rect
+        self.top_surf.blit(self.surf_top_bg, dirty, dirty)
+        self._draw_buttons(
+            self.top_surf,
+            [button for button in self.controls_top
+             if button.rect.colliderect(dirty)])
         self.top_surf.blit(clock_surf, clock_rect)
-        self.parent_surf.blit(self.top_surf, self.top_surf.get_rect())
+        return self.parent_surf.blit(
+            self.top_surf, dirty.move(self.top_rect.topleft), dirty)
+
+    def get_clock_surf(self, clock_str: str) -> pygame.Surface:
+        """Clock text composed from cached glyphs of its characters,
+        kept until the text changes
+        """
+        if clock_str != self.clock_str:
+            chars = [
+                glyphs.get_glyph(self.clock_font, char, WHITE)
+                for char in clock_str
+            ]
+            self.clock_surf = pygame.Surface(
+                (sum(char.get_width() for char in chars),
+                 self.clock_font.get_height()),
+                pygame.SRCALPHA)
+            x = 0
+            for char in chars:
+                self.clock_surf.blit(char, (x, 0))
+                x += char.get_width()
+            self.clock_str = clock_str
+        return self.clock_surf
 
     def get_clock_str(self, seconds_in: int) -> str:
         (days, hours, minutes, secods) = Hud.normalize_seconds(seconds_in)
         return f"{days if days else ''} {hours:0>2}:{minutes:0>2}:{secods:0>2}"
 
+    @staticmethod
+    def _buttons_changed(buttons: List[RoundButton]) -> bool:
+        return any(button.image is not button.drawn_image
+                   for button in buttons)
+
+    @staticmethod
+    def _draw_buttons(surf: pygame.Surface,
+                      buttons: List[RoundButton]) -> None:
+        for button in buttons:
+            surf.blit(button.image, button.pos)
+            button.drawn_image = button.image
+
     @staticmethod
     def normalize_seconds(seconds: int) -> tuple:
         (days, remainder) = divmod(seconds, 86400)
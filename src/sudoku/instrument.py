@@ -0,0 +1,228 @@
+# -*- coding: utf-8
+import functools
+import json
+import logging
+import math
+import os
+import time
+from typing import Callable, Dict, List, Optional
+
+# on with SUDOKU_INSTRUMENT=1, read once at import so code decorated
+# while it is off runs undecorated
+ENABLED = os.environ.get('SUDOKU_INSTRUMENT', '') not in ('', '0')
+# file the registry is written to every DUMP_SECONDS and on quit
+DUMP_PATH = os.environ.get('SUDOKU_INSTRUMENT_FILE') or None
+DUMP_SECONDS = 10
+PERCENTILES = (50, 90, 99)
+
+# calls of traced() functions are logged here at DEBUG
+logger = logging.getLogger('sudoku.instrument')
+
+
+class Histogram:
+    """Latencies counted in buckets a quarter octave wide starting at one
+    microsecond, so percentiles are within 19% of the true value and
+    adding one costs the same however many were added before.
+    """
+    __slots__ = ('buckets', 'count', 'total', 'max')
+    BUCKETS = 128  # the last one holds anything over an hour
+
+    def __init__(self) -> None:
+        self.buckets = [0] * self.BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        micros = seconds * 1e6
+        index = int(math.log2(micros) * 4) + 1 if micros >= 1 else 0
+        self.buckets[min(index, self.BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, percent: float) -> float:
+        """Seconds that percent of the latencies do not exceed, the upper
+        bound of their bucket
+        """
+        rank = math.ceil(self.count * percent / 100)
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= rank and index < self.BUCKETS - 1:
+                return min(2 ** (index / 4) / 1e6, self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        summary = {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'max': self.max,
+        }
+        for percent in PERCENTILES:
+            summary[f'p{percent}'] = self.percentile(percent)
+        return summary
+
+
+class Registry:
+    """Named counters and latency histograms"""
+
+    def __init__(self) -> None:
+        self.counters: Dict[str, int] = {}
+        self.histograms: Dict[str, Histogram] = {}
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name: str, seconds: float) -> None:
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.add(seconds)
+
+    def snapshot(self) -> dict:
+        """Counters and the summary of every histogram, in seconds"""
+        return {
+            'counters': dict(sorted(self.counters.items())),
+            'histograms': {
+                name: self.histograms[name].summary()
+                for name in sorted(self.histograms)
+            },
+        }
+
+    def dump(self, path: str) -> None:
+        """Write the snapshot to path as JSON, replacing it atomically"""
+        temp = path + '.tmp'
+        with open(temp, 'w', encoding='utf-8') as file:
+            json.dump(self.snapshot(), file, indent=2)
+        os.replace(temp, path)
+
+    def reset(self) -> None:
+        self.counters.clear()
+        self.histograms.clear()
+
+
+registry = Registry()
+
+
+def count(name: str, amount: int = 1) -> None:
+    """Add amount to counter name when instrumentation is on"""
+    if ENABLED:
+        registry.count(name, amount)
+
+
+def observe(name: str, seconds: float) -> None:
+    """Add a latency to histogram name when instrumentation is on"""
+    if ENABLED:
+        registry.observe(name, seconds)
+
+
+def timed(name: str) -> Callable[[Callable], Callable]:
+    """Decorator recording the runtime of every call in histogram name.
+    With instrumentation off the function is returned as it is.
+    """
+    def decorator(func: Callable) -> Callable:
+        if not ENABLED:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                registry.observe(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def traced(name: str, attribute: Optional[str] = None) \
+        -> Callable[[Callable], Callable]:
+    """Decorator counting every call in counter name and logging its
+    arguments and return value, with attribute also that attribute of
+    the first argument before and after the call. With instrumentation
+    off the function is returned as it is.
+    """
+    def decorator(func: Callable) -> Callable:
+        if not ENABLED:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            registry.count(name)
+            if not logger.isEnabledFor(logging.DEBUG):
+                return func(*args, **kwargs)
+            signature = ', '.join(
+                [repr(arg) for arg in args]
+                + [f'{key}={value!r}' for key, value in kwargs.items()])
+            logger.debug('calling %s(%s)', name, signature)
+            if attribute is not None:
+                logger.debug('%s before: %s', attribute,
+                             getattr(args[0], attribute))
+            value = func(*args, **kwargs)
+            if attribute is not None:
+                logger.debug('%s after: %s', attribute,
+                             getattr(args[0], attribute))
+            logger.debug('%s returned %r', name, value)
+            return value
+        return wrapper
+    return decorator
+
+
+class Frame:
+    """Times the phases of a frame into the histograms frame.<phase> and
+    the whole of it into frame.total, writing the registry to DUMP_PATH
+    every DUMP_SECONDS. Does nothing while instrumentation is off.
+    """
+    __slots__ = ('path', '_start', '_last', '_dumped')
+
+    def __init__(self, path: Optional[str] = DUMP_PATH) -> None:
+        self.path = path
+        self._start = self._last = self._dumped = time.perf_counter()
+
+    def start(self) -> None:
+        if ENABLED:
+            self._start = self._last = time.perf_counter()
+
+    def lap(self, phase: str) -> None:
+        """End phase, the next one starts now"""
+        if ENABLED:
+            now = time.perf_counter()
+            registry.observe(f'frame.{phase}', now - self._last)
+            self._last = now
+
+    def end(self) -> None:
+        if ENABLED:
+            now = time.perf_counter()
+            registry.observe('frame.total', now - self._start)
+            registry.count('frames')
+            if self.path and now - self._dumped >= DUMP_SECONDS:
+                self.dump()
+
+    def dump(self) -> None:
+        if ENABLED and self.path:
+            self._dumped = time.perf_counter()
+            try:
+                registry.dump(self.path)
+            except OSError:
+                self.path = None  # stop trying, keep playing
+
+    @staticmethod
+    def report() -> List[str]:
+        """Lines of frame phase percentiles in milliseconds, the whole
+        frame first
+        """
+        names = sorted(
+            (name for name in registry.histograms
+             if name.startswith('frame.')),
+            key=lambda name: (name != 'frame.total', name))
+        lines = []
+        for name in names:
+            histogram = registry.histograms[name]
+            times = ' '.join(
+                f'p{percent} {histogram.percentile(percent) * 1000:.1f}'
+                for percent in PERCENTILES)
+            lines.append(
+                f'{name[6:]:<7} {times} max {histogram.max * 1000:.1f} ms')
+        return lines
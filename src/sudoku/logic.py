@@ -1,20 +1,102 @@
 # -*- coding: utf-8
 import copy
+import operator
 import random
-from typing import List, Tuple
+from typing import List, Optional, Sequence, Tuple
+
+from .decorators import timer
+from .dlx import DlxSolver
+from .grader import TIERS, Grade, Grader
+from .solver import Solver, SolverStats
+from .units import get_units
+
+GRADE_ATTEMPTS = 100
+# difficulty percent a tier is generated at by default, where a puzzle
+# grades at it about every third attempt or more often
+TIER_DIFFICULTY = {
+    'easy': 30,
+    'medium': 60,
+    'hard': 75,
+    'expert': 85,
+    'evil': 90,
+}
+# lowest and highest difficulty percent a tier turns up at: below the
+# lowest too few cells are blank to need the tier's techniques or score,
+# from 60 on every puzzle scores past easy
+TIER_DIFFICULTY_RANGE = {
+    'easy': (0, 55),
+    'medium': (45, 100),
+    'hard': (45, 100),
+    'expert': (55, 100),
+    'evil': (60, 100),
+}
+# boards at least this wide are solved with Dancing Links
+DLX_SIDE = 16
 
 
 class Logic:
-    def is_game_over(self, inputs: List[int], solution: List[int]) -> bool:
-        if 0 in inputs:
+    def __init__(self, rng: Optional[random.Random] = None,
+                 stats: Optional[SolverStats] = None) -> None:
+        """With stats given the solver effort of generating is added to
+        it, see SolverStats
+        """
+        self.random = random if rng is None else rng
+        self.stats = stats
+
+    def is_game_over(self, inputs: Sequence[int], solution: Sequence[int]) \
+            -> bool:
+        if 0 in inputs or len(inputs) != len(solution):
             return False
-        return inputs == solution
+        return all(map(operator.eq, inputs, solution))
 
-    def create_game(self, difficulty_percent: int = 50) \
-            -> Tuple[List[int], List[int]]:
-        solution = self._create_solution()
-        puzzle = self._create_puzzle(solution, difficulty_percent)
-        return solution, puzzle
+    @timer
+    def create_game(
+        self,
+        difficulty_percent: int = 50,
+        unique: bool = True,
+        tier: Optional[str] = None,
+        attempts: int = GRADE_ATTEMPTS
+    ) -> Optional[Tuple[List[int], List[int]]]:
+        """Create (solution, puzzle). With a tier from grader.TIERS
+        unique puzzles are generated until one grades at that tier,
+        giving up after attempts and returning None. ValueError when
+        difficulty_percent is out of the tier's TIER_DIFFICULTY_RANGE.
+        """
+        if tier is None:
+            solution = self._create_solution()
+            if unique:
+                return solution, self._create_unique_puzzle(
+                    solution, difficulty_percent)
+            return solution, self._create_puzzle(solution, difficulty_percent)
+
+        game = self.create_graded_game(difficulty_percent, tier, attempts)
+        return None if game is None else game[:2]
+
+    def create_graded_game(
+        self,
+        difficulty_percent: int,
+        tier: str,
+        attempts: int = GRADE_ATTEMPTS
+    ) -> Optional[Tuple[List[int], List[int], Grade]]:
+        """Create (solution, puzzle, grade) of a unique puzzle graded at
+        tier, as create_game does, so callers that store the grade need
+        not grade the puzzle again
+        """
+        if tier not in TIERS:
+            raise ValueError(f'unknown tier {tier!r}')
+        lowest, highest = TIER_DIFFICULTY_RANGE[tier]
+        if not lowest <= difficulty_percent <= highest:
+            raise ValueError(
+                f'difficulty {difficulty_percent} is out of reach of {tier} '
+                f'puzzles, use {lowest} to {highest}')
+        grader = Grader()
+        for _ in range(attempts):
+            solution = self._create_solution()
+            puzzle = self._create_unique_puzzle(solution, difficulty_percent)
+            grade = grader.grade(puzzle)
+            if grade.tier == tier:
+                return solution, puzzle, grade
+        return None
 
     def _create_solution(self) -> List[List[int]]:
         base = 3
@@ -26,7 +108,7 @@ class Logic:
 
         # randomize rows, columns and numbers (of valid base pattern)
         def shuffle(s):
-            return random.sample(s, len(s))
+            return self.random.sample(s, len(s))
 
         source = range(base)
         rows = [
@@ -46,52 +128,95 @@ class Logic:
         ]
 
     def _create_puzzle(self, solution, difficulty_percent):
-        def scaled_clamp(value, from1, to1, from2, to2):
-            return (value - from1) / (to1 - from1) * (to2 - from2) + from2
-
         puzzle = copy.deepcopy(solution)
-        diff = scaled_clamp(
-            float(difficulty_percent+1), 1.0, 100.0, 3/10, 8/10)
-        base = 3
-        side = base * base
+        side = len(solution)
         num_squares = side * side
-        num_empties = int(num_squares * diff)  # number of empty values
+        num_empties = self._count_empties(num_squares, difficulty_percent)
 
-        for subset in random.sample(range(num_squares), num_empties):
+        for subset in self.random.sample(range(num_squares), num_empties):
             puzzle[subset // side][subset % side] = 0
         return puzzle
 
+    def _create_unique_puzzle(self, solution, difficulty_percent):
+        """Blank cells one at a time in random order, keeping a blank
+        only while the puzzle still has exactly one solution. At high
+        difficulty fewer cells than requested may end up empty.
+
+        The puzzle before a blank has one solution, so the blank keeps
+        it unique unless another digit fits the cell and leads to a
+        solution. The digits used in every unit are kept up to date to
+        skip the search when the cell is a naked or hidden single.
+        """
+        side = len(solution)
+        num_squares = side * side
+        num_empties = self._count_empties(num_squares, difficulty_percent)
+        solver = Solver(self.stats)
+        tables = get_units(side)
+        puzzle = [value for row in solution for value in row]
+        used = [tables.full] * len(tables.units)
+        empties = 0
+
+        for subset in self.random.sample(range(num_squares), num_squares):
+            if empties == num_empties:
+                break
+            value, puzzle[subset] = puzzle[subset], 0
+            bit = 1 << (value - 1)
+            for unit in tables.cell_units[subset]:
+                used[unit] ^= bit
+            if self._is_forced(tables, puzzle, used, subset, bit) \
+                    or not self._fits_other(
+                        solver, tables, puzzle, used, subset, bit):
+                empties += 1
+                continue
+            puzzle[subset] = value
+            for unit in tables.cell_units[subset]:
+                used[unit] |= bit
+        return [puzzle[r:r + side] for r in range(0, num_squares, side)]
+
+    @staticmethod
+    def _is_forced(tables, puzzle, used, pos, bit) -> bool:
+        """Whether the digit of bit is the only one left for the empty
+        cell pos or has no other place in one of its units
+        """
+        u0, u1, u2 = tables.cell_units[pos]
+        if tables.full & ~(used[u0] | used[u1] | used[u2]) == bit:
+            return True
+        cell_units = tables.cell_units
+        for unit in (u0, u1, u2):
+            for other in tables.units[unit]:
+                if other != pos and not puzzle[other]:
+                    o0, o1, o2 = cell_units[other]
+                    if not bit & (used[o0] | used[o1] | used[o2]):
+                        break
+            else:
+                return True
+        return False
+
+    @staticmethod
+    def _fits_other(solver, tables, puzzle, used, pos, bit) -> bool:
+        """Whether a digit other than that of bit leads to a solution
+        when put in the empty cell pos, which is left empty
+        """
+        u0, u1, u2 = tables.cell_units[pos]
+        others = tables.full & ~(used[u0] | used[u1] | used[u2] | bit)
+        found = False
+        while others and not found:
+            digit = others & -others
+            others ^= digit
+            puzzle[pos] = digit.bit_length()
+            found = solver.solve(puzzle) is not None
+        puzzle[pos] = 0
+        return found
+
+    @staticmethod
+    def _count_empties(num_squares, difficulty_percent) -> int:
+        def scaled_clamp(value, from1, to1, from2, to2):
+            return (value - from1) / (to1 - from1) * (to2 - from2) + from2
+
+        diff = scaled_clamp(
+            float(difficulty_percent+1), 1.0, 100.0, 3/10, 8/10)
+        return int(num_squares * diff)  # number of empty values
+
     def _solve_sudoku(self, board):
-        size = len(board)
-        block = int(size ** 0.5)
-        # Reduce array to one dimension
-        board = [n for row in board for n in row]
-        span = {
-            (n, p): {
-                (g, n) for g in
-                (n > 0) * [
-                    p // size,
-                    size + p % size,
-                    2 * size + p % size // block + p // size // block * block
-                ]
-            } for p in range(size * size) for n in range(size + 1)
-        }
-        empties = [i for i, n in enumerate(board) if n == 0]
-        used = set().union(*(span[n, p] for p, n in enumerate(board) if n))
-        empty = 0
-        while empty >= 0 and empty < len(empties):
-            pos = empties[empty]
-            used -= span[board[pos], pos]
-            board[pos] = next(
-                (n for n in range(board[pos] + 1, size + 1)
-                    if not span[n, pos] & used), 0
-            )
-            used |= span[board[pos], pos]
-            empty += 1 if board[pos] else -1
-            if empty == len(empties):
-                solution = [
-                    board[r:r+size] for r in range(0, size * size, size)
-                ]
-                yield solution
-                empty -= 1
-        return solution
+        solver = DlxSolver if len(board[0]) >= DLX_SIDE else Solver
+        yield from solver(self.stats).iter_solutions(board)
@@ -0,0 +1,160 @@
+# -*- coding: utf-8
+import base64
+import os
+import struct
+import sys
+import threading
+from os.path import dirname, expanduser, join
+from typing import NamedTuple, Optional, Sequence
+
+from .data import Data
+from .history import History
+
+SAVE_PATH = join(expanduser('~'), '.sudoku', 'save')
+STORAGE_KEY = 'sudoku.save'  # localStorage key in the browser
+BROWSER = sys.platform in ('emscripten', 'wasi')
+
+# magic, version, difficulty, elapsed seconds
+_HEADER = struct.Struct('<4sBBI')
+_MAGIC = b'SDKS'
+_VERSION = 1
+# puzzle, solution and entries packed two cells per byte, 81 note masks
+_CELLS = struct.Struct('<41s41s41s81H')
+
+
+class SaveState(NamedTuple):
+    puzzle: Data
+    solution: Data
+    entries: Data  # givens and the numbers entered
+    marks: Sequence[int]
+    elapsed_seconds: int
+    difficulty: int
+    history: bytes  # History.to_bytes()
+
+
+def encode(state: SaveState) -> str:
+    """Pack a game into a short ascii string"""
+    data = _HEADER.pack(
+        _MAGIC, _VERSION, state.difficulty,
+        min(int(state.elapsed_seconds), 0xffffffff))
+    data += _CELLS.pack(
+        state.puzzle.pack(), state.solution.pack(), state.entries.pack(),
+        *state.marks)
+    return base64.b64encode(data + state.history).decode('ascii')
+
+
+def decode(text: str) -> SaveState:
+    """Unpack a game packed by encode, ValueError if it is not one"""
+    try:
+        data = base64.b64decode(text, validate=True)
+    except ValueError as error:
+        raise ValueError('not a saved game') from error
+    if len(data) < _HEADER.size + _CELLS.size:
+        raise ValueError('not a saved game')
+    magic, version, difficulty, elapsed = _HEADER.unpack_from(data)
+    if (magic, version) != (_MAGIC, _VERSION):
+        raise ValueError('not a saved game')
+    puzzle, solution, entries, *marks = _CELLS.unpack_from(
+        data, _HEADER.size)
+    state = SaveState(
+        Data.unpack(puzzle), Data.unpack(solution), Data.unpack(entries),
+        tuple(marks), elapsed, difficulty,
+        data[_HEADER.size + _CELLS.size:])
+    # nibbles go up to 15, keep a corrupt save from reaching the board
+    if max(state.puzzle) > 9 or max(state.entries) > 9 \
+            or not all(1 <= value <= 9 for value in state.solution) \
+            or max(marks) > 0x1ff:
+        raise ValueError('not a saved game')
+    History.from_bytes(state.history)
+    return state
+
+
+class SaveStore:
+    """Keeps the saved game, in a file on the desktop and in the
+    browser's localStorage under pygbag.
+
+    On the desktop the file is written by a background thread so the
+    game loop never waits on the disk; only the latest pending save is
+    written. close() flushes it.
+    """
+
+    def __init__(self, path: str = SAVE_PATH) -> None:
+        self.path = path
+        self._pending = None
+        self._cond = threading.Condition()
+        self._closing = False
+        self._thread = None
+
+    def load(self) -> Optional[SaveState]:
+        """The saved game, None if there is none or it is unreadable"""
+        try:
+            text = self._read()
+            return decode(text) if text else None
+        except (OSError, ValueError):
+            return None
+
+    def save(self, state: Optional[SaveState]) -> None:
+        """Save state, None removes the saved game"""
+        text = '' if state is None else encode(state)
+        if BROWSER:
+            self._write(text)
+            return
+        with self._cond:
+            self._pending = text
+            self._cond.notify()
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._write_loop, name='save-game', daemon=True)
+            self._thread.start()
+
+    def close(self) -> None:
+        if self._thread is not None:
+            with self._cond:
+                self._closing = True
+                self._cond.notify()
+            self._thread.join()
+            self._thread = None
+
+    def _write_loop(self) -> None:
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closing:
+                    self._cond.wait()
+                text, self._pending = self._pending, None
+                if text is None:
+                    self._closing = False
+                    return
+            try:
+                self._write(text)
+            except OSError:
+                pass  # keep playing, the next save may succeed
+
+    def _read(self) -> str:
+        if BROWSER:
+            import platform  # pygbag's browser bindings
+            return platform.window.localStorage.getItem(STORAGE_KEY) or ''
+        try:
+            with open(self.path, encoding='ascii') as file:
+                return file.read()
+        except FileNotFoundError:
+            return ''
+
+    def _write(self, text: str) -> None:
+        if BROWSER:
+            import platform  # pygbag's browser bindings
+            if text:
+                platform.window.localStorage.setItem(STORAGE_KEY, text)
+            else:
+                platform.window.localStorage.removeItem(STORAGE_KEY)
+            return
+        if not text:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+            return
+        os.makedirs(dirname(self.path), exist_ok=True)
+        temp = self.path + '.tmp'
+        with open(temp, 'w', encoding='ascii') as file:
+            file.write(text)
+        os.replace(temp, self.path)
@@ -0,0 +1,254 @@
+# -*- coding: utf-8
+import time
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .units import Units, get_units
+
+
+class SolverStats:
+    """Search effort of the solves a Solver was given it for.
+
+    nodes: grids taken off the search stack, the first one included.
+    backtracks: nodes that ended in a contradiction.
+    propagations: cells filled by naked and hidden singles.
+    max_depth: most guesses stacked on the way to a node.
+    worst_nodes: most nodes a single solve took.
+    seconds: time spent inside the solver.
+    """
+    __slots__ = ('solves', 'nodes', 'backtracks', 'propagations',
+                 'max_depth', 'worst_nodes', 'seconds')
+
+    def __init__(self) -> None:
+        self.solves = 0
+        self.nodes = 0
+        self.backtracks = 0
+        self.propagations = 0
+        self.max_depth = 0
+        self.worst_nodes = 0
+        self.seconds = 0.0
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f'{name}={getattr(self, name)!r}'
+                           for name in self.__slots__)
+        return f'{type(self).__name__}({fields})'
+
+    def merge(self, other: 'SolverStats') -> None:
+        """Add the counts of other, as if its solves were made here"""
+        self.solves += other.solves
+        self.nodes += other.nodes
+        self.backtracks += other.backtracks
+        self.propagations += other.propagations
+        self.max_depth = max(self.max_depth, other.max_depth)
+        self.worst_nodes = max(self.worst_nodes, other.worst_nodes)
+        self.seconds += other.seconds
+
+    def as_dict(self) -> Dict[str, float]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def summary(self) -> str:
+        per_solve = max(self.solves, 1)
+        return (
+            f'{self.solves} solves, {self.nodes} nodes '
+            f'({self.nodes / per_solve:.1f}/solve, worst '
+            f'{self.worst_nodes}), {self.backtracks} backtracks, '
+            f'{self.propagations} propagations, max depth '
+            f'{self.max_depth}, {self.seconds:.3f} sec'
+        )
+
+
+class Solver:
+    """Constraint solver working on bitmasks.
+
+    Every row, column and box keeps a mask of the digits already used
+    in it (bit ``d - 1`` for digit ``d``) so the candidates of a cell
+    are a single and-not of three ints. Naked and hidden singles are
+    propagated before branching on the most constrained cell.
+
+    Grids are either a list of rows or a flat sequence of values with
+    0 marking an empty cell; solutions are returned in the same shape.
+    Given a SolverStats every solve adds its search effort to it.
+    """
+
+    def __init__(self, stats: Optional[SolverStats] = None) -> None:
+        self.stats = stats
+
+    def solve(self, grid: Sequence) -> Optional[List]:
+        """Return the first solution of grid or None if there is none"""
+        return next(self.iter_solutions(grid, limit=1), None)
+
+    def count_solutions(self, grid: Sequence, limit: int = 2) -> int:
+        """Count solutions of grid, stopping once limit is reached"""
+        return sum(1 for _ in self.iter_solutions(grid, limit=limit))
+
+    def iter_solutions(self, grid: Sequence, limit: Optional[int] = None) \
+            -> Iterator[List]:
+        """Yield solutions of grid, at most limit of them if given"""
+        if self.stats is None:
+            return self._search(grid, limit, None)
+        return self._search_with_stats(grid, limit, self.stats)
+
+    def _search_with_stats(self, grid: Sequence, limit: Optional[int],
+                           stats: SolverStats) -> Iterator[List]:
+        search = SolverStats()
+        start = time.perf_counter()
+        try:
+            yield from self._search(grid, limit, search)
+        finally:
+            search.solves = 1
+            search.worst_nodes = search.nodes
+            search.seconds = time.perf_counter() - start
+            stats.merge(search)
+
+    def _search(self, grid: Sequence, limit: Optional[int],
+                stats: Optional[SolverStats]) -> Iterator[List]:
+        nested = len(grid) > 0 and isinstance(grid[0], (list, tuple))
+        values = [n for row in grid for n in row] if nested else list(grid)
+        side = int(len(values) ** 0.5)
+        if side * side != len(values):
+            raise ValueError(f'grid of {len(values)} cells is not square')
+        tables = get_units(side)
+        used = self._used_digits(tables, values)
+        if used is None:
+            if stats is not None:
+                stats.nodes = stats.backtracks = 1
+            return
+
+        found = 0
+        stack = [(values, used, 0)]
+        while stack:
+            values, used, depth = stack.pop()
+            if stats is None:
+                branch = self._propagate(tables, values, used)
+            else:
+                empties = values.count(0)
+                branch = self._propagate(tables, values, used)
+                stats.nodes += 1
+                stats.propagations += empties - values.count(0)
+                stats.max_depth = max(stats.max_depth, depth)
+                stats.backtracks += branch is None
+            if branch is None:
+                continue
+            pos, mask = branch
+            if pos < 0:
+                yield (
+                    [values[r:r + side] for r in range(0, side * side, side)]
+                    if nested else values
+                )
+                found += 1
+                if limit is not None and found >= limit:
+                    return
+                continue
+            units = tables.cell_units[pos]
+            # push highest digit first so the lowest one is tried first
+            while mask:
+                bit = 1 << (mask.bit_length() - 1)
+                mask ^= bit
+                next_values = values[:]
+                next_values[pos] = bit.bit_length()
+                next_used = used[:]
+                for unit in units:
+                    next_used[unit] |= bit
+                stack.append((next_values, next_used, depth + 1))
+
+    @staticmethod
+    def _used_digits(tables: Units, values: List[int]) -> Optional[List[int]]:
+        """Masks of the digits given in every unit, None when a digit is
+        given twice in a unit
+        """
+        used = [0] * len(tables.units)
+        for pos, value in enumerate(values):
+            if value:
+                bit = 1 << (value - 1)
+                units = tables.cell_units[pos]
+                if (used[units[0]] | used[units[1]] | used[units[2]]) & bit:
+                    return None
+                for unit in units:
+                    used[unit] |= bit
+        return used
+
+    def _propagate(self, tables: Units, values: List[int],
+                   used: List[int]) -> Optional[Tuple[int, int]]:
+        """Place naked and hidden singles in place.
+
+        Returns (cell, candidates) of the most constrained empty cell,
+        (-1, 0) when the grid is complete or None on a contradiction.
+        """
+        empties = [pos for pos, value in enumerate(values) if not value]
+        cands = [0] * len(values)
+        while empties:
+            placed = self._naked_singles(tables, values, used, empties, cands)
+            if placed is None:
+                return None
+            empties = [pos for pos in empties if not values[pos]]
+            if placed:
+                continue
+            # candidates are exact when no naked single was placed
+            placed = self._hidden_singles(tables, values, used, cands)
+            if placed is None:
+                return None
+            if not placed:
+                break
+            empties = [pos for pos in empties if not values[pos]]
+
+        if not empties:
+            return -1, 0
+        best = min(empties, key=lambda pos: bin(cands[pos]).count('1'))
+        return best, cands[best]
+
+    @staticmethod
+    def _naked_singles(tables: Units, values: List[int], used: List[int],
+                       empties: List[int], cands: List[int]) -> Optional[int]:
+        """Fill cells with a single candidate and record the candidates
+        of the others. Returns the number of cells filled or None on
+        a contradiction.
+        """
+        full = tables.full
+        cell_units = tables.cell_units
+        placed = 0
+        for pos in empties:
+            u0, u1, u2 = cell_units[pos]
+            mask = full & ~(used[u0] | used[u1] | used[u2])
+            if not mask:
+                return None
+            if mask & (mask - 1):
+                cands[pos] = mask
+            else:
+                values[pos] = mask.bit_length()
+                used[u0] |= mask
+                used[u1] |= mask
+                used[u2] |= mask
+                placed += 1
+        return placed
+
+    @staticmethod
+    def _hidden_singles(tables: Units, values: List[int], used: List[int],
+                        cands: List[int]) -> Optional[int]:
+        """Fill digits that fit in only one cell of a unit. Returns the
+        number of cells filled or None on a contradiction.
+        """
+        full = tables.full
+        cell_units = tables.cell_units
+        placed = 0
+        for unit, cells in enumerate(tables.units):
+            once = twice = 0
+            for pos in cells:
+                if not values[pos]:
+                    mask = cands[pos]
+                    twice |= once & mask
+                    once |= mask
+            if (once | used[unit]) != full:
+                return None
+            hidden = once & ~twice
+            for pos in cells if hidden else ():
+                bit = cands[pos] & hidden
+                if not bit or values[pos] or used[unit] & bit:
+                    continue
+                u0, u1, u2 = cell_units[pos]
+                if bit & (bit - 1) or bit & (used[u0] | used[u1] | used[u2]):
+                    return None
+                values[pos] = bit.bit_length()
+                used[u0] |= bit
+                used[u1] |= bit
+                used[u2] |= bit
+                placed += 1
+        return placed
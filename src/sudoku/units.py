@@ -0,0 +1,57 @@
+# -*- coding: utf-8
+from functools import lru_cache
+from typing import NamedTuple, Tuple
+
+
+class Units(NamedTuple):
+    """Lookup tables of a side x side board, cells numbered row by row.
+
+    rows, cols, boxes: row, column and box of every cell.
+    cell_units: (row, column, box) of every cell as unit numbers; rows
+        are units 0..side-1, columns side..2*side-1 and boxes follow.
+    units: the cells of every unit.
+    peers: the cells sharing a unit with every cell, 20 on a 9x9 board.
+    """
+    base: int
+    side: int
+    full: int  # mask of all digits, bit d - 1 for digit d
+    rows: Tuple[int, ...]
+    cols: Tuple[int, ...]
+    boxes: Tuple[int, ...]
+    cell_units: Tuple[Tuple[int, int, int], ...]
+    units: Tuple[Tuple[int, ...], ...]
+    peers: Tuple[Tuple[int, ...], ...]
+
+
+@lru_cache(maxsize=None)
+def get_units(side: int = 9) -> Units:
+    """Tables of a board with side cells to a row, built once per side"""
+    base = int(side ** 0.5)
+    if base * base != side:
+        raise ValueError(f'board side {side} is not a square number')
+    cells = range(side * side)
+    rows = tuple(pos // side for pos in cells)
+    cols = tuple(pos % side for pos in cells)
+    boxes = tuple(
+        rows[pos] // base * base + cols[pos] // base for pos in cells)
+    cell_units = tuple(
+        (rows[pos], side + cols[pos], 2 * side + boxes[pos])
+        for pos in cells
+    )
+    units = tuple(
+        tuple(pos for pos in cells if unit in cell_units[pos])
+        for unit in range(3 * side)
+    )
+    peers = tuple(
+        tuple(sorted(
+            {peer for unit in cell_units[pos] for peer in units[unit]}
+            - {pos}))
+        for pos in cells
+    )
+    return Units(
+        base, side, (1 << side) - 1, rows, cols, boxes, cell_units, units,
+        peers)
+
+
+# the standard board
+UNITS = get_units(9)
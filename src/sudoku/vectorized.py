@@ -0,0 +1,207 @@
+# -*- coding: utf-8
+"""Checks of many boards at once with numpy, for offline pipelines.
+
+Boards are an (N, cells) uint8 array, one row-major board per row with
+0 marking an empty cell, 81 cells for the standard board. Digit masks
+use bit d - 1 for digit d like the rest of the engine. Every check is a
+handful of array operations over all N boards; check() cuts large
+batches into chunks to bound the memory the temporaries take.
+
+numpy is only needed here, the game does not import this module.
+"""
+from math import isqrt
+from typing import Iterable, NamedTuple, Tuple, Union
+
+import numpy as np
+
+from .data import LINE_CHARS
+
+CHUNK_SIZE = 65536
+# line character code to cell value, 255 for characters not allowed
+_FROM_LINE = np.full(256, 255, dtype=np.uint8)
+_FROM_LINE[list(LINE_CHARS)] = [0] + list(range(10))
+# cell value to digit mask
+_BITS = np.array([0] + [1 << bit for bit in range(16)], dtype=np.uint16)
+
+
+class Checks(NamedTuple):
+    """Per board results of check(), (N,) bool arrays"""
+    valid: np.ndarray  # no digit repeats in a row, column or box
+    complete: np.ndarray  # no empty cell
+    stuck: np.ndarray  # an empty cell has no candidate left
+
+    @property
+    def solved(self) -> np.ndarray:
+        return self.valid & self.complete
+
+
+def _units(values: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """Rows, columns and boxes of (N, cells) values as (N, side, side)
+    arrays, a unit to a row. Rows and columns are views.
+    """
+    count, cells = values.shape
+    side = isqrt(cells)
+    base = isqrt(side)
+    rows = values.reshape(count, side, side)
+    boxes = values.reshape(count, base, base, base, base) \
+        .transpose(0, 1, 3, 2, 4).reshape(count, side, side)
+    return rows, rows.transpose(0, 2, 1), boxes
+
+
+def _used(bits: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """Masks of the digits in every row, column and box, (N, side) each"""
+    return tuple(
+        np.bitwise_or.reduce(unit, axis=2) for unit in _units(bits))
+
+
+def _repeats(bits: np.ndarray, used: Tuple[np.ndarray, ...]) \
+        -> np.ndarray:
+    """(N,) bool, True where a unit holds a digit twice: the digits of a
+    unit only add up to their mask when they are all different
+    """
+    # nine digits add up to under 2 ** 16 even if all are 9
+    dtype = np.uint16 if bits.shape[1] <= 81 else np.uint32
+    repeats = np.zeros(len(bits), dtype=bool)
+    for unit, mask in zip(_units(bits), used):
+        repeats |= (
+            np.add.reduce(unit, axis=2, dtype=dtype) != mask).any(axis=1)
+    return repeats
+
+
+def _candidates(boards: np.ndarray, used: Tuple[np.ndarray, ...]) \
+        -> np.ndarray:
+    count, cells = boards.shape
+    side = isqrt(cells)
+    base = isqrt(side)
+    rows, cols, boxes = used
+    # cell (row, col) is at [box row, row in box, box col, col in box]
+    taken = (rows.reshape(count, base, base, 1, 1)
+             | cols.reshape(count, 1, 1, base, base)
+             | boxes.reshape(count, base, 1, base, 1))
+    free = ~taken.reshape(count, cells) & np.uint16((1 << side) - 1)
+    free[boards != 0] = 0
+    return free
+
+
+def as_boards(boards) -> np.ndarray:
+    """boards as an (N, cells) uint8 array, ValueError when they are not
+    square boards of digits
+    """
+    boards = np.asarray(boards, dtype=np.uint8)
+    if boards.ndim == 1:
+        boards = boards.reshape(1, -1)
+    side = isqrt(boards.shape[-1])
+    if boards.ndim != 2 or side * side != boards.shape[-1] or side > 16:
+        raise ValueError(f'boards of shape {boards.shape} are not square')
+    if boards.size and boards.max() > side:
+        raise ValueError(f'boards hold digits over {side}')
+    return boards
+
+
+def from_lines(lines: Iterable[Union[str, bytes]]) -> np.ndarray:
+    """Parse puzzles in the 81-character line format, see Data.from_line,
+    into an (N, 81) array
+    """
+    rows = [
+        (line.encode('ascii', 'replace') if isinstance(line, str)
+         else line).strip()
+        for line in lines
+    ]
+    rows = [row for row in rows if row]
+    for row in rows:
+        if len(row) != 81:
+            raise ValueError(f'invalid puzzle line {row.decode()!r}')
+    boards = _FROM_LINE[
+        np.frombuffer(b''.join(rows), dtype=np.uint8)].reshape(-1, 81)
+    invalid = (boards == 255).any(axis=1)
+    if invalid.any():
+        row = rows[int(invalid.argmax())]
+        raise ValueError(f'invalid puzzle line {row.decode()!r}')
+    return boards
+
+
+def digit_bits(boards: np.ndarray) -> np.ndarray:
+    """(N, cells) uint16 masks of the digit in every cell, 0 if empty"""
+    return _BITS[boards]
+
+
+def unit_masks(boards) -> Tuple[np.ndarray, np.ndarray]:
+    """(N, units) uint16 masks of the digits in every unit and of those
+    that are in it more than once. Rows are units 0 to side - 1, columns
+    and boxes follow as in units.Units.
+    """
+    boards = as_boards(boards)
+    units = np.concatenate(_units(digit_bits(boards)), axis=1)
+    once = np.zeros(units.shape[:2], dtype=np.uint16)
+    twice = np.zeros_like(once)
+    for column in range(units.shape[2]):
+        twice |= once & units[:, :, column]
+        once |= units[:, :, column]
+    return once, twice
+
+
+def duplicates(boards) -> np.ndarray:
+    """(N, 3, cells) bool, True where the digit of a cell repeats in its
+    row, column and box
+    """
+    boards = as_boards(boards)
+    count, cells = boards.shape
+    side = isqrt(cells)
+    base = isqrt(side)
+    bits = digit_bits(boards)
+    _, twice = unit_masks(boards)
+    rows, cols, boxes = (twice[:, kind * side:(kind + 1) * side]
+                         for kind in range(3))
+    # cell (row, col) is at [box row, row in box, box col, col in box]
+    shape = (count, base, base, base, base)
+    return np.stack([
+        bits & np.broadcast_to(repeated, shape).reshape(count, cells) != 0
+        for repeated in (rows.reshape(count, base, base, 1, 1),
+                         cols.reshape(count, 1, 1, base, base),
+                         boxes.reshape(count, base, 1, base, 1))
+    ], axis=1)
+
+
+def candidates(boards) -> np.ndarray:
+    """(N, cells) uint16 masks of the digits not in the row, column or
+    box of every empty cell, 0 for filled cells
+    """
+    boards = as_boards(boards)
+    return _candidates(boards, _used(digit_bits(boards)))
+
+
+def is_valid(boards) -> np.ndarray:
+    """(N,) bool, True for boards with no digit repeated in a unit"""
+    bits = digit_bits(as_boards(boards))
+    return ~_repeats(bits, _used(bits))
+
+
+def is_complete(boards) -> np.ndarray:
+    """(N,) bool, True for boards without an empty cell"""
+    return as_boards(boards).all(axis=1)
+
+
+def matches(boards, solutions) -> np.ndarray:
+    """(N,) bool, True where a board equals its solution, the batch
+    counterpart of Logic.is_game_over
+    """
+    return (as_boards(boards) == as_boards(solutions)).all(axis=1)
+
+
+def check(boards, chunk_size: int = CHUNK_SIZE) -> Checks:
+    """Validity, completeness and dead ends of every board, chunk_size
+    boards at a time
+    """
+    boards = as_boards(boards)
+    checks = Checks(*(np.zeros(len(boards), dtype=bool) for _ in range(3)))
+    for start in range(0, len(boards), chunk_size):
+        chunk = boards[start:start + chunk_size]
+        done = slice(start, start + len(chunk))
+        bits = digit_bits(chunk)
+        used = _used(bits)
+        empty = chunk == 0
+        checks.valid[done] = ~_repeats(bits, used)
+        checks.complete[done] = ~empty.any(axis=1)
+        checks.stuck[done] = \
+            (empty & (_candidates(chunk, used) == 0)).any(axis=1)
+    return checks
@@ -0,0 +1,32 @@
+# -*- coding: utf-8
+import unittest
+
+from src.sudoku import assets
+
+
+class TestAssets(unittest.TestCase):
+    def test_get_image_cached(self):
+        image = assets.get_image('start', alpha=False)
+        self.assertEqual(image.get_size(), (500, 600))
+        self.assertIs(assets.get_image('start', alpha=False), image)
+
+    def test_buttons_atlas(self):
+        self.assertEqual(
+            assets.get_image('buttons').get_size(),
+            (len(assets.BUTTON_NAMES) * assets.BUTTON_SIZE,
+             assets.BUTTON_SIZE))
+        button = assets.get_button('undo')
+        self.assertEqual(
+            button.get_size(), (assets.BUTTON_SIZE, assets.BUTTON_SIZE))
+        self.assertEqual(
+            button.get_offset(),
+            (assets.BUTTON_NAMES.index('undo') * assets.BUTTON_SIZE, 0))
+        self.assertIs(button.get_parent(), assets.get_image('buttons'))
+
+    def test_get_button_unknown(self):
+        with self.assertRaises(ValueError):
+            assets.get_button('nope')
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,157 @@
+# -*- coding: utf-8
+import os
+import random
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from src.sudoku.bank import PuzzleBank, tier_for
+from src.sudoku.grader import TIERS, Grade, Grader
+from src.sudoku.logic import Logic
+
+SOLUTION = [int(c) for c in (
+    '1683752493579426819241865732796148355832974166415387928157239644968513'
+    '27732469158')]
+PUZZLE = [0 if i % 3 else n for i, n in enumerate(SOLUTION)]
+
+
+class TestBank(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.bank = PuzzleBank(self.tmp.name, low_water=2, high_water=3)
+
+    def tearDown(self):
+        self.bank.close()
+        self.tmp.cleanup()
+
+    def test_tier_for(self):
+        self.assertEqual(tier_for(0), 'easy')
+        self.assertEqual(tier_for(30), 'medium')
+        self.assertEqual(tier_for(50), 'hard')
+        self.assertEqual(tier_for(70), 'expert')
+        self.assertEqual(tier_for(100), 'evil')
+        self.assertEqual(
+            {tier_for(difficulty) for difficulty in range(101)}, set(TIERS))
+        self.assertEqual(tier_for('medium'), 'medium')
+        with self.assertRaises(ValueError):
+            tier_for('unknown')
+
+    def test_draw_empty(self):
+        self.assertIsNone(self.bank.draw('easy'))
+        self.assertEqual(self.bank.remaining('easy'), 0)
+
+    def test_add_and_draw(self):
+        tier = self.bank.add(SOLUTION, PUZZLE, Grade(7, 'medium', {}, True))
+        self.assertEqual(tier, 'medium')
+        self.assertEqual(self.bank.remaining('medium'), 1)
+        record = self.bank.draw('medium')
+        self.assertEqual(list(record.solution), SOLUTION)
+        self.assertEqual(list(record.puzzle), PUZZLE)
+        self.assertEqual((record.score, record.tier), (7, 'medium'))
+        self.assertIsNone(self.bank.draw('medium'))
+
+    def test_draw_in_order_and_persisted(self):
+        grade = Grade(1, 'easy', {}, True)
+        for score in range(3):
+            self.bank.add(SOLUTION, PUZZLE, grade._replace(score=score))
+        self.assertEqual(self.bank.draw('easy').score, 0)
+        self.bank.close()
+
+        bank = PuzzleBank(self.tmp.name)
+        self.assertEqual(bank.remaining('easy'), 2)
+        self.assertEqual(bank.draw(0).score, 1)
+        bank.add(SOLUTION, PUZZLE, grade._replace(score=3))
+        self.assertEqual(bank.remaining('easy'), 2)
+        self.assertEqual(
+            os.path.getsize(os.path.join(self.tmp.name, 'easy.bin')),
+            16 + 2 * 85)
+        self.assertEqual([bank.draw(0).score for _ in range(2)], [2, 3])
+        bank.close()
+
+    def test_add_grades_puzzle(self):
+        tier = self.bank.add(SOLUTION, PUZZLE)
+        self.assertEqual(self.bank.remaining(tier), 1)
+
+    def test_not_a_bank_file(self):
+        with open(os.path.join(self.tmp.name, 'hard.bin'), 'wb') as file:
+            file.write(b'x' * 32)
+        with self.assertRaises(ValueError):
+            self.bank.draw('hard')
+
+    def test_truncated_bank_file(self):
+        with open(os.path.join(self.tmp.name, 'easy.bin'), 'wb') as file:
+            file.write(b'SDKB\x01')
+        with self.assertRaises(ValueError):
+            self.bank.draw('easy')
+        with self.assertRaises(ValueError):
+            self.bank.remaining('easy')
+        self.bank.add(SOLUTION, PUZZLE, Grade(1, 'medium', {}, True))
+        self.bank.close()
+        path = os.path.join(self.tmp.name, 'medium.bin')
+        with open(path, 'r+b') as file:
+            file.truncate(os.path.getsize(path) - 1)
+        bank = PuzzleBank(self.tmp.name)
+        with self.assertRaises(ValueError):
+            bank.draw('medium')
+        bank.add(SOLUTION, PUZZLE, Grade(2, 'medium', {}, True))
+        self.assertEqual(bank.draw('medium').score, 2)
+        bank.close()
+
+    def test_refill(self):
+        self.bank.low_water = self.bank.high_water = 1
+        self.bank._generate = lambda tier, logic: bool(self.bank.add(
+            SOLUTION, PUZZLE, Grade(1, tier, {}, True)))
+        self.assertEqual(self.bank.refill(), 5)
+        record = self.bank.draw('expert')
+        self.assertEqual(list(record.solution), SOLUTION)
+        self.assertEqual(self.bank.refill(), 1)
+
+    def test_generate_grades_once(self):
+        logic = Logic(random.Random(1))
+        with patch.object(Grader, 'grade', autospec=True,
+                          side_effect=Grader.grade) as grade:
+            self.assertTrue(self.bank._generate('easy', logic))
+        grade.assert_called_once()
+        self.assertEqual(self.bank.remaining('easy'), 1)
+
+    def test_refill_step(self):
+        self.bank._generate = lambda tier, logic, attempts: bool(
+            self.bank.add(SOLUTION, PUZZLE, Grade(1, tier, {}, True)))
+        self.bank.add(SOLUTION, PUZZLE, Grade(1, 'easy', {}, True))
+        self.assertTrue(self.bank.refill_step())
+        self.assertEqual(self.bank.remaining('easy'), 1)
+        self.assertEqual(self.bank.remaining('medium'), 1)
+        while self.bank.refill_step():
+            pass
+        self.assertEqual(
+            [self.bank.remaining(tier) for tier in TIERS], [3] * 5)
+
+    def test_refill_gives_up(self):
+        tried = []
+        self.bank._generate = lambda tier, logic: tried.append(tier)
+        self.assertEqual(self.bank.refill(tiers=['hard']), 0)
+        self.assertEqual(tried, ['hard'] * 3)
+
+    def test_refill_loop_backs_off(self):
+        tried = []
+        lock = threading.Lock()
+
+        def miss(tier, logic, attempts):
+            with lock:
+                tried.append(tier)
+            return False
+
+        self.bank._generate = miss
+        self.bank.start_refill()
+        time.sleep(0.5)
+        self.bank.close()
+        # every tier gets its turn and none is retried every pass
+        self.assertEqual(set(tried), set(TIERS))
+        for tier in TIERS:
+            self.assertLessEqual(tried.count(tier), 4)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
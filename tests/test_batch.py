@@ -0,0 +1,57 @@
+# -*- coding: utf-8
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.sudoku.batch import generate_batch
+from src.sudoku.logic import Logic
+from src.sudoku.solver import Solver, SolverStats
+
+
+class TestBatch(unittest.TestCase):
+    def test_generate_batch_count(self):
+        games = list(generate_batch(7, workers=1, chunk_size=3, report=None))
+        self.assertEqual(len(games), 7)
+        for solution, puzzle in games:
+            self.assertEqual(Solver().solve(puzzle), solution)
+
+    def test_generate_batch_seed_is_reproducible(self):
+        first = list(generate_batch(4, workers=1, seed=7, report=None))
+        second = list(generate_batch(4, workers=1, seed=7, report=None))
+        self.assertEqual(first, second)
+
+    def test_generate_batch_workers_same_games(self):
+        serial = list(generate_batch(
+            6, workers=1, seed=3, chunk_size=2, report=None))
+        parallel = list(generate_batch(
+            6, workers=2, seed=3, chunk_size=2, report=None))
+        self.assertCountEqual(serial, parallel)
+
+    def test_generate_batch_stats(self):
+        serial, parallel = SolverStats(), SolverStats()
+        list(generate_batch(4, workers=1, seed=5, chunk_size=2,
+                            report=None, stats=serial))
+        list(generate_batch(4, workers=2, seed=5, chunk_size=2,
+                            report=None, stats=parallel))
+        self.assertGreater(serial.solves, 4)
+        serial.seconds = parallel.seconds = 0
+        self.assertEqual(serial.as_dict(), parallel.as_dict())
+
+    def test_generate_batch_report(self):
+        report = MagicMock()
+        list(generate_batch(2, workers=1, report=report))
+        report.assert_called_once()
+        self.assertIn('puzzles/sec', report.call_args[0][0])
+
+    def test_generate_batch_tier_misses(self):
+        game = ([[1]], [[0]])
+        report = MagicMock()
+        with patch.object(Logic, 'create_game',
+                          side_effect=[None, game, None]):
+            games = list(generate_batch(
+                3, 90, workers=1, tier='hard', report=report))
+        self.assertEqual(games, [game])
+        self.assertIn('2 missed hard', report.call_args[0][0])
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
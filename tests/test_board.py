@@ -5,6 +5,9 @@ from unittest import mock
 from unittest.mock import MagicMock, Mock
 
 from src.sudoku.board import Board
+from src.sudoku.conflicts import Conflicts
+from src.sudoku.constants import MINT, PALEBLUE
+from src.sudoku.data import Data
 
 
 class TestBoard(unittest.TestCase):
@@ -64,6 +67,96 @@ class TestBoard(unittest.TestCase):
         self.assertEqual(Board.cells[0].value, 0)
         self.assertFalse(Board.cells[0].guessed)
 
+    @mock.patch.object(Board, '_font_sizes', ())
+    @mock.patch('src.sudoku.board.Cell')
+    @mock.patch('src.sudoku.board.pygame')
+    @mock.patch('src.sudoku.glyphs.evict')
+    def test_evict_on_resize_only(self, evict, *_):
+        puzzle = Data(data=[0] * 81)
+        Board(MagicMock(width=486), puzzle)
+        Board(MagicMock(width=486), puzzle)
+        evict.assert_not_called()
+        Board(MagicMock(width=405), puzzle)
+        # digits and marks of 54 px squares, not the fonts of others
+        evict.assert_called_once_with({40, 13})
+
+    @mock.patch.object(Board, '__init__', return_value=None)
+    def test_correct_count(self, _):
+        board = Board()
+        board.cells = [MagicMock(guessed=False) for _ in range(81)]
+        board.correct = 79
+        board.handle_number_entered(1, 5, False)
+        self.assertEqual(board.correct, 79)
+        board.handle_number_entered(1, 4, True)
+        board.handle_number_entered(1, 4, True)
+        self.assertEqual(board.correct, 80)
+        self.assertFalse(board.is_solved())
+        board.handle_number_entered(2, 7, True)
+        self.assertTrue(board.is_solved())
+        board.handle_deleted(2)
+        self.assertEqual(board.correct, 80)
+        self.assertFalse(board.is_solved())
+
+    @mock.patch.object(Board, '__init__', return_value=None)
+    def test_conflicts(self, _):
+        board = Board()
+        board.cells = [MagicMock(value=0, guessed=False) for _ in range(81)]
+        board.conflicts = Conflicts([0] * 81)
+        board.handle_number_entered(0, 5, False)
+        board.handle_number_entered(80, 5, False)
+        self.assertEqual(len(board.conflicts), 0)
+        board.handle_number_entered(8, 5, False)
+        self.assertTrue(board.cells[0].conflict)
+        self.assertTrue(board.cells[8].conflict)
+        board.handle_deleted(8)
+        self.assertFalse(board.cells[0].conflict)
+        self.assertFalse(board.cells[8].conflict)
+
+    @mock.patch.object(Board, '__init__', return_value=None)
+    def test_marks(self, _):
+        board = Board()
+        board.cells = [Mock(value=0, guessed=False, marks=0)
+                       for _ in range(81)]
+        board.conflicts = Conflicts([0] * 81)
+        board.handle_number_entered(0, 1, True)
+        board.cells[0].value = 1
+        board.fill_marks()
+        self.assertEqual(board.cells[0].marks, 0)
+        self.assertEqual(board.cells[1].marks, 0b111111110)
+        self.assertEqual(board.cells[80].marks, 0b111111111)
+        board.toggle_mark(80, 9)
+        self.assertEqual(board.cells[80].marks, 0b011111111)
+        board.toggle_mark(0, 9)
+        self.assertEqual(board.cells[0].marks, 0)
+        board.handle_number_entered(72, 2, False)
+        self.assertEqual(board.cells[80].marks, 0b011111101)
+        self.assertEqual(board.cells[72].marks, 0)
+
+    @mock.patch.object(Board, '__init__', return_value=None)
+    def test_hint(self, _):
+        solution = [(r * 3 + r // 3 + c) % 9 + 1
+                    for r in range(9) for c in range(9)]
+        puzzle = solution[:]
+        puzzle[0] = puzzle[1] = 0
+        board = Board()
+        board.puzzle = Data(data=puzzle)
+        board.cells = [Mock(value=value, guessed=False, highlight=None)
+                       for value in puzzle]
+        board.cells[1].value, board.cells[1].guessed = solution[1], True
+        step = board.hint()
+        self.assertEqual(step.placements, ((0, solution[0]),))
+        self.assertEqual(board.cells[0].highlight, MINT)
+        self.assertEqual(board.cells[1].highlight, PALEBLUE)
+        self.assertIsNone(board.cells[2].highlight)
+        self.assertEqual(board.hinted, [0, 1])
+        board.clear_hint()
+        self.assertIsNone(board.cells[0].highlight)
+
+    def test_set_conflicts(self):
+        board = Mock(cells=[MagicMock(), MagicMock()])
+        Board.set_conflicts(board, True)
+        self.assertTrue(all(cell.conflicts for cell in board.cells))
+
     def test_set_hints(self):
         pass
 
@@ -141,6 +234,36 @@ class TestBoardWithSetUp(unittest.TestCase):
         self.board.draw()
         [cell.draw.assert_called() for cell in self.board.cells]
 
+    def test_draw_only_dirty_cells(self):
+        clean, dirty = MagicMock(dirty=False), MagicMock(dirty=True)
+        self.board.cells = [clean, dirty]
+        self.board._redraw_all = False
+        self.board.game_screen = MagicMock()
+        rects = self.board.draw()
+        clean.draw.assert_not_called()
+        dirty.draw.assert_called_once()
+        self.assertEqual(len(rects), 1)
+
+    def test_draw_grid_over_dirty_cell(self):
+        dirty = MagicMock(dirty=True)
+        self.board.cells = [dirty]
+        self.board._redraw_all = False
+        self.board.surf = MagicMock()
+        self.board.game_screen = MagicMock()
+        self.board.draw()
+        self.board.surf.blit.assert_called_once_with(
+            self.board.grid, dirty.rect, dirty.rect)
+
+    def test_draw_invalidate(self):
+        cells = [MagicMock(dirty=False), MagicMock(dirty=False)]
+        self.board.cells = cells
+        self.board.game_screen = MagicMock()
+        self.board.invalidate()
+        rects = self.board.draw()
+        [cell.draw.assert_called_once() for cell in cells]
+        self.assertEqual(len(rects), 1)
+        self.assertEqual(self.board.draw(), [])
+
     def test_get_values(self):
         self.board.get_values()
         [cell.get_value.assert_called() for cell in self.board.cells]
@@ -27,6 +27,22 @@ class TestCell(unittest.TestCase):
             cell._draw_selected.assert_called_with()
             cell.parent_surf.blit.assert_called()
 
+    @patch.object(Cell, '__init__', return_value=None)
+    def test_draw_on_board_surface(self, _):
+        with unittest.mock.patch('src.sudoku.cell.pygame'):
+            cell = Cell()
+            cell._draw_background = MagicMock()
+            cell._draw_border = MagicMock()
+            cell._draw_number = MagicMock()
+            cell._draw_selected = MagicMock()
+            cell._show_border = False
+            cell._owns_surf = False
+            cell.parent_surf = MagicMock()
+
+            cell.draw()
+            cell._draw_border.assert_not_called()
+            cell.parent_surf.blit.assert_not_called()
+
     @patch.object(Cell, '__init__', return_value=None)
     def test_handle_clicked(self, _):
         with unittest.mock.patch('src.sudoku.cell.pygame') as mock_pygame:
@@ -93,6 +109,33 @@ class TestCell(unittest.TestCase):
         cell.selected = True
         self.assertTrue(cell._selected)
 
+    @patch.object(Cell, '__init__', return_value=None)
+    def test_dirty_on_change(self, _):
+        cell = Cell()
+        cell._dirty = False
+        cell.value = 0
+        cell.hint = False
+        cell.selected = False
+        self.assertFalse(cell.dirty)
+        cell.value = 5
+        self.assertTrue(cell.dirty)
+        for name in ('hint', 'guessed', 'selected'):
+            cell._dirty = False
+            setattr(cell, name, True)
+            self.assertTrue(cell.dirty, name)
+
+    @patch.object(Cell, '__init__', return_value=None)
+    def test_draw_clears_dirty(self, _):
+        with unittest.mock.patch('src.sudoku.cell.pygame'):
+            cell = Cell()
+            cell.surf = MagicMock()
+            cell.parent_surf = MagicMock()
+            cell.rect = MagicMock()
+            cell.border_offset = MagicMock()
+            cell._dimension = 54
+            cell.draw()
+            self.assertFalse(cell.dirty)
+
     @patch.object(Cell, '__init__', return_value=None)
     def test__set_border_offset(self, _):
         cell = Cell()
@@ -193,6 +236,22 @@ class TestCell(unittest.TestCase):
         cell._set_bg_color()
         self.assertEqual(cell.color, '#ffffff')
 
+    @patch.object(Cell, '__init__', return_value=None)
+    def test__set_bg_color_conflict(self, _):
+        """Tests setting cell bg color with conditions:
+        _definite = True
+        _conflicts_on = True / False
+        _conflict = True
+        """
+        cell = Cell()
+        cell._definite = True
+        cell.conflict = True
+        cell._set_bg_color()
+        self.assertEqual(cell.color, '#ffffcc')
+        cell.conflicts = True
+        cell._set_bg_color()
+        self.assertEqual(cell.color, '#ffa082')
+
     @patch.object(Cell, '__init__', return_value=None)
     def test__draw_number_happy(self, _):
         """
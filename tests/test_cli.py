@@ -0,0 +1,118 @@
+# -*- coding: utf-8
+import io
+import unittest
+from unittest.mock import patch
+
+from src.sudoku.cli import main
+from src.sudoku.dlx import windows
+from src.sudoku.solver import Solver
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+PUZZLE = ('..837...9.57.4..8.9.4..6.7.2.9.1......3...416.4..3.79.8.5...9.4'
+          '4..8513...324..1.8')
+SOLUTION = ('168375249357942681924186573279614835583297416641538792815723964'
+            '496851327732469158')
+
+
+class TestCli(unittest.TestCase):
+    def run_cli(self, argv, stdin=''):
+        with patch('sys.stdin', io.StringIO(stdin)), \
+                patch('sys.stdout', new_callable=io.StringIO) as stdout, \
+                patch('sys.stderr', new_callable=io.StringIO):
+            status = main(argv)
+        return status, stdout.getvalue().splitlines()
+
+    def test_generate(self):
+        status, lines = self.run_cli(
+            ['generate', '-n', '3', '-s', '1', '--solution', '-q'])
+        self.assertEqual(status, 0)
+        self.assertEqual(len(lines), 3)
+        for line in lines:
+            puzzle, solution = line.split(',')
+            self.assertEqual(len(puzzle), 81)
+            grid = [0 if c == '.' else int(c) for c in puzzle]
+            self.assertEqual(
+                ''.join(map(str, Solver().solve(grid))), solution)
+
+    def test_generate_tier_out_of_reach(self):
+        status, lines = self.run_cli(['generate', '-t', 'hard', '-d', '10'])
+        self.assertEqual(status, 2)
+        self.assertEqual(lines, [])
+
+    def test_solve(self):
+        status, lines = self.run_cli(['solve'], f'{PUZZLE}\n\n{PUZZLE}\n')
+        self.assertEqual(status, 0)
+        self.assertEqual(lines, [SOLUTION, SOLUTION])
+
+    def test_solve_stats(self):
+        status, lines = self.run_cli(['solve', '--stats'], PUZZLE)
+        self.assertEqual(status, 0)
+        solution, nodes, backtracks, propagations, depth, millis = \
+            lines[0].split(',')
+        self.assertEqual(solution, SOLUTION)
+        self.assertEqual(int(propagations), PUZZLE.count('.'))
+        self.assertEqual((nodes, backtracks, depth), ('1', '0', '0'))
+        self.assertGreaterEqual(float(millis), 0)
+
+    def test_solve_unsolvable(self):
+        status, lines = self.run_cli(['solve'], '11' + '0' * 79)
+        self.assertEqual(status, 1)
+        self.assertEqual(lines, ['none'])
+
+    def test_solve_variant(self):
+        status, lines = self.run_cli(
+            ['solve', '--variant', 'windoku'], '.' * 81)
+        self.assertEqual(status, 0)
+        for window in windows():
+            self.assertEqual(len({lines[0][pos] for pos in window}), 9)
+        status, lines = self.run_cli(
+            ['validate', '--variant', 'windoku'], lines[0])
+        self.assertEqual(lines[0].split(',')[1], 'unique')
+
+    def test_validate(self):
+        status, lines = self.run_cli(
+            ['validate'], PUZZLE + '\n' + '0' * 81 + '\n')
+        self.assertEqual(status, 1)
+        self.assertEqual(lines, [PUZZLE + ',unique', '.' * 81 + ',multiple'])
+
+    def test_grade(self):
+        status, lines = self.run_cli(['grade'], PUZZLE)
+        self.assertEqual(status, 0)
+        line, score, tier = lines[0].split(',')
+        self.assertEqual(line, PUZZLE)
+        self.assertGreater(int(score), 0)
+        self.assertEqual(tier, 'easy')
+
+    @unittest.skipUnless(numpy, 'numpy is not installed')
+    def test_check(self):
+        stuck = '12345678.' + '.' * 8 + '9' + '.' * 63
+        lines = [SOLUTION, PUZZLE.replace('.', '0'), stuck, '11' + '.' * 79]
+        status, lines = self.run_cli(['check'], '\n'.join(lines))
+        self.assertEqual(status, 1)
+        self.assertEqual(lines, [
+            SOLUTION + ',solved', PUZZLE + ',valid', stuck + ',stuck',
+            '11' + '.' * 79 + ',invalid'])
+        status, lines = self.run_cli(
+            ['check', '--only', 'stuck'], f'{PUZZLE}\n{stuck}\n')
+        self.assertEqual(status, 0)
+        self.assertEqual(lines, [stuck + ',stuck'])
+
+    def test_grade_invalid(self):
+        status, lines = self.run_cli(
+            ['grade'], '11' + '.' * 79 + '\n' + PUZZLE + '\n')
+        self.assertEqual(status, 1)
+        self.assertEqual(lines[0], '11' + '.' * 79 + ',invalid')
+        self.assertTrue(lines[1].startswith(PUZZLE + ','))
+
+    def test_invalid_line(self):
+        status, lines = self.run_cli(['solve'], '123\n')
+        self.assertEqual(status, 2)
+        self.assertEqual(lines, [])
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,59 @@
+# -*- coding: utf-8
+import unittest
+
+from src.sudoku.conflicts import Conflicts
+from src.sudoku.units import get_units
+
+
+class TestConflicts(unittest.TestCase):
+    def test_valid_grid(self):
+        values = [0] * 81
+        values[0], values[10], values[80] = 1, 2, 1
+        conflicts = Conflicts(values)
+        self.assertEqual(len(conflicts), 0)
+        self.assertEqual(conflicts.count(0, 1), 1)
+
+    def test_given_conflicts(self):
+        values = [0] * 81
+        values[0] = values[4] = 7
+        self.assertEqual(list(Conflicts(values)), [0, 4])
+
+    def test_update(self):
+        conflicts = Conflicts([0] * 81)
+        self.assertEqual(conflicts.update(0, 3), set())
+        # same box
+        self.assertEqual(conflicts.update(10, 3), {0, 10})
+        # same column as 0, which already conflicts
+        self.assertEqual(conflicts.update(27, 3), {27})
+        self.assertEqual(conflicts.count(9, 3), 2)
+        self.assertEqual(conflicts.update(0, 4), {0, 10, 27})
+        self.assertEqual(len(conflicts), 0)
+
+    def test_clear(self):
+        conflicts = Conflicts([0] * 81)
+        conflicts.update(0, 3)
+        conflicts.update(1, 3)
+        self.assertEqual(conflicts.update(1, 0), {0, 1})
+        self.assertNotIn(0, conflicts)
+        self.assertEqual(conflicts.count(0, 3), 1)
+
+    def test_candidates(self):
+        conflicts = Conflicts([0] * 81)
+        conflicts.update(0, 1)
+        conflicts.update(1, 1)
+        conflicts.update(80, 9)
+        self.assertEqual(conflicts.candidates(2), 0b111111110)
+        self.assertEqual(conflicts.candidates(8), 0b011111110)
+        conflicts.update(1, 0)
+        self.assertEqual(conflicts.candidates(2), 0b111111110)
+        conflicts.update(0, 0)
+        self.assertEqual(conflicts.candidates(2), 0b111111111)
+
+    def test_other_size(self):
+        conflicts = Conflicts([0] * 16, get_units(4))
+        conflicts.update(0, 4)
+        self.assertEqual(conflicts.update(5, 4), {0, 5})
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,98 @@
+# -*- coding: utf-8
+import copy
+import unittest
+
+from src.sudoku.data import Data
+
+LINE = ('..837...9.57.4..8.9.4..6.7.2.9.1......3...416.4..3.79.8.5...9.4'
+        '4..8513...324..1.8')
+
+
+class TestData(unittest.TestCase):
+    def setUp(self):
+        self.rows = [[row * 9 + col for col in range(9)] for row in range(9)]
+        self.data = Data(data=self.rows)
+
+    def test_getitem(self):
+        self.assertEqual(self.data[0, 0], 0)
+        self.assertEqual(self.data[2, 3], 21)
+        self.assertEqual(self.data[21], 21)
+
+    def test_getitem_out_of_range(self):
+        with self.assertRaises(IndexError):
+            self.data[9, 0]
+        with self.assertRaises(IndexError):
+            self.data[0, -1]
+
+    def test_setitem(self):
+        self.data[8, 8] = 5
+        self.assertEqual(self.data[8, 8], 5)
+        self.assertEqual(self.data.flatten()[80], 5)
+
+    def test_does_not_share_input(self):
+        self.rows[0][0] = 9
+        self.assertEqual(self.data[0, 0], 0)
+
+    def test_default_is_empty(self):
+        first, second = Data(), Data()
+        first[0, 0] = 1
+        self.assertEqual(second[0, 0], 0)
+        self.assertEqual(len(second), 81)
+
+    def test_flatten_is_cached_view(self):
+        flat = self.data.flatten()
+        self.assertIs(flat, self.data.flatten())
+        self.assertEqual(list(flat), list(range(81)))
+        self.data[0, 1] = 7
+        self.assertEqual(flat[1], 7)
+        with self.assertRaises(TypeError):
+            flat[0] = 1
+
+    def test_copy(self):
+        other = self.data.copy()
+        self.assertEqual(other, self.data)
+        other[0, 0] = 9
+        self.assertNotEqual(other, self.data)
+        self.assertEqual(copy.copy(self.data), self.data)
+
+    def test_from_flat(self):
+        self.assertEqual(Data(data=range(81)), self.data)
+        self.assertEqual(Data(data=self.data.flatten()), self.data)
+
+    def test_not_square(self):
+        with self.assertRaises(ValueError):
+            Data(data=[0] * 80)
+
+    def test_rows(self):
+        self.assertEqual(self.data.rows(), self.rows)
+
+    def test_line_round_trip(self):
+        data = Data.from_line(LINE)
+        self.assertEqual(data[0, 2], 8)
+        self.assertEqual(data[0, 0], 0)
+        self.assertEqual(data.to_line(), LINE)
+        self.assertEqual(Data.from_line(LINE.replace('.', '0') + '\n'), data)
+
+    def test_from_line_invalid(self):
+        with self.assertRaises(ValueError):
+            Data.from_line(LINE[:-1])
+        with self.assertRaises(ValueError):
+            Data.from_line(LINE[:-1] + 'x')
+
+    def test_pack_round_trip(self):
+        grid = Data(data=[n % 10 for n in range(81)])
+        packed = grid.pack()
+        self.assertEqual(len(packed), 41)
+        self.assertEqual(packed[0], 0x01)
+        self.assertEqual(Data.unpack(packed), grid)
+        small = Data(data=range(16))
+        self.assertEqual(Data.unpack(small.pack()), small)
+        with self.assertRaises(ValueError):
+            Data(data=[16] * 256).pack()
+
+    def test_str(self):
+        self.assertEqual(str(Data()).splitlines()[0], ', '.join('0' * 9))
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,139 @@
+# -*- coding: utf-8
+import unittest
+
+from src.sudoku.conflicts import Conflicts
+from src.sudoku.dlx import DlxSolver, ExactCover, diagonals, windows
+from src.sudoku.logic import Logic
+from src.sudoku.solver import Solver, SolverStats
+
+
+class TestExactCover(unittest.TestCase):
+    def setUp(self):
+        # Knuth's example, only rows 0, 3 and 4 cover every column once
+        self.rows = [[2, 4, 5], [0, 3, 6], [1, 2, 5], [0, 3], [1, 6],
+                     [3, 4, 6]]
+
+    def test_solve(self):
+        matrix = ExactCover(7, self.rows)
+        self.assertEqual(
+            [sorted(rows) for rows in matrix.iter_solutions()], [[0, 3, 4]])
+
+    def test_select(self):
+        matrix = ExactCover(7, self.rows)
+        self.assertTrue(matrix.select(3))
+        self.assertFalse(matrix.select(1))
+        self.assertEqual(
+            [sorted(rows) for rows in matrix.iter_solutions()], [[0, 4]])
+
+    def test_select_dead_end(self):
+        matrix = ExactCover(7, self.rows)
+        self.assertTrue(matrix.select(1))
+        self.assertEqual(list(matrix.iter_solutions()), [])
+
+    def test_copy(self):
+        matrix = ExactCover(7, self.rows)
+        other = matrix.copy()
+        matrix.select(0)
+        self.assertTrue(other.select(1))
+
+    def test_limit(self):
+        # every row covers both columns, four solutions
+        matrix = ExactCover(2, [[0, 1]] * 4)
+        self.assertEqual(len(list(matrix.iter_solutions())), 4)
+        matrix = ExactCover(2, [[0, 1]] * 4)
+        self.assertEqual(list(matrix.iter_solutions(limit=2)), [[0], [1]])
+
+    def test_no_columns(self):
+        self.assertEqual(list(ExactCover(0).iter_solutions()), [[]])
+
+
+class TestDlxSolver(unittest.TestCase):
+    def setUp(self):
+        self.solver = DlxSolver()
+        self.hard = [int(c) for c in (
+            '800000000003600000070090200050007000000045700'
+            '000100030001000068008500010090000400')]
+
+    def assertSolves(self, puzzle, solution, regions=()):
+        self.assertNotIn(0, solution)
+        self.assertEqual(len(Conflicts(solution)), 0)
+        for given, value in zip(puzzle, solution):
+            if given:
+                self.assertEqual(given, value)
+        for region in regions:
+            self.assertEqual(len({solution[pos] for pos in region}),
+                             len(region))
+
+    def test_solve_like_solver(self):
+        solution = Solver().solve(self.hard)
+        self.assertEqual(self.solver.solve(self.hard), solution)
+        nested = [self.hard[r:r + 9] for r in range(0, 81, 9)]
+        self.assertEqual(self.solver.solve(nested),
+                         [solution[r:r + 9] for r in range(0, 81, 9)])
+
+    def test_count_solutions(self):
+        self.assertEqual(self.solver.count_solutions(self.hard), 1)
+        self.assertEqual(self.solver.count_solutions([0] * 16, None), 288)
+        self.assertEqual(self.solver.count_solutions([0] * 81, 5), 5)
+
+    def test_unsolvable(self):
+        puzzle = [0] * 81
+        puzzle[0] = puzzle[1] = 1
+        self.assertIsNone(self.solver.solve(puzzle))
+        # no digit is left for cell 8
+        puzzle = [1, 2, 3, 4, 5, 6, 7, 8, 0] + [0] * 8 + [9] + [0] * 63
+        self.assertIsNone(self.solver.solve(puzzle))
+
+    def test_large_boards(self):
+        for side in (16, 25):
+            puzzle = [0] * (side * side)
+            puzzle[0], puzzle[side + 5] = 3, side
+            self.assertSolves(puzzle, self.solver.solve(puzzle))
+
+    def test_regions(self):
+        self.assertEqual(diagonals(4), ((0, 5, 10, 15), (3, 6, 9, 12)))
+        self.assertEqual(windows(9)[0], (10, 11, 12, 19, 20, 21, 28, 29, 30))
+        self.assertEqual(len(windows(9)), 4)
+        self.assertEqual(len(windows(16)), 9)
+        self.assertEqual(windows(16)[-1][-1], 14 * 16 + 14)
+        for regions in (diagonals(), windows()):
+            solver = DlxSolver(regions=regions)
+            solution = solver.solve([0] * 81)
+            self.assertSolves([0] * 81, solution, regions)
+            puzzle = [value if pos % 3 else 0
+                      for pos, value in enumerate(solution)]
+            self.assertSolves(puzzle, solver.solve(puzzle), regions)
+
+    def test_stats(self):
+        stats = SolverStats()
+        DlxSolver(stats).solve(self.hard)
+        self.assertEqual(stats.solves, 1)
+        self.assertGreater(stats.nodes, 81 - self.hard.count(0) - 1)
+        self.assertGreater(stats.propagations, 0)
+        self.assertGreater(stats.backtracks, 0)
+        self.assertGreater(stats.seconds, 0)
+        puzzle = [1, 1] + [0] * 79
+        DlxSolver(stats).solve(puzzle)
+        self.assertEqual(stats.solves, 2)
+
+    def test_invalid_grids(self):
+        with self.assertRaises(ValueError):
+            self.solver.solve([0] * 80)
+        with self.assertRaises(ValueError):
+            self.solver.solve([5] + [0] * 15)
+        with self.assertRaises(ValueError):
+            DlxSolver(regions=[(0, 1, 2)]).solve([0] * 81)
+        with self.assertRaises(ValueError):
+            DlxSolver(regions=diagonals(9)).solve([0] * 16)
+
+    def test_logic_large_board(self):
+        board = [[0] * 16 for _ in range(16)]
+        board[0][0] = 16
+        solution = next(Logic()._solve_sudoku(board))
+        self.assertEqual(len(solution), 16)
+        self.assertEqual(solution[0][0], 16)
+        self.assertSolves(sum(board, []), sum(solution, []))
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,100 @@
+# -*- coding: utf-8
+import asyncio
+import os
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pygame
+
+from src.sudoku import game as game_module
+from src.sudoku.data import Data
+from src.sudoku.game import Game
+
+SOLUTION = [int(c) for c in (
+    '1683752493579426819241865732796148355832974166415387928157239644968513'
+    '27732469158')]
+PUZZLE = [0 if i % 3 else n for i, n in enumerate(SOLUTION)]
+
+
+@patch.object(game_module, 'IDLE_TIMEOUT', 30)
+@patch.object(game_module, 'BROWSER_IDLE_SLEEP', 30)
+class TestIdleLoop(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        pygame.init()
+        pygame.display.set_mode((500, 600))
+
+    @classmethod
+    def tearDownClass(cls):
+        pygame.display.quit()
+
+    def setUp(self):
+        with patch.object(game_module, 'PuzzleBank') as bank, \
+                patch.object(game_module, 'SaveStore') as store:
+            store.return_value.load.return_value = None
+            self.game = Game()
+        self.game.bank.draw.return_value = SimpleNamespace(
+            puzzle=Data(data=PUZZLE), solution=Data(data=SOLUTION))
+        self.game.reset()
+        self.game.state = 'playing'
+        self.game.elapsed_seconds = 10.2
+        self.game.process_frame([], 0, True)
+        self.game.drawn_state = 'playing'
+        pygame.event.clear()
+
+    def idle_frames(self, count):
+        """Run count loop iterations, returns the rects drawn and the
+        seconds every wait for events took
+        """
+        rects, waits = [], []
+        for _ in range(count):
+            start = time.perf_counter()
+            events = asyncio.run(self.game.wait_events())
+            waits.append(time.perf_counter() - start)
+            self.assertEqual(events, [])
+            rects += self.game.process_frame(events, 0.001, False)
+        return rects, waits
+
+    def test_idle_blocks_and_draws_nothing(self):
+        with patch.object(pygame.event, 'wait',
+                          wraps=pygame.event.wait) as wait:
+            rects, waits = self.idle_frames(3)
+        self.assertEqual(rects, [])
+        self.assertEqual(wait.call_count, 3)
+        self.assertTrue(all(call.args[0] == 30
+                            for call in wait.call_args_list))
+        self.assertGreaterEqual(min(waits), 0.02)
+
+    def test_idle_wakes_for_the_clock(self):
+        self.game.elapsed_seconds = 10.995
+        with patch.object(pygame.event, 'wait',
+                          wraps=pygame.event.wait) as wait:
+            self.idle_frames(1)
+        self.assertLessEqual(wait.call_args.args[0], 6)
+
+    def test_browser_sleeps_instead_of_blocking(self):
+        with patch.object(game_module, 'BROWSER', True), \
+                patch.object(pygame.event, 'wait') as wait:
+            rects, waits = self.idle_frames(3)
+        wait.assert_not_called()
+        self.assertEqual(rects, [])
+        self.assertGreaterEqual(min(waits), 0.02)
+        # without a refill thread the bank is topped up while idle
+        self.assertEqual(self.game.bank.refill_step.call_count, 3)
+
+    def test_idle_refill_only_in_browser(self):
+        self.idle_frames(1)
+        self.game.bank.refill_step.assert_not_called()
+
+    def test_events_end_the_wait(self):
+        event = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_F1, mod=0)
+        pygame.event.post(event)
+        events = asyncio.run(self.game.wait_events())
+        self.assertEqual([e.type for e in events], [pygame.KEYDOWN])
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
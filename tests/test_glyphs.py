@@ -0,0 +1,61 @@
+# -*- coding: utf-8
+import unittest
+from unittest.mock import MagicMock
+
+import pygame
+
+from src.sudoku import glyphs
+
+
+class TestGlyphs(unittest.TestCase):
+    def setUp(self):
+        pygame.font.init()
+        glyphs.evict()
+
+    def tearDown(self):
+        glyphs.evict()
+
+    def test_get_font_shared(self):
+        font = glyphs.get_font(20)
+        self.assertIs(glyphs.get_font(20), font)
+        self.assertIsNot(glyphs.get_font(21), font)
+
+    def test_get_glyph_cached(self):
+        font = MagicMock()
+        first = glyphs.get_glyph(font, 5, (0, 0, 0), '#ffffff')
+        self.assertIs(glyphs.get_glyph(font, 5, (0, 0, 0), '#ffffff'), first)
+        font.render.assert_called_once_with('5', True, (0, 0, 0), '#ffffff')
+        glyphs.get_glyph(font, 5, (0, 0, 0), '#ffcccc')
+        self.assertEqual(font.render.call_count, 2)
+
+    def test_get_glyph_renders_text(self):
+        surf = glyphs.get_glyph(glyphs.get_font(20), 7, (0, 0, 0))
+        self.assertGreater(surf.get_width(), 0)
+
+    def test_get_marks(self):
+        font = glyphs.get_font(12)
+        atlas = glyphs.get_marks(font, 54, (0, 0, 0), (255, 255, 255))
+        self.assertEqual(atlas.get_size(), (54, 54))
+        self.assertIs(
+            glyphs.get_marks(font, 54, (0, 0, 0), (255, 255, 255)), atlas)
+        self.assertEqual(glyphs.mark_rect(1, 54), (0, 0, 18, 18))
+        self.assertEqual(glyphs.mark_rect(6, 54), (36, 18, 18, 18))
+        glyphs.evict([30])
+        self.assertEqual(len(glyphs._marks), 1)
+        glyphs.evict([12])
+        self.assertEqual(glyphs._marks, {})
+
+    def test_evict_sizes(self):
+        small, large = glyphs.get_font(20), glyphs.get_font(30)
+        small_glyph = glyphs.get_glyph(small, 1, (0, 0, 0))
+        large_glyph = glyphs.get_glyph(large, 1, (0, 0, 0))
+        glyphs.evict([20, 25])
+        self.assertIs(glyphs.get_font(30), large)
+        self.assertIs(glyphs.get_glyph(large, 1, (0, 0, 0)), large_glyph)
+        self.assertIsNot(glyphs.get_font(20), small)
+        self.assertNotIn((small, 1, (0, 0, 0), None), glyphs._glyphs)
+        self.assertIsNotNone(small_glyph)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
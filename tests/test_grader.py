@@ -0,0 +1,150 @@
+# -*- coding: utf-8
+import unittest
+
+from src.sudoku.grader import (TIER_SCORES, TIERS, Grader, _hidden_pairs,
+                               _naked_pairs, _pointing, _State, _x_wings,
+                               next_step)
+
+
+def parse(line):
+    return [0 if c == '.' else int(c) for c in line]
+
+
+class TestGrader(unittest.TestCase):
+    def setUp(self):
+        self.grader = Grader()
+
+    def test_grade_singles_only(self):
+        puzzle = parse(
+            '..837...9.57.4..8.9.4..6.7.2.9.1......3...416.4..3.79.8.5...9.4'
+            '4..8513...324..1.8')
+        grade = self.grader.grade(puzzle)
+        self.assertTrue(grade.solved)
+        self.assertEqual(grade.tier, 'easy')
+        self.assertLessEqual(
+            set(grade.techniques), {'naked_single', 'hidden_single'})
+        self.assertEqual(grade.score, sum(
+            uses * (1 if name == 'naked_single' else 2)
+            for name, uses in grade.techniques.items()))
+
+    def test_grade_by_score(self):
+        # singles only, but enough of them to be past easy and medium
+        puzzle = parse(
+            '..49....2..9...48..5...7.3..42.9...3...24....8..1..2.......65'
+            '7...3.7..19...8..3..')
+        grade = self.grader.grade(puzzle)
+        self.assertTrue(grade.solved)
+        self.assertLessEqual(
+            set(grade.techniques), {'naked_single', 'hidden_single'})
+        self.assertGreaterEqual(grade.score, TIER_SCORES[1])
+        self.assertEqual(grade.tier, 'hard')
+
+    def test_grade_x_wing(self):
+        puzzle = parse(
+            '100000569492056108056109240009640801064010000218035604040500016'
+            '905061402621000005')
+        grade = self.grader.grade(puzzle)
+        self.assertTrue(grade.solved)
+        self.assertEqual(grade.tier, 'expert')
+        self.assertIn('x_wing', grade.techniques)
+
+    def test_grade_needs_guessing(self):
+        puzzle = parse(
+            '8..........36......7..9.2...5...7.......457.....1...3...1....68'
+            '..85...1..9....4..')
+        grade = self.grader.grade(puzzle)
+        self.assertFalse(grade.solved)
+        self.assertEqual(grade.tier, 'evil')
+        self.assertIn('guess', grade.techniques)
+
+    def test_grade_nested(self):
+        solution = [[(r * 3 + r // 3 + c) % 9 + 1 for c in range(9)]
+                    for r in range(9)]
+        solution[0][0] = 0
+        grade = self.grader.grade(solution)
+        self.assertEqual(grade, (1, 'easy', {'naked_single': 1}, True))
+
+    def test_grade_invalid(self):
+        with self.assertRaises(ValueError):
+            self.grader.grade([1, 1] + [0] * 79)
+
+    def test_next_step_single(self):
+        solution = [(r * 3 + r // 3 + c) % 9 + 1
+                    for r in range(9) for c in range(9)]
+        grid = solution[:]
+        grid[40] = 0
+        step = next_step(grid)
+        self.assertEqual(step.technique, 'naked_single')
+        self.assertEqual(step.placements, ((40, solution[40]),))
+
+    def test_next_step_after_eliminations(self):
+        grid = parse(
+            '100000569492056108056109240009640801064010000218035604040500016'
+            '905061402621000005')
+        while True:
+            step = next_step(grid)
+            if step.technique not in ('naked_single', 'hidden_single'):
+                break
+            (pos, digit), = step.placements
+            grid[pos] = digit
+        self.assertEqual(step.technique, 'x_wing')
+        (pos, digit), = step.placements
+        self.assertFalse(grid[pos])
+        self.assertIn(pos, step.cells)
+        self.assertGreater(len(step.cells), 4)
+
+    def test_next_step_stuck(self):
+        self.assertIsNone(next_step(parse(
+            '8..........36......7..9.2...5...7.......457.....1...3...1....68'
+            '..85...1..9....4..')))
+        self.assertIsNone(next_step([1, 1] + [0] * 79))
+
+    def test_tiers(self):
+        self.assertEqual(TIERS[0], 'easy')
+        self.assertEqual(TIERS[-1], 'evil')
+
+
+class TestTechniques(unittest.TestCase):
+    def state(self, cands):
+        state = _State([0] * 81)
+        for pos, mask in cands.items():
+            state.cands[pos] = mask
+        return state
+
+    def test_naked_pair(self):
+        state = self.state({0: 0b11, 1: 0b11})
+        steps = _naked_pairs(state)
+        row = [step for step in steps if step.units == (0,)][0]
+        self.assertEqual(row.cells, (0, 1))
+        self.assertEqual(dict(row.eliminations)[2], 0b11)
+
+    def test_hidden_pair(self):
+        state = self.state({pos: 0b111111100 for pos in range(2, 9)})
+        steps = [step for step in _hidden_pairs(state) if step.units == (0,)]
+        self.assertEqual(steps[0].cells, (0, 1))
+        self.assertEqual(dict(steps[0].eliminations)[0], 0b111111100)
+
+    def test_pointing(self):
+        # digit 1 only in the top row of the first box
+        state = self.state({pos: 0b111111110 for pos in (9, 10, 11, 18, 19)})
+        state.cands[20] = 0b111111110
+        steps = [step for step in _pointing(state) if step.units == (18, 0)]
+        self.assertEqual(steps[0].cells, (0, 1, 2))
+        self.assertEqual(dict(steps[0].eliminations)[3], 1)
+
+    def test_x_wing(self):
+        bit = 1
+        cands = {}
+        for row in range(9):
+            for col in range(9):
+                if row in (0, 4) and col not in (1, 7):
+                    cands[row * 9 + col] = 0b111111110
+        state = self.state(cands)
+        steps = [step for step in _x_wings(state)
+                 if step.cells == (1, 7, 37, 43)]
+        self.assertEqual(len(steps), 1)
+        self.assertEqual(dict(steps[0].eliminations)[10], bit)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
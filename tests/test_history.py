@@ -0,0 +1,70 @@
+# -*- coding: utf-8
+import unittest
+
+from src.sudoku.history import MARKS, VALUE, History, Move
+
+
+class TestHistory(unittest.TestCase):
+    def setUp(self):
+        self.history = History()
+        self.history.record(Move(VALUE, 0, 0, 5))
+        self.history.record(Move(VALUE, 80, 0, 9))
+        self.history.record(Move(MARKS, 79, 0b100000001, 0b1), linked=True)
+
+    def test_record(self):
+        self.assertEqual(len(self.history), 3)
+        self.assertEqual(list(self.history)[2], (MARKS, 79, 257, 1))
+
+    def test_undo_redo_linked(self):
+        self.assertEqual(self.history.undo(), [
+            Move(MARKS, 79, 257, 1), Move(VALUE, 80, 0, 9)])
+        self.assertEqual(len(self.history), 1)
+        self.assertEqual(self.history.redo(), [
+            Move(VALUE, 80, 0, 9), Move(MARKS, 79, 257, 1)])
+        self.assertEqual(self.history.redo(), [])
+
+    def test_undo_all(self):
+        self.history.undo()
+        self.assertEqual(self.history.undo(), [Move(VALUE, 0, 0, 5)])
+        self.assertEqual(self.history.undo(), [])
+
+    def test_record_drops_redo(self):
+        self.history.undo()
+        self.history.record(Move(VALUE, 1, 0, 2))
+        self.assertEqual(self.history.redo(), [])
+        self.assertEqual(len(list(self.history)), 2)
+
+    def test_first_move_not_linked(self):
+        history = History()
+        history.record(Move(VALUE, 3, 0, 1), linked=True)
+        history.record(Move(VALUE, 4, 0, 2))
+        history.undo()
+        self.assertEqual(history.undo(), [Move(VALUE, 3, 0, 1)])
+
+    def test_bytes(self):
+        self.history.undo()
+        data = self.history.to_bytes()
+        self.assertEqual(len(data), 4 * 4)
+        history = History.from_bytes(data)
+        self.assertEqual(list(history), list(self.history))
+        self.assertEqual(history.redo(), self.history.redo())
+
+    def test_bytes_invalid(self):
+        with self.assertRaises(ValueError):
+            History.from_bytes(b'')
+        with self.assertRaises(ValueError):
+            History.from_bytes(bytes([5, 0, 0, 0]))
+        for move in (Move(VALUE, 81, 0, 1), Move(VALUE, 0, 0, 12)):
+            history = History()
+            history.record(move)
+            with self.assertRaises(ValueError):
+                History.from_bytes(history.to_bytes())
+            History.from_bytes(history.to_bytes(), side=16)
+
+    def test_too_large(self):
+        with self.assertRaises(ValueError):
+            self.history.record(Move(MARKS, 0, 0, 1 << 9))
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,62 @@
+# -*- coding: utf-8
+import os
+import unittest
+
+import pygame
+import pygame_gui
+
+from src.sudoku import assets
+from src.sudoku.game import THEME_PATH
+from src.sudoku.hud import Hud
+
+
+class TestHud(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        pygame.init()
+        cls.screen = pygame.display.set_mode((500, 600))
+
+    @classmethod
+    def tearDownClass(cls):
+        pygame.display.quit()
+
+    def setUp(self):
+        self.hud = Hud(
+            self.screen,
+            top_rect=pygame.Rect(0, 0, 500, 40),
+            bottom_rect=pygame.Rect(4, 532, 492, 58),
+            ui_manager=pygame_gui.UIManager((500, 600), THEME_PATH),
+            start_surf=assets.get_image('start', alpha=False))
+
+    def test_first_draw_covers_panels(self):
+        rects = self.hud.draw(0, False)
+        self.assertIn(self.hud.top_rect, rects)
+        self.assertIn(self.hud.bottom_rect, rects)
+
+    def test_unchanged_draws_nothing(self):
+        self.hud.draw(0, False)
+        self.assertEqual(self.hud.draw(0.5, False), [])
+        self.assertEqual(self.hud.draw(0.9, False), [])
+
+    def test_clock_tick_draws_clock_only(self):
+        self.hud.draw(59, False)
+        before = self.hud.clock_rect
+        rects = self.hud.draw(60, False)
+        self.assertEqual(self.hud.clock_str, ' 00:01:00')
+        self.assertEqual(rects, [before.union(self.hud.clock_rect)])
+        self.assertFalse(rects[0].colliderect(self.hud.slider.get_abs_rect()))
+        for button in self.hud.controls_top:
+            if button.cid in ('undo', 'redo'):
+                self.assertFalse(rects[0].colliderect(button.rect))
+
+    def test_invalidate(self):
+        self.hud.draw(0, False)
+        self.hud.invalidate()
+        rects = self.hud.draw(0, False)
+        self.assertIn(self.hud.top_rect, rects)
+        self.assertIn(self.hud.slider.get_abs_rect(), rects)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,128 @@
+# -*- coding: utf-8
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.sudoku import instrument
+from src.sudoku.decorators import debug, state_print, timer
+from src.sudoku.instrument import Frame, Histogram, Registry
+
+
+class TestHistogram(unittest.TestCase):
+    def test_percentiles(self):
+        histogram = Histogram()
+        for millis in range(1, 101):
+            histogram.add(millis / 1000)
+        self.assertEqual(histogram.count, 100)
+        self.assertEqual(histogram.max, 0.1)
+        for percent in (50, 90, 99):
+            value = histogram.percentile(percent)
+            self.assertGreaterEqual(value, percent / 1000)
+            self.assertLess(value, percent / 1000 * 1.19)
+        self.assertEqual(histogram.percentile(100), 0.1)
+
+    def test_extremes(self):
+        histogram = Histogram()
+        self.assertEqual(histogram.percentile(50), 0.0)
+        self.assertEqual(histogram.summary()['mean'], 0.0)
+        histogram.add(0)
+        histogram.add(1e9)
+        self.assertEqual(histogram.buckets[0], 1)
+        self.assertEqual(histogram.buckets[-1], 1)
+        self.assertEqual(histogram.percentile(100), 1e9)
+
+
+class TestRegistry(unittest.TestCase):
+    def test_snapshot_and_dump(self):
+        registry = Registry()
+        registry.count('cells')
+        registry.count('cells', 2)
+        registry.observe('draw', 0.002)
+        snapshot = registry.snapshot()
+        self.assertEqual(snapshot['counters'], {'cells': 3})
+        self.assertEqual(snapshot['histograms']['draw']['count'], 1)
+        self.assertEqual(snapshot['histograms']['draw']['max'], 0.002)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'stats.json')
+            registry.dump(path)
+            with open(path) as file:
+                self.assertEqual(json.load(file), snapshot)
+        registry.reset()
+        self.assertEqual(registry.snapshot(),
+                         {'counters': {}, 'histograms': {}})
+
+
+class TestInstrument(unittest.TestCase):
+    def setUp(self):
+        instrument.registry.reset()
+
+    def tearDown(self):
+        instrument.registry.reset()
+
+    @patch.object(instrument, 'ENABLED', False)
+    def test_disabled(self):
+        def func():
+            return 1
+        self.assertIs(timer(func), func)
+        self.assertIs(debug(func), func)
+        self.assertIs(state_print(func), func)
+        instrument.count('frames')
+        instrument.observe('draw', 1)
+        frame = Frame(path=None)
+        frame.start()
+        frame.lap('events')
+        frame.end()
+        self.assertEqual(instrument.registry.snapshot(),
+                         {'counters': {}, 'histograms': {}})
+
+    @patch.object(instrument, 'ENABLED', True)
+    def test_enabled(self):
+        @timer
+        def func():
+            return 1
+        self.assertEqual(func(), 1)
+        name = f'{__name__}.{func.__qualname__}'
+        self.assertEqual(instrument.registry.histograms[name].count, 1)
+
+        frame = Frame(path=None)
+        frame.start()
+        frame.lap('events')
+        frame.lap('board')
+        frame.end()
+        self.assertEqual(instrument.registry.counters['frames'], 1)
+        report = Frame.report()
+        self.assertEqual(len(report), 3)
+        self.assertTrue(report[0].startswith('total'))
+
+    @patch.object(instrument, 'ENABLED', True)
+    def test_traced(self):
+        class Machine:
+            state = 'start'
+
+            @state_print
+            def play(self, speed):
+                self.state = 'playing'
+                return speed
+
+        @debug
+        def add(first, second=0):
+            return first + second
+
+        with self.assertLogs('sudoku.instrument', 'DEBUG') as logs:
+            self.assertEqual(add(1, second=2), 3)
+            self.assertEqual(Machine().play(4), 4)
+        self.assertEqual(len(logs.output), 6)
+        self.assertIn('add(1, second=2)', logs.output[0])
+        self.assertTrue(logs.output[1].endswith('returned 3'))
+        self.assertTrue(logs.output[3].endswith('state before: start'))
+        self.assertTrue(logs.output[4].endswith('state after: playing'))
+        self.assertEqual(
+            instrument.registry.counters[f'{__name__}.{add.__qualname__}'],
+            1)
+        self.assertEqual(add(2), 2)  # not logged below DEBUG
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
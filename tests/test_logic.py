@@ -1,7 +1,10 @@
 # -*- coding: utf-8
+import random
 import unittest
 
-from src.sudoku.logic import Logic
+from src.sudoku.grader import TIERS, Grader
+from src.sudoku.logic import TIER_DIFFICULTY, Logic
+from src.sudoku.solver import Solver
 
 
 class TestLogic(unittest.TestCase):
@@ -54,6 +57,69 @@ class TestLogic(unittest.TestCase):
         result = [s - p for s, p in zip(flat_solution, flat_puzzle)]
         self.assertEqual(result.count(0), 81 - flat_puzzle.count(0))
 
+    def test_create_game_not_unique(self):
+        solution, puzzle = self.logic.create_game(50, unique=False)
+        flat_puzzle = [value for row in puzzle for value in row]
+        self.assertEqual(flat_puzzle.count(0), 44)
+
+    def test_create_unique_puzzle_success(self):
+        puzzle = self.logic._create_unique_puzzle(self.solution, 50)
+        self.assertEqual(len(puzzle), 9)
+        flat_puzzle = [value for row in puzzle for value in row]
+        self.assertEqual(flat_puzzle.count(0), 44)
+        self.assertEqual(Solver().count_solutions(puzzle), 1)
+
+    def test_create_unique_puzzle_max_difficulty(self):
+        puzzle = self.logic._create_unique_puzzle(self.solution, 100)
+        flat_puzzle = [value for row in puzzle for value in row]
+        self.assertLessEqual(flat_puzzle.count(0), 65)
+        self.assertEqual(Solver().count_solutions(puzzle), 1)
+        self.assertEqual(Solver().solve(puzzle), self.solution)
+
+    def test_create_unique_puzzle_seeded(self):
+        logic = Logic(random.Random(3))
+        for difficulty in (70, 90, 100):
+            for _ in range(5):
+                solution, puzzle = logic.create_game(difficulty)
+                self.assertEqual(Solver().count_solutions(puzzle), 1)
+                self.assertEqual(Solver().solve(puzzle), solution)
+        grid = Solver().solve([0] * 16)
+        solution = [grid[r:r + 4] for r in range(0, 16, 4)]
+        puzzle = logic._create_unique_puzzle(solution, 100)
+        self.assertEqual(Solver().count_solutions(puzzle), 1)
+
+    def test_create_game_tier(self):
+        solution, puzzle = self.logic.create_game(30, tier='easy')
+        self.assertEqual(Grader().grade(puzzle).tier, 'easy')
+        self.assertEqual(Solver().solve(puzzle), solution)
+
+    def test_create_game_every_tier(self):
+        # at its default difficulty every tier turns up in a few attempts
+        logic = Logic(random.Random(1))
+        for tier in TIERS:
+            game = logic.create_game(
+                TIER_DIFFICULTY[tier], tier=tier, attempts=10)
+            self.assertIsNotNone(game, tier)
+            self.assertEqual(Grader().grade(game[1]).tier, tier)
+
+    def test_create_graded_game(self):
+        solution, puzzle, grade = self.logic.create_graded_game(60, 'medium')
+        self.assertEqual(grade, Grader().grade(puzzle))
+        self.assertEqual(grade.tier, 'medium')
+        self.assertEqual(Solver().solve(puzzle), solution)
+
+    def test_create_game_tier_missed(self):
+        logic = Logic(random.Random(1))
+        self.assertIsNone(logic.create_game(90, tier='expert', attempts=1))
+
+    def test_create_game_tier_out_of_reach(self):
+        with self.assertRaises(ValueError):
+            self.logic.create_game(40, tier='hard')
+        with self.assertRaises(ValueError):
+            self.logic.create_game(60, tier='easy')
+        with self.assertRaises(ValueError):
+            self.logic.create_game(90, tier='unknown')
+
     def test_is_game_over_success(self):
         self.assertTrue(self.logic.is_game_over(self.solution, self.solution))
 
@@ -0,0 +1,100 @@
+# -*- coding: utf-8
+import os
+import tempfile
+import unittest
+
+from src.sudoku.data import Data
+from src.sudoku.history import VALUE, History, Move
+from src.sudoku.save import SaveState, SaveStore, decode, encode
+
+SOLUTION = [int(c) for c in (
+    '1683752493579426819241865732796148355832974166415387928157239644968513'
+    '27732469158')]
+PUZZLE = [0 if i % 3 else n for i, n in enumerate(SOLUTION)]
+
+
+def make_state():
+    entries = PUZZLE[:]
+    entries[1] = 7
+    history = History()
+    history.record(Move(VALUE, 1, 0, 7))
+    marks = [0] * 81
+    marks[2] = 0b110000000
+    return SaveState(
+        Data(data=PUZZLE), Data(data=SOLUTION), Data(data=entries),
+        tuple(marks), 754, 65, history.to_bytes())
+
+
+class TestSave(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'sub', 'save')
+        self.store = SaveStore(self.path)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        state = make_state()
+        text = encode(state)
+        self.assertTrue(text.isascii())
+        self.assertLessEqual(len(text), 4 * ((295 + 8 + 2) // 3))
+        self.assertEqual(decode(text), state)
+
+    def test_decode_invalid(self):
+        for text in ('', 'not base64!', encode(make_state())[:100],
+                     'AAAA' + encode(make_state())[4:]):
+            with self.assertRaises(ValueError):
+                decode(text)
+
+    def test_decode_out_of_range(self):
+        state = make_state()
+        entries = list(state.entries)
+        entries[1] = 12
+        history = History()
+        history.record(Move(VALUE, 100, 0, 7))
+        marks = list(state.marks)
+        marks[0] = 1 << 9
+        for bad in (state._replace(entries=Data(data=entries)),
+                    state._replace(solution=Data(data=PUZZLE)),
+                    state._replace(history=history.to_bytes()),
+                    state._replace(marks=tuple(marks))):
+            with self.assertRaises(ValueError):
+                decode(encode(bad))
+
+    def test_store(self):
+        self.assertIsNone(self.store.load())
+        state = make_state()
+        self.store.save(state)
+        self.store.close()
+        self.assertEqual(self.store.load(), state)
+        self.assertFalse(os.path.exists(self.path + '.tmp'))
+
+    def test_store_latest_wins(self):
+        state = make_state()
+        self.store.save(state._replace(elapsed_seconds=1))
+        self.store.save(state)
+        self.store.close()
+        self.assertEqual(self.store.load().elapsed_seconds, 754)
+
+    def test_store_remove(self):
+        self.store.save(make_state())
+        self.store.save(None)
+        self.store.close()
+        self.assertFalse(os.path.exists(self.path))
+        self.assertIsNone(self.store.load())
+
+    def test_store_unreadable(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, 'w') as file:
+            file.write('garbage')
+        self.assertIsNone(self.store.load())
+        state = make_state()
+        with open(self.path, 'w') as file:
+            file.write(encode(state._replace(solution=state.puzzle)))
+        self.assertIsNone(self.store.load())
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
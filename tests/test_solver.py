@@ -0,0 +1,114 @@
+# -*- coding: utf-8
+import unittest
+
+from src.sudoku.solver import Solver, SolverStats
+
+
+class TestSolver(unittest.TestCase):
+    def setUp(self):
+        self.solver = Solver()
+        self.solution = [
+            [2, 8, 4, 3, 7, 5, 6, 1, 9],
+            [9, 6, 1, 8, 4, 2, 3, 7, 5],
+            [5, 3, 7, 6, 1, 9, 8, 4, 2],
+            [8, 7, 2, 1, 5, 3, 4, 9, 6],
+            [3, 1, 5, 4, 9, 6, 7, 2, 8],
+            [6, 4, 9, 7, 2, 8, 1, 5, 3],
+            [7, 5, 8, 9, 3, 1, 2, 6, 4],
+            [1, 9, 3, 2, 6, 4, 5, 8, 7],
+            [4, 2, 6, 5, 8, 7, 9, 3, 1]
+        ]
+        self.hard = [int(c) for c in (
+            '800000000003600000070090200050007000000045700'
+            '000100030001000068008500010090000400')]
+
+    def test_solve_nested(self):
+        puzzle = [
+            [0 if (r + c) % 2 else n for c, n in enumerate(row)]
+            for r, row in enumerate(self.solution)
+        ]
+        self.assertEqual(self.solver.solve(puzzle), self.solution)
+
+    def test_solve_flat(self):
+        flat = [n for row in self.solution for n in row]
+        puzzle = [0 if i % 2 else n for i, n in enumerate(flat)]
+        self.assertEqual(self.solver.solve(puzzle), flat)
+
+    def test_solve_hard(self):
+        result = self.solver.solve(self.hard)
+        self.assertNotIn(0, result)
+        for given, value in zip(self.hard, result):
+            if given:
+                self.assertEqual(given, value)
+        self.assertEqual(self.solver.count_solutions(self.hard), 1)
+
+    def test_solve_conflicting_givens(self):
+        puzzle = [[0] * 9 for _ in range(9)]
+        puzzle[0][0] = puzzle[0][8] = 5
+        self.assertIsNone(self.solver.solve(puzzle))
+
+    def test_solve_unsolvable(self):
+        puzzle = [[0] * 9 for _ in range(9)]
+        puzzle[0][:8] = [1, 2, 3, 4, 5, 6, 7, 8]
+        puzzle[1][8] = 9
+        self.assertIsNone(self.solver.solve(puzzle))
+
+    def test_iter_solutions_limit(self):
+        solutions = list(self.solver.iter_solutions([0] * 81, limit=5))
+        self.assertEqual(len(solutions), 5)
+        self.assertEqual(len({tuple(s) for s in solutions}), 5)
+
+    def test_count_solutions_stops_at_limit(self):
+        self.assertEqual(self.solver.count_solutions([0] * 81, limit=2), 2)
+
+    def test_solve_4x4(self):
+        result = self.solver.solve([0] * 16)
+        rows = [result[r:r + 4] for r in range(0, 16, 4)]
+        for row in rows:
+            self.assertEqual(sorted(row), [1, 2, 3, 4])
+
+    def test_stats(self):
+        stats = SolverStats()
+        solver = Solver(stats)
+        self.assertEqual(solver.count_solutions(self.hard), 1)
+        self.assertEqual(stats.solves, 1)
+        self.assertGreater(stats.nodes, 1)
+        self.assertGreater(stats.backtracks, 0)
+        self.assertGreater(stats.max_depth, 0)
+        self.assertGreaterEqual(stats.propagations, self.hard.count(0))
+        self.assertEqual(stats.worst_nodes, stats.nodes)
+        self.assertGreater(stats.seconds, 0)
+
+        nodes = stats.nodes
+        solver.solve(self.solution)
+        self.assertEqual(stats.solves, 2)
+        self.assertEqual(stats.nodes, nodes + 1)
+        self.assertEqual(stats.worst_nodes, nodes)
+
+    def test_stats_conflicting_givens(self):
+        stats = SolverStats()
+        self.assertIsNone(Solver(stats).solve([1, 1] + [0] * 79))
+        self.assertEqual((stats.solves, stats.nodes, stats.backtracks),
+                         (1, 1, 1))
+
+    def test_stats_merge(self):
+        first, second = SolverStats(), SolverStats()
+        Solver(first).solve(self.hard)
+        Solver(second).solve([0] * 81)
+        total = SolverStats()
+        total.merge(first)
+        total.merge(second)
+        self.assertEqual(total.solves, 2)
+        self.assertEqual(total.nodes, first.nodes + second.nodes)
+        self.assertEqual(total.max_depth,
+                         max(first.max_depth, second.max_depth))
+        self.assertIn('2 solves', total.summary())
+        self.assertEqual(set(total.as_dict()), set(SolverStats.__slots__))
+
+    def test_not_square(self):
+        with self.assertRaises(ValueError):
+            self.solver.solve([0] * 80)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
@@ -0,0 +1,35 @@
+# -*- coding: utf-8
+import unittest
+
+from src.sudoku.units import UNITS, get_units
+
+
+class TestUnits(unittest.TestCase):
+    def test_standard_board(self):
+        self.assertEqual((UNITS.base, UNITS.side, UNITS.full), (3, 9, 511))
+        self.assertEqual(len(UNITS.units), 27)
+        self.assertTrue(all(len(peers) == 20 for peers in UNITS.peers))
+
+    def test_cell(self):
+        pos = 4 * 9 + 7
+        self.assertEqual(
+            (UNITS.rows[pos], UNITS.cols[pos], UNITS.boxes[pos]), (4, 7, 5))
+        self.assertEqual(UNITS.cell_units[pos], (4, 16, 23))
+        self.assertIn(pos, UNITS.units[23])
+        self.assertNotIn(pos, UNITS.peers[pos])
+
+    def test_small_board(self):
+        units = get_units(4)
+        self.assertEqual(units.boxes[:8], (0, 0, 1, 1, 0, 0, 1, 1))
+        self.assertEqual(units.peers[0], (1, 2, 3, 4, 5, 8, 12))
+
+    def test_cached(self):
+        self.assertIs(get_units(9), UNITS)
+
+    def test_not_square(self):
+        with self.assertRaises(ValueError):
+            get_units(6)
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()
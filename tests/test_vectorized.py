@@ -0,0 +1,155 @@
+# -*- coding: utf-8
+import random
+import unittest
+
+from src.sudoku.conflicts import Conflicts
+from src.sudoku.solver import Solver
+from src.sudoku.units import get_units
+
+try:
+    import numpy as np
+
+    from src.sudoku import vectorized
+except ImportError:  # pragma: no cover
+    np = None
+
+PUZZLE = ('..837...9.57.4..8.9.4..6.7.2.9.1......3...416.4..3.79.8.5...9.4'
+          '4..8513...324..1.8')
+SOLUTION = ('168375249357942681924186573279614835583297416641538792815723964'
+            '496851327732469158')
+
+
+def random_boards(count, side=9, seed=1):
+    """Boards of random digits, half their cells empty, so most of them
+    break the rules somewhere
+    """
+    rng = random.Random(seed)
+    return [[rng.randint(1, side) if rng.random() < 0.3 else 0
+             for _ in range(side * side)] for _ in range(count)]
+
+
+@unittest.skipUnless(np, 'numpy is not installed')
+class TestVectorized(unittest.TestCase):
+    def setUp(self):
+        self.boards = random_boards(200)
+        self.boards.append([int(c) for c in SOLUTION])
+        self.boards.append([0 if c == '.' else int(c) for c in PUZZLE])
+
+    def test_candidates(self):
+        candidates = vectorized.candidates(self.boards)
+        self.assertEqual(candidates.shape, (len(self.boards), 81))
+        for board, masks in zip(self.boards, candidates.tolist()):
+            conflicts = Conflicts(board)
+            self.assertEqual(masks, [
+                conflicts.candidates(pos) if not value else 0
+                for pos, value in enumerate(board)])
+
+    def test_duplicates(self):
+        units = get_units(9)
+        duplicates = vectorized.duplicates(self.boards)
+        self.assertEqual(duplicates.shape, (len(self.boards), 3, 81))
+        for board, kinds in zip(self.boards, duplicates.tolist()):
+            self.assertEqual(
+                [pos for pos in range(81) if any(kind[pos] for kind in kinds)],
+                list(Conflicts(board)))
+            for pos, unit in ((0, 0), (0, 9), (0, 18), (40, 4)):
+                kind = unit // 9
+                same = [other for other in units.units[unit]
+                        if other != pos and board[other] == board[pos]]
+                self.assertEqual(kinds[kind][pos],
+                                 bool(board[pos] and same))
+
+    def test_unit_masks(self):
+        once, twice = vectorized.unit_masks([int(c) for c in SOLUTION])
+        self.assertEqual(once.tolist(), [[0x1ff] * 27])
+        self.assertEqual(twice.tolist(), [[0] * 27])
+        board = [0] * 81
+        board[0] = board[1] = 5
+        once, twice = vectorized.unit_masks(board)
+        self.assertEqual(twice[0, 0], 1 << 4)  # row 0
+        self.assertEqual(twice[0, 18], 1 << 4)  # box 0
+        self.assertEqual(twice[0, 9:18].tolist(), [0] * 9)  # columns
+
+    def test_is_valid(self):
+        valid = vectorized.is_valid(self.boards).tolist()
+        self.assertEqual(
+            valid, [not Conflicts(board) for board in self.boards])
+        self.assertTrue(valid[-1] and valid[-2])
+        self.assertFalse(all(valid))
+
+    def test_is_complete(self):
+        board = [int(c) for c in SOLUTION]
+        board[80] = 0
+        self.assertEqual(
+            vectorized.is_complete(
+                [[int(c) for c in SOLUTION], board]).tolist(),
+            [True, False])
+
+    def test_matches(self):
+        solution = [int(c) for c in SOLUTION]
+        wrong = solution[:]
+        wrong[0], wrong[1] = wrong[1], wrong[0]
+        self.assertEqual(
+            vectorized.matches([solution, wrong], [solution] * 2).tolist(),
+            [True, False])
+
+    def test_check(self):
+        checks = vectorized.check(self.boards, chunk_size=16)
+        self.assertEqual(checks.valid.tolist(),
+                         vectorized.is_valid(self.boards).tolist())
+        self.assertEqual(checks.complete.tolist(),
+                         vectorized.is_complete(self.boards).tolist())
+        self.assertEqual(checks.solved.tolist()[-2:], [True, False])
+        for board, stuck in zip(self.boards, checks.stuck.tolist()):
+            conflicts = Conflicts(board)
+            self.assertEqual(stuck, any(
+                not value and not conflicts.candidates(pos)
+                for pos, value in enumerate(board)))
+        self.assertTrue(checks.stuck.any())
+        self.assertEqual(
+            [array.tolist() for array in vectorized.check(self.boards)],
+            [array.tolist() for array in checks])
+
+    def test_check_empty(self):
+        checks = vectorized.check(np.zeros((0, 81), dtype=np.uint8))
+        self.assertEqual([len(array) for array in checks], [0, 0, 0])
+
+    def test_small_boards(self):
+        boards = random_boards(50, side=4)
+        solution = Solver().solve([0] * 16)
+        boards.append(solution)
+        checks = vectorized.check(boards)
+        self.assertEqual(checks.valid.tolist(),
+                         [not Conflicts(board) for board in boards])
+        self.assertTrue(checks.solved[-1])
+        self.assertEqual(vectorized.candidates(boards).tolist()[0], [
+            Conflicts(boards[0]).candidates(pos) if not value else 0
+            for pos, value in enumerate(boards[0])])
+
+    def test_from_lines(self):
+        boards = vectorized.from_lines(
+            [PUZZLE + '\n', '\n', SOLUTION.encode(), '0' * 81])
+        self.assertEqual(boards.shape, (3, 81))
+        self.assertEqual(boards.dtype, np.uint8)
+        self.assertEqual(
+            boards[0].tolist(),
+            [0 if c == '.' else int(c) for c in PUZZLE])
+        self.assertEqual(boards[2].tolist(), [0] * 81)
+        with self.assertRaises(ValueError):
+            vectorized.from_lines([PUZZLE[:80]])
+        with self.assertRaises(ValueError):
+            vectorized.from_lines([PUZZLE, 'x' + PUZZLE[1:]])
+        self.assertEqual(vectorized.from_lines([]).shape, (0, 81))
+
+    def test_as_boards(self):
+        self.assertEqual(vectorized.as_boards([0] * 81).shape, (1, 81))
+        with self.assertRaises(ValueError):
+            vectorized.as_boards([0] * 80)
+        with self.assertRaises(ValueError):
+            vectorized.as_boards([[5] + [0] * 15])
+        with self.assertRaises(ValueError):
+            vectorized.as_boards(np.zeros((2, 2, 81)))
+
+
+if __name__ == '__main__':  # pragma: no cover
+    unittest.main()